@@ -0,0 +1,283 @@
+# =============================================================================
+# PAST-LOSS ACCRUAL LEDGER
+# =============================================================================
+import datetime
+import logging
+
+import numpy as np
+
+from datastore import get_connection, _to_iso
+
+logger = logging.getLogger(__name__)
+
+LEDGER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger_claims (
+    claim_id TEXT PRIMARY KEY,
+    mode TEXT NOT NULL,
+    period TEXT NOT NULL,
+    created_at TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS ledger_entries (
+    entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    claim_id TEXT NOT NULL,
+    entry_date TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    amount REAL NOT NULL,
+    description TEXT
+);
+CREATE INDEX IF NOT EXISTS ledger_entries_claim_date ON ledger_entries (claim_id, entry_date);
+
+CREATE TABLE IF NOT EXISTS ledger_snapshots (
+    claim_id TEXT NOT NULL,
+    as_of TEXT NOT NULL,
+    last_entry_id INTEGER NOT NULL,
+    first_entry_date TEXT,
+    principal REAL NOT NULL,
+    interest REAL NOT NULL,
+    rates_version INTEGER NOT NULL,
+    rate_mark REAL NOT NULL,
+    PRIMARY KEY (claim_id, as_of)
+) WITHOUT ROWID;
+"""
+
+# Sign applied to each entry kind when accruing principal
+ENTRY_SIGNS = {'loss': 1.0, 'benefit': -1.0, 'adjustment': 1.0}
+
+
+class AccrualLedger:
+    """
+    Dated loss and benefit entries per claim, with snapshots of accrued principal and interest.
+
+    A snapshot records the principal and interest accrued to its as-of date, the
+    last entry it included and the rates version it was computed with. Bringing a
+    claim up to date rolls the latest usable snapshot forward: its balance earns
+    interest from the snapshot date, and only entries added since (or dated after
+    the snapshot) are accrued individually. A snapshot stays usable after new rates
+    arrive as long as the rate path up to its as-of date is unchanged; otherwise an
+    earlier snapshot (or the full history) is used.
+
+    Snapshots are only written by snapshot() (after entries are added, or on
+    request); accrue() reads them but never writes.
+    """
+
+    def __init__(self, db_path=None, store=None):
+        self.db_path = db_path
+        self._store = store
+        self._conn().executescript(LEDGER_SCHEMA)
+
+    def _conn(self):
+        return get_connection(self.db_path)
+
+    def _rate_store(self):
+        if self._store is None:
+            from tbill_utils import get_store
+            self._store = get_store()
+        return self._store
+
+    # -------------------------------------------------------------------------
+    # Claims and entries
+    # -------------------------------------------------------------------------
+    def create_claim(self, claim_id, mode='compound', period='month'):
+        """Register a claim with its interest mode ('simple' or 'compound') and rate period."""
+        from pji_engine import MODES, PERIOD_MONTHS
+
+        if mode not in MODES:
+            raise ValueError(f"Unknown interest mode: {mode}")
+        if period not in PERIOD_MONTHS:
+            raise ValueError(f"Unknown rate period: {period}")
+        self._conn().execute(
+            "INSERT INTO ledger_claims (claim_id, mode, period, created_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(claim_id) DO NOTHING",
+            (claim_id, mode, period, datetime.datetime.now().isoformat(timespec='seconds'))
+        )
+
+    def get_claim(self, claim_id):
+        row = self._conn().execute(
+            'SELECT mode, period FROM ledger_claims WHERE claim_id = ?', (claim_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown claim: {claim_id}")
+        return {'claim_id': claim_id, 'mode': row[0], 'period': row[1]}
+
+    def add_entries(self, claim_id, entries):
+        """
+        Append dated entries to a claim's ledger.
+
+        Args:
+            entries: Iterable of (date, kind, amount) or (date, kind, amount, description);
+                kind is 'loss', 'benefit' (deducted) or 'adjustment' (signed amount)
+
+        Returns:
+            Number of entries added
+        """
+        self.get_claim(claim_id)
+        rows = []
+        for entry in entries:
+            entry_date, kind, amount = entry[:3]
+            if kind not in ENTRY_SIGNS:
+                raise ValueError(f"Unknown ledger entry kind: {kind}")
+            description = entry[3] if len(entry) > 3 else None
+            rows.append((claim_id, _to_iso(entry_date), kind, float(amount), description))
+
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(
+                'INSERT INTO ledger_entries (claim_id, entry_date, kind, amount, description) VALUES (?, ?, ?, ?, ?)',
+                rows
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return len(rows)
+
+    def add_loss_stream(self, claim_id, start_date, end_date, total_amount, kind='loss', description=None):
+        """Add a loss (or benefit) spread evenly over a period as monthly entries."""
+        from pji_engine import monthly_instalments
+
+        dates, amounts = monthly_instalments(total_amount, start_date, end_date)
+        return self.add_entries(
+            claim_id,
+            [(str(date), kind, float(amount), description) for date, amount in zip(dates, amounts)]
+        )
+
+    def entries(self, claim_id):
+        """All entries for a claim in date order as dictionaries."""
+        return [
+            {'entry_id': entry_id, 'date': entry_date, 'kind': kind, 'amount': amount, 'description': description}
+            for entry_id, entry_date, kind, amount, description in self._conn().execute(
+                'SELECT entry_id, entry_date, kind, amount, description FROM ledger_entries '
+                'WHERE claim_id = ? ORDER BY entry_date, entry_id',
+                (claim_id,)
+            )
+        ]
+
+    # -------------------------------------------------------------------------
+    # Accrual
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _rate_mark(rate_path, mode, first_entry_date, as_of):
+        """Interest factor over [first entry, as_of]; unchanged if the rates that snapshot used are unchanged."""
+        if first_entry_date is None or first_entry_date >= as_of:
+            return 0.0
+        return float(rate_path.interest_factor(first_entry_date, as_of, mode))
+
+    def _usable_snapshot(self, conn, claim_id, as_of, rate_path, mode, rates_version):
+        """Latest snapshot on or before as_of whose rate history still matches the current rates."""
+        snapshots = conn.execute(
+            'SELECT as_of, last_entry_id, first_entry_date, principal, interest, rates_version, rate_mark '
+            'FROM ledger_snapshots WHERE claim_id = ? AND as_of <= ? ORDER BY as_of DESC',
+            (claim_id, as_of)
+        )
+        for snap_as_of, last_id, first_date, principal, interest, version, mark in snapshots:
+            if version == rates_version:
+                return snap_as_of, last_id, first_date, principal, interest
+            if abs(self._rate_mark(rate_path, mode, first_date, snap_as_of) - mark) < 1e-12:
+                return snap_as_of, last_id, first_date, principal, interest
+        return None
+
+    def snapshot(self, claim_id, as_of=None):
+        """Accrue a claim to as_of (default today) and save the result as a snapshot; returns accrue()'s result."""
+        return self.accrue(claim_id, as_of, save_snapshot=True)
+
+    def accrue(self, claim_id, as_of=None, save_snapshot=False):
+        """
+        Principal and interest accrued on a claim to as_of (default today).
+
+        Args:
+            save_snapshot: Save the result as a snapshot (see snapshot())
+
+        Returns:
+            Dictionary with principal, interest, total, the snapshot used and how
+            many entries had to be processed
+        """
+        claim = self.get_claim(claim_id)
+        mode, period = claim['mode'], claim['period']
+        as_of = _to_iso(as_of or datetime.date.today())
+
+        from pji_engine import get_rate_path
+
+        store = self._rate_store()
+        rates_version = store.data_version()
+        rate_path = get_rate_path(period, store)
+
+        conn = self._conn()
+        snapshot = self._usable_snapshot(conn, claim_id, as_of, rate_path, mode, rates_version)
+        if snapshot is not None:
+            snap_as_of, last_id, first_date, principal, interest = snapshot
+            # Entries added after the snapshot, plus earlier entries dated after it
+            rows = conn.execute(
+                'SELECT entry_id, entry_date, kind, amount FROM ledger_entries '
+                'WHERE claim_id = ? AND entry_date <= ? '
+                'AND (entry_id > ? OR entry_date > ?)',
+                (claim_id, as_of, last_id, snap_as_of)
+            ).fetchall()
+        else:
+            snap_as_of, first_date, principal, interest = None, None, 0.0, 0.0
+            rows = conn.execute(
+                'SELECT entry_id, entry_date, kind, amount FROM ledger_entries '
+                'WHERE claim_id = ? AND entry_date <= ?',
+                (claim_id, as_of)
+            ).fetchall()
+
+        # Roll the snapshot balance forward to as_of
+        if snap_as_of is not None and snap_as_of < as_of:
+            growth = float(rate_path.interest_factor(snap_as_of, as_of, mode))
+            base = principal if mode == 'simple' else principal + interest
+            interest += base * growth
+
+        if rows:
+            dates = np.array([row[1] for row in rows], dtype='datetime64[D]')
+            amounts = np.array([ENTRY_SIGNS[row[2]] * row[3] for row in rows])
+            factors = rate_path.interest_factor(dates, as_of, mode)
+            principal += float(amounts.sum())
+            interest += float(amounts @ factors)
+            earliest = str(dates.min())
+            first_date = earliest if first_date is None else min(first_date, earliest)
+
+        last_entry_id = conn.execute(
+            'SELECT COALESCE(MAX(entry_id), 0) FROM ledger_entries WHERE claim_id = ?', (claim_id,)
+        ).fetchone()[0]
+
+        if save_snapshot and (rows or snap_as_of != as_of):
+            conn.execute(
+                """
+                INSERT INTO ledger_snapshots
+                    (claim_id, as_of, last_entry_id, first_entry_date, principal, interest, rates_version, rate_mark)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(claim_id, as_of) DO UPDATE SET
+                    last_entry_id = excluded.last_entry_id, first_entry_date = excluded.first_entry_date,
+                    principal = excluded.principal, interest = excluded.interest,
+                    rates_version = excluded.rates_version, rate_mark = excluded.rate_mark
+                """,
+                (claim_id, as_of, last_entry_id, first_date, principal, interest, rates_version,
+                 self._rate_mark(rate_path, mode, first_date, as_of))
+            )
+
+        logger.info(f"Accrued claim {claim_id} to {as_of}: {len(rows)} entries processed "
+                    f"(from snapshot {snap_as_of or 'none'})")
+        return {
+            'claim_id': claim_id,
+            'as_of': as_of,
+            'mode': mode,
+            'period': period,
+            'principal': round(principal, 2),
+            'interest': round(interest, 2),
+            'total': round(principal + interest, 2),
+            'from_snapshot': snap_as_of,
+            'entries_processed': len(rows),
+            'rates_version': rates_version
+        }
+
+
+_default_ledger = None
+
+
+def get_ledger():
+    """Shared AccrualLedger on the default database."""
+    global _default_ledger
+    if _default_ledger is None:
+        _default_ledger = AccrualLedger()
+    return _default_ledger
@@ -1,26 +1,52 @@
 import logging
-logging.basicConfig(filename="/var/www/actuclaim/tax_debug.log", level=logging.DEBUG, format="%(asctime)s - %(message)s")
+from logging_config import configure_logging
+configure_logging()
 from flask import send_from_directory, send_file
 from flask import Flask, render_template, request, redirect, url_for, send_file, make_response, jsonify, session, flash
 import os
+import dataclasses
 import datetime
-import traceback
 from pji_routes import pji_routes
+from rate_routes import rate_routes
+from sensitivity_routes import sensitivity_routes
+from ledger_routes import ledger_routes
+from tax_routes import tax_routes
+from metrics_routes import metrics_routes
+from metrics import CALCULATIONS, CACHE_LOOKUPS
+from stage_timing import stage, StageTimingMiddleware, TimedSessionInterface
 from werkzeug.utils import secure_filename
 from tax_utils import get_tax_rates, get_available_tax_years, calculate_tax
 
 # Import calculation functions
 from income_calculations import calculate_take_home, calculate_collateral_benefits
+from damages_results import (
+    BENEFITS, CollateralBenefits, DamagesResult, FutureLoss, PastLoss, results_figures
+)
 from lost_wages_calculations import (
     calculate_past_lost_wages_with_interest,
-    calculate_future_lost_wages_annuity
+    calculate_future_lost_wages_annuity,
+    time_horizon_to_retirement
 )
-from pdf_generation import create_enhanced_pdf_report
+
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__, static_folder='static', static_url_path='/static')
 app.config['APP_NAME'] = 'ActuClaim'
 app.secret_key = 'your_secret_key'  # Replace with your actual secret key
 app.config['UPLOAD_FOLDER'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'documents')
+# Opt-in exact-cent Decimal arithmetic for take-home pay, interest and present values
+app.config['EXACT_MODE'] = os.environ.get('ACTUCLAIM_EXACT_MODE', '').lower() in ('1', 'true', 'yes')
+# Per-stage request timing (Server-Timing header and request_timing log records); off by default
+app.config['STAGE_TIMING'] = os.environ.get('ACTUCLAIM_STAGE_TIMING', '').lower() in ('1', 'true', 'yes')
+app.config['STAGE_TIMING_LOG_MS'] = float(os.environ.get('ACTUCLAIM_STAGE_TIMING_LOG_MS', '0'))
+# Cache of finished /calculate results: 'memory' (per worker), 'sqlite' (shared by all workers) or 'off'
+app.config['RESULT_CACHE'] = os.environ.get('ACTUCLAIM_RESULT_CACHE', 'memory').lower()
+app.config['RESULT_CACHE_SIZE'] = int(os.environ.get('ACTUCLAIM_RESULT_CACHE_SIZE', '128'))
+app.config['RESULT_CACHE_TTL'] = int(os.environ.get('ACTUCLAIM_RESULT_CACHE_TTL', '3600'))
+app.config['CONTINGENCY_TABLES_PATH'] = os.environ.get(
+    'ACTUCLAIM_CONTINGENCY_TABLES',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'contingency_tables.csv')
+)
 
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -30,416 +56,559 @@ os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 def inject_app_name():
     return dict(app_name=app.config['APP_NAME'])
 
+def future_benefit_streams(collateral_benefits):
+    """Annual collateral benefits as projection streams; CPPD is the indexed benefit."""
+    return [
+        {'name': f"{label} (annual)", 'amount': collateral_benefits.annual(benefit), 'indexed': benefit == 'cppd'}
+        for benefit, label, _ in BENEFITS
+        if collateral_benefits.annual(benefit)
+    ]
+
+def build_future_loss_schedule(damages):
+    """Year-by-year future loss schedule for the results page (None if no future loss was calculated)."""
+    future_loss = damages.future_loss
+    if future_loss.present_value <= 0:
+        return None
+    start_date = damages.start_date
+    
+    # NumPy is only needed once a future loss has been calculated
+    from cashflow_schedule import build_monthly_schedule, aggregate_yearly
+    
+    if future_loss.per_year_tax:
+        from wage_projection import project_after_tax_losses, schedule_rows
+        
+        projection = project_after_tax_losses(
+            future_loss.gross_salary, start_date.year, future_loss.time_horizon,
+            future_loss.discount_rate, damages.province,
+            dependents=damages.dependents,
+            wage_growth=future_loss.wage_growth,
+            collateral_benefits=future_benefit_streams(damages.collateral_benefits),
+            inflation=future_loss.benefit_indexation
+        )
+        return schedule_rows(projection['schedule'], start_date.year)
+    
+    annual_collateral = damages.collateral_benefits.total_annual
+    benefit_indexation = future_loss.benefit_indexation
+    indexed_collateral = future_loss.indexed_collateral_benefits if benefit_indexation else 0
+    schedule = build_monthly_schedule(
+        future_loss.annual_salary + annual_collateral,
+        start_date,
+        time_horizon=future_loss.time_horizon,
+        discount_rate=future_loss.discount_rate,
+        annual_collateral_benefits=annual_collateral - indexed_collateral,
+        wage_growth=future_loss.wage_growth,
+        indexed_collateral_benefits=indexed_collateral,
+        collateral_indexation=benefit_indexation
+    )
+    return aggregate_yearly(schedule)
+
+def build_marginal_rate_rows(province, dependents, gross_income):
+    """Marginal deduction rate bands for the results page chart (None without a calculation)."""
+    if not province or not gross_income:
+        return None
+    from net_income_curve import get_net_income_curve
+    try:
+        rows = get_net_income_curve(province, int(dependents or 0)).rows(gross_income)
+    except ValueError:
+        return None
+    top_rate = max(row['marginal_rate'] for row in rows) or 1
+    for row in rows:
+        row['width'] = round(row['marginal_rate'] / top_rate * 100, 1)
+    return rows
+
+def get_configured_contingency_tables():
+    """Contingency tables from CONTINGENCY_TABLES_PATH (loaded once), or None if none are installed."""
+    if not os.path.exists(app.config['CONTINGENCY_TABLES_PATH']):
+        return None
+    from contingency_tables import get_contingency_tables
+    return get_contingency_tables(app.config['CONTINGENCY_TABLES_PATH'])
+
+def get_configured_result_cache():
+    """The RESULT_CACHE backend, or None if result caching is off."""
+    from result_cache import get_result_cache
+    from tbill_utils import get_store
+    return get_result_cache(app.config['RESULT_CACHE'], app.config['RESULT_CACHE_SIZE'],
+                            app.config['RESULT_CACHE_TTL'], db_path=get_store().db_path)
+
 @app.route('/')
 def index():
-    return render_template("index.html", title="ActuClaim - Economic Damages Calculator", available_tax_years=get_available_tax_years(), current_year=datetime.datetime.now().year)
+    return render_template("index.html", title="ActuClaim - Economic Damages Calculator", available_tax_years=get_available_tax_years(), current_year=datetime.datetime.now().year,
+                           contingencies_available=os.path.exists(app.config['CONTINGENCY_TABLES_PATH']))
 
-@app.route('/calculate', methods=['POST'])
-def calculate():
+def calculate_case(case, today):
+    """
+    Run the damages calculation for a parsed case.
+
+    Args:
+        case: A valid case_schema.Case
+        today: The date interest and ages are calculated to
+
+    Returns:
+        damages_results.DamagesResult
+    """
     # Initialize variables that might be used later
     past_lost_wages_with_interest = 0
     calculation_details = {}
     present_value = 0
-    try:
-        # Get client information
-        client_name = request.form.get('client_name', 'Client')
-        province = request.form.get('province', 'nova scotia')
-        dependents = int(request.form.get("dependents", "0"))
-        
-        # Helper function for safe float conversion
-        def safe_float(value_str, default=0):
-            if not value_str:
-                return default
-            try:
-                return float(value_str.replace(',', ''))
-            except:
-                return default
-        
-        # Get employment information
-        employment_type = request.form.get('employment_type', 'salaried')
-        is_hourly = (employment_type == 'hourly')
-        
+
+    # Get client information
+    client_name = case.client_name
+    province = case.province
+    dependents = case.dependents
+
+    # Get employment information
+    is_hourly = (case.employment_type == 'hourly')
+    hours_per_week = case.hours_per_week
+    working_days = case.working_days
+
+    if is_hourly:
+        salary = case.hourly_rate * hours_per_week * 52
+        if case.include_vacation_pay:
+            salary *= 1.04
+        hours_per_day = hours_per_week / 5
+    else:
+        salary = case.salary
+        hours_per_day = case.hours_per_day
+    
+    # Calculate take-home pay
+    with stage('tax'):
+        take_home = calculate_take_home(salary, province, working_days, hours_per_day, is_hourly, hours_per_week, dependents,
+                                     exact=app.config['EXACT_MODE'])
+    logger.debug("Province: %s, dependents: %s, salary: %s", province, dependents, salary)
+    
+    # Get collateral benefits
+    ei_benefits_to_date = case.ei_benefits_to_date
+    section_b_to_date = case.section_b_to_date
+    ltd_benefits_to_date = case.ltd_benefits_to_date
+    cppd_benefits_to_date = case.cppd_benefits_to_date
+    other_benefits_to_date = case.other_benefits_to_date
+
+    ei_benefits_annual = case.ei_benefits_annual
+    section_b_annual = case.section_b_annual
+    ltd_benefits_annual = case.ltd_benefits_annual
+    cppd_benefits_annual = case.cppd_benefits_annual
+    other_benefits_annual = case.other_benefits_annual
+
+    loss_date = case.loss_date
+    start_date = case.start_date
+    # Get EI start date (use loss date if not provided)
+    ei_start_date = case.ei_benefits_start_date or loss_date
+
+    collateral_benefits = CollateralBenefits(
+        ei_to_date=ei_benefits_to_date,
+        section_b_to_date=section_b_to_date,
+        ltd_to_date=ltd_benefits_to_date,
+        cppd_to_date=cppd_benefits_to_date,
+        other_to_date=other_benefits_to_date,
+        ei_annual=ei_benefits_annual,
+        section_b_annual=section_b_annual,
+        ltd_annual=ltd_benefits_annual,
+        cppd_annual=cppd_benefits_annual,
+        other_annual=other_benefits_annual
+    )
+    total_annual_future_benefits = collateral_benefits.total_annual
+
+    # Calculate Net Pay Missed based on user input
+    missed_time_unit = case.missed_time_unit
+    missed_time = case.missed_time
+
+    # Calculate the fraction of year for collateral benefits calculation
+    fraction_of_year = {
+        "days": missed_time / working_days if working_days > 0 else 0,
+        "hours": missed_time / (working_days * hours_per_day) if working_days > 0 and hours_per_day > 0 else 0,
+        "weeks": missed_time / 52,
+        "months": missed_time / 12
+    }
+    
+    time_fraction = fraction_of_year.get(missed_time_unit, 0)
+    
+    missed_pay = missed_time * take_home.net_pay_per(missed_time_unit)
+    
+    # Calculate collateral benefits deduction for past lost wages
+    collateral_deduction = total_annual_future_benefits * time_fraction
+    net_past_lost_wages = missed_pay - collateral_deduction
+    
+    # Special handling for New Brunswick
+    if province.lower() == "new brunswick":
+        # For New Brunswick, LTD and CPPD are not deducted from future lost wages
+        collateral_benefits = dataclasses.replace(collateral_benefits, ltd_annual=0, cppd_annual=0)
+        total_annual_future_benefits = collateral_benefits.total_annual
+
         # Initialize variables with default values
-        hours_per_week = 40  # Default value
-        hours_per_day = 8    # Default value
-        working_days = int(request.form.get('working_days', 252))
-        
-        if is_hourly:
-            include_vacation_pay = request.form.get('include_vacation_pay') == 'yes'
-            hourly_rate = safe_float(request.form.get('hourly_rate'), 0)
-            hours_per_week = safe_float(request.form.get('hours_per_week'), 40)
-            salary = hourly_rate * hours_per_week * 52
-            if include_vacation_pay:
-                salary *= 1.04
-            hours_per_day = hours_per_week / 5
-        else:
-            salary = safe_float(request.form.get('salary'), 0)
-            hours_per_day = safe_float(request.form.get('hours_per_day'), 8)
-        
-        # Calculate take-home pay
-        result = calculate_take_home(salary, province, working_days, hours_per_day, is_hourly, hours_per_week, dependents)
-        logging.debug(f"Dependents: {dependents}")
-        logging.debug(f"Province: {province}")
-        logging.debug(f"Salary: {salary}")
-        
-        # Get collateral benefits
-        ei_benefits_to_date = safe_float(request.form.get('ei_benefits_to_date'))
-        section_b_to_date = safe_float(request.form.get('section_b_to_date'))
-        ltd_benefits_to_date = safe_float(request.form.get('ltd_benefits_to_date'))
-        cppd_benefits_to_date = safe_float(request.form.get('cppd_benefits_to_date'))
-        other_benefits_to_date = safe_float(request.form.get('other_benefits_to_date'))
-        
-        ei_benefits_annual = safe_float(request.form.get('ei_benefits_annual'))
-        section_b_annual = safe_float(request.form.get('section_b_annual'))
-        ltd_benefits_annual = safe_float(request.form.get('ltd_benefits_annual'))
-        cppd_benefits_annual = safe_float(request.form.get('cppd_benefits_annual'))
-        other_benefits_annual = safe_float(request.form.get('other_benefits_annual'))
-        
-        # Get dates with safe defaults
-        today = datetime.date.today()
-        
-        loss_date_str = request.form.get('loss_date')
-        if loss_date_str:
-            try:
-                loss_date = datetime.datetime.strptime(loss_date_str, '%Y-%m-%d').date()
-            except:
-                loss_date = today - datetime.timedelta(days=365)  # Default to 1 year ago
-        else:
-            loss_date = today - datetime.timedelta(days=365)  # Default to 1 year ago
-        
-        start_date_str = request.form.get('start_date')
-        if start_date_str:
-            try:
-                start_date = datetime.datetime.strptime(start_date_str, '%Y-%m-%d').date()
-            except:
-                start_date = today  # Default to today
-        else:
-            start_date = today  # Default to today
-        
-        # Get EI start date (use loss date if not provided)
-        ei_start_date_str = request.form.get('ei_benefits_start_date')
-        ei_start_date = loss_date  # Default
-        if ei_start_date_str:
-            try:
-                ei_start_date = datetime.datetime.strptime(ei_start_date_str, '%Y-%m-%d').date()
-            except:
-                # Handle invalid date format if needed
-                ei_start_date = loss_date
-        
-        # Create collateral benefits dictionary
-        total_past_benefits = (ei_benefits_to_date + section_b_to_date + 
-                              ltd_benefits_to_date + cppd_benefits_to_date + 
-                              other_benefits_to_date)
-        
-        total_annual_future_benefits = (ei_benefits_annual + section_b_annual + 
-                                       ltd_benefits_annual + cppd_benefits_annual + 
-                                       other_benefits_annual)
-        
-        collateral_benefits = {
-            "EI Benefits (to date)": ei_benefits_to_date,
-            "Section B Benefits (to date)": section_b_to_date,
-            "LTD Benefits (to date)": ltd_benefits_to_date,
-            "CPPD Benefits (to date)": cppd_benefits_to_date,
-            "Other Benefits (to date)": other_benefits_to_date,
-            "Total Past Benefits": total_past_benefits,
-            
-            "EI Benefits (annual)": ei_benefits_annual,
-            "Section B Benefits (annual)": section_b_annual,
-            "LTD Benefits (annual)": ltd_benefits_annual,
-            "CPPD Benefits (annual)": cppd_benefits_annual,
-            "Other Benefits (annual)": other_benefits_annual,
-            "Total Annual Future Benefits": total_annual_future_benefits
-        }
-        
-        # Calculate Net Pay Missed based on user input
-        missed_time_unit = request.form.get('missed_time_unit', 'days').lower()
-        missed_time = safe_float(request.form.get('missed_time'), 0)
-        
-        # Match the input time unit to the correct net pay rate
-        time_unit_map = {
-            "days": "Daily Net Pay",
-            "hours": "Hourly Net Pay",
-            "weeks": "Weekly Net Pay",
-            "months": "Monthly Net Pay"
-        }
-        
-        # Calculate the fraction of year for collateral benefits calculation
-        fraction_of_year = {
-            "days": missed_time / working_days if working_days > 0 else 0,
-            "hours": missed_time / (working_days * hours_per_day) if working_days > 0 and hours_per_day > 0 else 0,
-            "weeks": missed_time / 52,
-            "months": missed_time / 12
-        }
-        
-        time_fraction = fraction_of_year.get(missed_time_unit, 0)
-        
-        # Add dependents to calculation details
-        calculation_details = {} # Initialize empty dictionary if needed
-        calculation_details["Dependents"] = str(dependents)
-        
-        missed_pay = missed_time * result.get(time_unit_map.get(missed_time_unit, "Daily Net Pay"), 0)
-        
-        # Calculate collateral benefits deduction for past lost wages
-        collateral_deduction = total_annual_future_benefits * time_fraction
-        net_past_lost_wages = missed_pay - collateral_deduction
-        
-        # Special handling for New Brunswick
-        if province.lower() == "new brunswick":
-            # For New Brunswick, LTD and CPPD are not deducted from future lost wages
-            ltd_benefits_annual = 0
-            cppd_benefits_annual = 0
-            
-            # Recalculate total annual future benefits
-            total_annual_future_benefits = (ei_benefits_annual + section_b_annual + 
-                                          ltd_benefits_annual + cppd_benefits_annual + 
-                                          other_benefits_annual)
-            
-            # Update the collateral benefits dictionary
-            collateral_benefits["LTD Benefits (annual)"] = ltd_benefits_annual
-            collateral_benefits["CPPD Benefits (annual)"] = cppd_benefits_annual
-            collateral_benefits["Total Annual Future Benefits"] = total_annual_future_benefits
-        
-            # Initialize variables with default values
-            past_lost_wages_with_interest = net_past_lost_wages
-            calculation_details = {}
+        past_lost_wages_with_interest = net_past_lost_wages
+        calculation_details = {}
 
-            # Get PJI rate from form if available
-            pji_rate = request.form.get('pji_rate')
+        # Calculate past lost wages with interest
+        try:
+            # Get PJI rate from form
+            pji_rate = case.pji_rate
+
+            # The rate-path method accrues at the T-Bill rate in force each month, so the averaged form rate is not used
+            pji_method = case.pji_method
+            if pji_method == 'rate_path':
+                pji_rate = None
             
-            # Calculate past lost wages with interest
-            try:
-                # Get PJI rate from form
-                pji_rate = request.form.get('pji_rate')
-                
+            with stage('pji'):
                 past_lost_wages_with_interest, calculation_details = calculate_past_lost_wages_with_interest(
                     net_past_lost_wages,
                     loss_date.strftime('%Y-%m-%d'),  # Convert date object to string
-                    pji_rate  # Pass the PJI rate from the form
+                    pji_rate,  # Pass the PJI rate from the form
+                    method=pji_method,
+                    exact=app.config['EXACT_MODE']
                 )
-                
-                # Force the PJI rate to what came from the form
-                if pji_rate is not None:
-                    try:
-                        calculation_details["PJI Rate"] = float(pji_rate)
-                    except (ValueError, TypeError):
-                        pass
-                
-                calculation_details["Dependents"] = str(dependents)
-            except Exception as e:
-                # Provide default values
-                past_lost_wages_with_interest = net_past_lost_wages  # Use base amount without interest
-                calculation_details = {
-                    "Dependents": dependents,
-                    "Loss Date": loss_date.strftime('%Y-%m-%d'),
-                    "Proposal Date": start_date.strftime("%Y-%m-%d"),
-                    "Calculation Date": datetime.date.today().strftime('%Y-%m-%d'),
-                    "Years Between": 0,
-                    "PJI Rate": 0,
-                    "Base Amount": net_past_lost_wages,
-                    "Interest Amount": 0,
-                    "Past Lost Wages with Interest": net_past_lost_wages
-                }
-        # Make sure we have a non-zero interest amount if time has passed
-        if calculation_details.get("Interest Amount", 0) == 0 and calculation_details.get("Years Between", 0) > 0:
-            # Re-calculate interest amount based on PJI rate
-            pji_rate = calculation_details.get("PJI Rate", 2.0) / 100  # Convert to decimal
-            years_between = calculation_details.get("Years Between", 0)
-            base_amount = calculation_details.get("Base Amount", net_past_lost_wages)
             
-            # Calculate interest using compound interest formula
-            interest_amount = base_amount * pji_rate * years_between  # Simple interest as fallback
-            calculation_details["Interest Amount"] = interest_amount
-            calculation_details["Past Lost Wages with Interest"] = base_amount + interest_amount
-            past_lost_wages_with_interest = base_amount + interest_amount
-        
-        # Make sure the original_past_lost_wages is set in calculation_details
-        if "Original Past Lost Wages" not in calculation_details:
-            calculation_details["Original Past Lost Wages"] = net_past_lost_wages
-            # Handle return status with safer default and validation
-        return_status = request.form.get('return_status')
-        if not return_status:
-            return_status = 'returning to work'  # Default value
-        else:
-            return_status = return_status.lower()
-        
-        time_horizon = 0
-        birthdate = None
-        retirement_age = None
-        
-        if "return" in return_status:
-            # Handle returning to work scenario
-            end_date_str = request.form.get('end_date')
-            if not end_date_str:
-                # Default to a future date if not provided
-                end_date = start_date + datetime.timedelta(days=365)  # Default to 1 year
-            else:
+            # Force the PJI rate to what came from the form
+            if pji_rate is not None:
                 try:
-                    end_date = datetime.datetime.strptime(end_date_str, '%Y-%m-%d').date()
-                except:
-                    end_date = start_date + datetime.timedelta(days=365)
-            
-            days_difference = (end_date - start_date).days
-            time_horizon = days_difference / 365.25
-        else:
-            # Handle total disability scenario
-            birthdate_str = request.form.get('birthdate')
-            if not birthdate_str:
-                # Default to an age if not provided
-                birthdate = datetime.date(start_date.year - 40, start_date.month, start_date.day)  # Assume 40 years old
-            else:
-                try:
-                    birthdate = datetime.datetime.strptime(birthdate_str, '%Y-%m-%d').date()
-                except:
-                    birthdate = datetime.date(start_date.year - 40, start_date.month, start_date.day)
-            
-            retirement_age_str = request.form.get('retirement_age')
-            if not retirement_age_str:
-                retirement_age = 65  # Default retirement age
-            else:
-                try:
-                    retirement_age = int(retirement_age_str)
-                except:
-                    retirement_age = 65
-                
-            retirement_year = birthdate.year + retirement_age
-            retirement_month = birthdate.month
-            retirement_day = min(birthdate.day, 28)  # Avoid issues with month lengths
-            retirement_date = datetime.date(retirement_year, retirement_month, retirement_day)
-            
-            if retirement_date <= start_date:
-                time_horizon = 0
-            else:
-                days_difference = (retirement_date - start_date).days
-                time_horizon = days_difference / 365.25
-        
-        # Check if future lost wages should be calculated
-        calculate_future_wages = "calculate_future_wages" in request.form
-        if not calculate_future_wages:
-            present_value = 0
-            # Properly initialize present_value_details with all zeros
-            present_value_details = {
-                "annual_salary": 0,
-                "monthly_payment": 0,
-                "time_horizon": 0,
-                "total_months": 0,
-                "discount_rate": 0,
-                "present_value": 0,
-                "future_collateral_benefits": 0
+                    calculation_details["PJI Rate"] = float(pji_rate)
+                except (ValueError, TypeError):
+                    pass
+        except Exception as e:
+            # Provide default values
+            past_lost_wages_with_interest = net_past_lost_wages  # Use base amount without interest
+            calculation_details = {
+                "Loss Date": loss_date.strftime('%Y-%m-%d'),
+                "Proposal Date": start_date.strftime("%Y-%m-%d"),
+                "Calculation Date": today.strftime('%Y-%m-%d'),
+                "Years Between": 0,
+                "PJI Rate": 0,
+                "Base Amount": net_past_lost_wages,
+                "Interest Amount": 0,
+                "Past Lost Wages with Interest": net_past_lost_wages
             }
-        else:
-            # Calculate future lost wages
-            annual_net_salary = result["Net Pay (Provincially specific deductions for damages)"]
-            annual_collateral_benefits = total_annual_future_benefits
-            net_annual_salary = annual_net_salary - annual_collateral_benefits
-    
-            # Get discount rate with province-specific default
-            if province.lower() == "nova scotia":
-                default_discount_rate = 3.5
-            else:  # PEI, Newfoundland, New Brunswick all use 2.5
-                default_discount_rate = 2.5
-            annual_discount_rate = safe_float(request.form.get('discount_rate'), default_discount_rate) / 100
-
-            # Calculate present value
+    # Make sure we have a non-zero interest amount if time has passed
+    if calculation_details.get("Interest Amount", 0) == 0 and calculation_details.get("Years Between", 0) > 0:
+        # Re-calculate interest amount based on PJI rate
+        pji_rate = calculation_details.get("PJI Rate", 2.0) / 100  # Convert to decimal
+        years_between = calculation_details.get("Years Between", 0)
+        base_amount = calculation_details.get("Base Amount", net_past_lost_wages)
+        
+        # Calculate interest using compound interest formula
+        interest_amount = base_amount * pji_rate * years_between  # Simple interest as fallback
+        calculation_details["Interest Amount"] = interest_amount
+        calculation_details["Past Lost Wages with Interest"] = base_amount + interest_amount
+        past_lost_wages_with_interest = base_amount + interest_amount
+
+    time_horizon = 0
+    end_date = None
+    birthdate = None
+    retirement_age = None
+
+    if case.return_status == 'returning to work':
+        # Default to one year after the start date if no return date was given
+        end_date = case.end_date or start_date + datetime.timedelta(days=365)
+        days_difference = (end_date - start_date).days
+        time_horizon = days_difference / 365.25
+    else:
+        # Total disability: assume 40 years old at the start date if no birthdate was given
+        birthdate = case.birthdate or datetime.date(start_date.year - 40, start_date.month, start_date.day)
+        retirement_age = case.retirement_age
+        time_horizon = time_horizon_to_retirement(birthdate, retirement_age, start_date)
+
+    # Check if future lost wages should be calculated
+    if not case.calculate_future_wages:
+        present_value = 0
+        future_loss = FutureLoss.not_calculated()
+    else:
+        # Calculate future lost wages
+        annual_net_salary = take_home.net_pay
+        annual_collateral_benefits = total_annual_future_benefits
+        net_annual_salary = annual_net_salary - annual_collateral_benefits
+
+        # Get discount rate with province-specific default
+        if province.lower() == "nova scotia":
+            default_discount_rate = 3.5
+        else:  # PEI, Newfoundland, New Brunswick all use 2.5
+            default_discount_rate = 2.5
+        annual_discount_rate = (case.discount_rate if case.discount_rate is not None else default_discount_rate) / 100
+
+        # Calculate present value
+        with stage('annuity'):
             present_value, total_months = calculate_future_lost_wages_annuity(
-                net_annual_salary, time_horizon, annual_discount_rate
+                net_annual_salary, time_horizon, annual_discount_rate, exact=app.config['EXACT_MODE']
             )
-    
-            # Store details for document
-            present_value_details = {
-                "annual_salary": net_annual_salary,
-                "monthly_payment": net_annual_salary / 12,
-                "time_horizon": time_horizon,
-                "total_months": total_months,
-                "discount_rate": annual_discount_rate,
-                "present_value": present_value,
-                "future_collateral_benefits": annual_collateral_benefits * time_horizon
-            }
         
-        # Calculate total damages
-        total_damages = past_lost_wages_with_interest + present_value
+        # Real wage growth and CPPD indexation turn the level annuity into growing streams
+        wage_growth = case.wage_growth / 100
+        benefit_indexation = case.benefit_indexation / 100
+        per_year_tax = case.per_year_tax
+        if per_year_tax:
+            # Re-run each projection year's gross salary through that year's tax brackets
+            from wage_projection import project_after_tax_losses
+            
+            with stage('projection'):
+                projection = project_after_tax_losses(
+                    take_home.gross_income, start_date.year, time_horizon, annual_discount_rate, province,
+                    dependents=dependents,
+                    wage_growth=wage_growth,
+                    collateral_benefits=future_benefit_streams(collateral_benefits),
+                    inflation=benefit_indexation
+                )
+            present_value = projection['present_value']
+        elif wage_growth or benefit_indexation:
+            from wage_projection import project_future_losses
+            
+            with stage('projection'):
+                projection = project_future_losses(
+                    annual_net_salary, time_horizon, annual_discount_rate,
+                    wage_growth=wage_growth,
+                    collateral_benefits=future_benefit_streams(collateral_benefits),
+                    inflation=benefit_indexation
+                )
+            present_value = projection['present_value']
         
-        # Store calculation results in session for later use
-        session['client_name'] = client_name
-        session['province'] = province
-        session['calculation_details'] = calculation_details
-        session['present_value_details'] = present_value_details
-        session['result'] = result
-        session['collateral_benefits'] = collateral_benefits
-        session['missed_time_unit'] = missed_time_unit
-        session['missed_time'] = missed_time
-        session['birthdate'] = birthdate.strftime('%Y-%m-%d') if birthdate else None
-        session['retirement_age'] = retirement_age
-        session['loss_date'] = loss_date.strftime('%Y-%m-%d') if loss_date else None
-        session['current_date'] = today.strftime('%Y-%m-%d')
-        session['ei_days_remaining'] = max(0, 182 - (today - ei_start_date).days) if ei_start_date else 0
-        session['missed_pay'] = missed_pay
-        session['net_past_lost_wages'] = net_past_lost_wages
-        session['past_lost_wages_with_interest'] = past_lost_wages_with_interest
-        session['total_damages'] = total_damages
-                
-        # Return the results template
+        # Optionally weight total-disability losses for mortality, disability and unemployment
+        contingency_factor = None
+        if birthdate and case.apply_contingencies:
+            tables = get_configured_contingency_tables()
+            if tables is None:
+                logger.warning("Contingencies requested but no contingency tables are installed")
+            else:
+                start_age = (start_date - birthdate).days / 365.25
+                with stage('contingencies'):
+                    contingency_factor = tables.contingency_factor(
+                        case.sex, start_age, time_horizon, annual_discount_rate
+                    )
+                present_value = round(present_value * contingency_factor, 2)
+
+        future_loss = FutureLoss(
+            annual_salary=net_annual_salary,
+            monthly_payment=net_annual_salary / 12,
+            time_horizon=time_horizon,
+            total_months=total_months,
+            discount_rate=annual_discount_rate,
+            present_value=present_value,
+            future_collateral_benefits=annual_collateral_benefits * time_horizon,
+            contingency_factor=contingency_factor,
+            wage_growth=wage_growth,
+            benefit_indexation=benefit_indexation,
+            indexed_collateral_benefits=collateral_benefits.cppd_annual,
+            per_year_tax=per_year_tax,
+            gross_salary=take_home.gross_income
+        )
+    
+    # Calculate total damages
+    total_damages = past_lost_wages_with_interest + present_value
+
+    return DamagesResult(
+        client_name=client_name,
+        province=province,
+        dependents=dependents,
+        loss_date=loss_date,
+        start_date=start_date,
+        current_date=today,
+        return_status=case.return_status,
+        end_date=end_date,
+        birthdate=birthdate,
+        retirement_age=retirement_age,
+        ei_days_remaining=max(0, 182 - (today - ei_start_date).days),
+        take_home=take_home,
+        collateral_benefits=collateral_benefits,
+        past_loss=PastLoss(
+            missed_time=missed_time,
+            missed_time_unit=missed_time_unit,
+            missed_pay=missed_pay,
+            net_loss=net_past_lost_wages,
+            years_between=calculation_details.get("Years Between", 0),
+            pji_rate=calculation_details.get("PJI Rate"),
+            interest_amount=calculation_details.get("Interest Amount", 0),
+            with_interest=past_lost_wages_with_interest
+        ),
+        future_loss=future_loss,
+        total_damages=total_damages
+    )
+
+def get_session_damages():
+    """The DamagesResult of the session's last calculation, or None."""
+    data = session.get('damages')
+    return DamagesResult.from_dict(data) if data else None
+
+def render_results(damages):
+    """The results page for a DamagesResult."""
+    with stage('schedule'):
+        future_loss_schedule = build_future_loss_schedule(damages)
+        marginal_rates = build_marginal_rate_rows(damages.province, damages.dependents, damages.take_home.gross_income)
+
+    with stage('render'):
         return render_template(
             'results.html',
             title='ActuClaim - Economic Damages Results',
-            client_name=client_name,
-            province=province,
-            result=result,
-            missed_pay=missed_pay,
-            net_past_lost_wages=net_past_lost_wages,
-            calculation_details=calculation_details,
-            present_value_details=present_value_details,
-            total_damages=total_damages,
-            collateral_benefits=collateral_benefits,
-            missed_time_unit=missed_time_unit,
-            past_lost_wages_with_interest=past_lost_wages_with_interest,
-            missed_time=missed_time,
-            birthdate=birthdate,
-            retirement_age=retirement_age,
-            loss_date=loss_date,
-            current_date=today,
-            ei_days_remaining=max(0, 182 - (today - ei_start_date).days)
+            damages=damages,
+            figures=results_figures(damages),
+            future_loss_schedule=future_loss_schedule,
+            marginal_rates=marginal_rates
         )
+
+@app.route('/calculate', methods=['POST'])
+def calculate():
+    from case_schema import parse_case
+
+    today = datetime.date.today()
+    try:
+        with stage('parse'):
+            case, errors = parse_case(request.form)
+        if errors:
+            for error in errors:
+                flash(error['message'])
+            return redirect(url_for('index'))
+
+        # Serve an identical earlier case (same inputs, rates, tables and day) from the result cache
+        result_cache = get_configured_result_cache()
+        if result_cache is not None:
+            from result_cache import case_key, table_versions
+            from tbill_utils import get_store
+
+            with stage('result_cache'):
+                rates_version = get_store().data_version()
+                cache_key = case_key(case, rates_version, today, app.config['EXACT_MODE'],
+                                     tables=table_versions(app.config['CONTINGENCY_TABLES_PATH']))
+                cached = result_cache.get(cache_key, rates_version)
+            CACHE_LOOKUPS.inc(cache='results', result='hit' if cached is not None else 'miss')
+            if cached is not None:
+                session.update(cached['session'])
+                return cached['html']
+
+        damages = calculate_case(case, today)
+        session_values = {'damages': damages.to_dict()}
+        session.update(session_values)
+        CALCULATIONS.inc(province=damages.province.lower())
+
+        # A pending flash message would be rendered into the page; don't cache it
+        cacheable = result_cache is not None and '_flashes' not in session
+
+        # Return the results template
+        html = render_results(damages)
+        if cacheable:
+            result_cache.put(cache_key, rates_version, {'session': session_values, 'html': html})
+        return html
     
     except Exception as e:
-        error_details = traceback.format_exc()
-        logging.error(f"Error in calculate route: {e}")
-        logging.error(f"Detailed error traceback: {error_details}")
+        logger.exception(f"Error in calculate route: {e}")
         flash(f"An error occurred: {str(e)}")
         return redirect(url_for('index'))
 
+@app.route('/api/calculate', methods=['POST'])
+def api_calculate():
+    """
+    Damages for one case without the results page.
+
+    JSON body: the /calculate form fields by name (dates as YYYY-MM-DD, checkboxes as true/false).
+    Returns DamagesResult.to_dict(). Invalid fields are returned as
+    {"errors": [{"field", "message"}, ...]} with status 400.
+    """
+    from case_schema import parse_case
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'errors': [{'field': None, 'message': 'Expected a JSON object of case fields'}]}), 400
+    case, errors = parse_case(data)
+    if errors:
+        return jsonify({'errors': errors}), 400
+
+    try:
+        damages = calculate_case(case, datetime.date.today())
+    except Exception as e:
+        logger.exception(f"Error in calculate API: {e}")
+        return jsonify({'error': str(e)}), 500
+    CALCULATIONS.inc(province=damages.province.lower())
+    return jsonify(damages.to_dict())
+
 @app.route('/results')
 def results():
     # Check if calculation results exist in session
-    if not session.get('calculation_details'):
+    damages = get_session_damages()
+    if damages is None:
         flash('No calculation results found. Please complete a calculation first.', 'warning')
         return redirect(url_for('index'))
-    
-    # Render the results template with session data
-    return render_template(
-        'results.html',
-        title='ActuClaim - Economic Damages Results',
-        client_name=session.get('client_name', 'Client'),
-        province=session.get('province', ''),
-        result=session.get('result', {}),
-        missed_pay=session.get('missed_pay', 0),
-        net_past_lost_wages=session.get('net_past_lost_wages', 0),
-        calculation_details=session.get('calculation_details', {}),
-        present_value_details=session.get('present_value_details', {}),
-        total_damages=session.get('total_damages', 0),
-        collateral_benefits=session.get('collateral_benefits', {}),
-        missed_time_unit=session.get('missed_time_unit', ''),
-        past_lost_wages_with_interest=session.get('past_lost_wages_with_interest', 0),
-        missed_time=session.get('missed_time', 0),
-        file_path=session.get('file_path', None),
-        filename=session.get('filename', None),
-        birthdate=session.get('birthdate', None),
-        retirement_age=session.get('retirement_age', None),
-        loss_date=session.get('loss_date', None),
-        current_date=datetime.date.today(),
-        ei_days_remaining=session.get('ei_days_remaining', 0)
-    )
+    return render_results(damages)
+
+# Longest /jobs/<id>?wait= a request worker will block for
+MAX_JOB_WAIT_SECONDS = 10
+
+def job_status(job):
+    """Public view of a report job."""
+    def timestamp(value):
+        return datetime.datetime.fromtimestamp(value).isoformat(timespec='seconds') if value else None
+    return {
+        'job_id': job['job_id'],
+        'format': job['format'],
+        'status': job['status'],
+        'error': job['error'],
+        'created_at': timestamp(job['created_at']),
+        'finished_at': timestamp(job['finished_at']),
+        'status_url': url_for('report_job_status', job_id=job['job_id']),
+        'download_url': url_for('download_report', job_id=job['job_id']) if job['status'] == 'done' else None
+    }
+
+def get_session_job(job_id):
+    """The report job if it was submitted from this session, else None."""
+    if job_id not in session.get('report_jobs', []):
+        return None
+    from report_jobs import get_report_jobs
+    from tbill_utils import get_store
+    return get_report_jobs(get_store().db_path)
+
+@app.route('/reports', methods=['POST'])
+def submit_report():
+    """Queue a PDF or Word report of the session's results; poll the returned status_url."""
+    from report_jobs import REPORT_FORMATS, get_report_jobs
+    from tbill_utils import get_store
+
+    report_format = (request.form.get('format') or 'pdf').lower()
+    if report_format not in REPORT_FORMATS:
+        return jsonify({'error': f"Unknown report format: {report_format}"}), 400
+    damages = get_session_damages()
+    if damages is None:
+        return jsonify({'error': 'No calculation results found. Please complete a calculation first.'}), 400
+
+    params = {'damages': damages.to_dict(), 'future_loss_schedule': build_future_loss_schedule(damages)}
+    download_name = secure_filename(f"{damages.client_name or 'Client'} Economic Damages Report")
+    download_name += REPORT_FORMATS[report_format][0]
+
+    jobs = get_report_jobs(get_store().db_path)
+    job_id = jobs.submit(report_format, params, download_name)
+    session['report_jobs'] = (session.get('report_jobs', []) + [job_id])[-20:]
+    response = jsonify(job_status(jobs.get(job_id)))
+    response.status_code = 202
+    response.headers['Location'] = url_for('report_job_status', job_id=job_id)
+    return response
+
+@app.route('/jobs/<job_id>')
+def report_job_status(job_id):
+    """Report job status; ?wait=N blocks up to N seconds (at most MAX_JOB_WAIT_SECONDS) for it to finish."""
+    jobs = get_session_job(job_id)
+    if jobs is None:
+        return jsonify({'error': 'Job not found'}), 404
+    wait = min(max(request.args.get('wait', 0, type=float), 0), MAX_JOB_WAIT_SECONDS)
+    job = jobs.wait(job_id, wait)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job_status(job))
+
+@app.route('/jobs/<job_id>/download')
+def download_report(job_id):
+    """The finished report as an attachment."""
+    from report_jobs import REPORT_FORMATS
+
+    jobs = get_session_job(job_id)
+    job = jobs.get(job_id) if jobs is not None else None
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job['status'] != 'done':
+        return jsonify(job_status(job)), 409
+    return send_file(job['output_path'], as_attachment=True, download_name=job['download_name'],
+                     mimetype=REPORT_FORMATS[job['format']][1])
 
 app.register_blueprint(pji_routes)
+app.register_blueprint(rate_routes)
+app.register_blueprint(sensitivity_routes)
+app.register_blueprint(ledger_routes)
+app.register_blueprint(tax_routes)
+app.register_blueprint(metrics_routes)
+
+if app.config['STAGE_TIMING']:
+    app.session_interface = TimedSessionInterface()
+    app.wsgi_app = StageTimingMiddleware(app.wsgi_app, log_threshold_ms=app.config['STAGE_TIMING_LOG_MS'])
 
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Monte Carlo contingency simulation.
+
+The tables used here are SYNTHETIC (a Gompertz mortality curve, a flat-then-rising
+disability incidence and a U-shaped unemployment rate). They are only realistic
+enough to exercise the code; they are not actuarial tables and must not be used
+for reports.
+
+Checks that a run with no contingencies reproduces the closed-form annuity, that
+the same seed gives the same result in-process and across the process pool, and
+reports the wall time for each path count.
+
+Usage:
+    python benchmarks/bench_contingency_simulation.py [--paths 10000 100000] [--processes N]
+"""
+import argparse
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import numpy as np  # noqa: E402
+
+from contingency_simulation import simulate_future_loss  # noqa: E402
+
+ANNUAL_LOST_WAGES = 60000.0
+START_AGE = 35.4
+RETIREMENT_AGE = 65
+DISCOUNT_RATE = 0.025
+
+
+def synthetic_tables(max_age=110):
+    """SYNTHETIC benchmark tables by integer age - not for actuarial use."""
+    ages = np.arange(max_age + 1, dtype=float)
+    mortality = np.minimum(0.00005 * np.exp(0.095 * ages), 1.0)
+    disability = np.where(ages < 40, 0.002, 0.002 * np.exp(0.07 * (ages - 40)))
+    unemployment = 0.05 + 0.0004 * (ages - 45) ** 2 / 10
+    return mortality, np.minimum(disability, 1.0), np.clip(unemployment, 0.0, 0.5)
+
+
+def closed_form(annual, horizon, rate):
+    return annual * (1 - (1 + rate) ** -horizon) / rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--paths', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--processes', type=int, default=None, help="Pool processes (default: the CPU count)")
+    parser.add_argument('--seed', type=int, default=20240101)
+    args = parser.parse_args()
+
+    mortality, disability, unemployment = synthetic_tables()
+
+    # With no contingency tables every path is the certain annuity
+    certain = simulate_future_loss(ANNUAL_LOST_WAGES, START_AGE, RETIREMENT_AGE, DISCOUNT_RATE,
+                                   paths=1000, seed=args.seed)
+    expected = closed_form(ANNUAL_LOST_WAGES, RETIREMENT_AGE - START_AGE, DISCOUNT_RATE)
+    assert abs(certain['mean'] - expected) < 0.01, (certain['mean'], expected)
+    print(f"No-contingency check: {certain['mean']:,.2f} vs closed form {expected:,.2f}")
+
+    for paths in args.paths:
+        start = time.perf_counter()
+        result = simulate_future_loss(ANNUAL_LOST_WAGES, START_AGE, RETIREMENT_AGE, DISCOUNT_RATE,
+                                      mortality, disability, unemployment,
+                                      paths=paths, seed=args.seed, processes=args.processes)
+        elapsed = time.perf_counter() - start
+
+        inline = simulate_future_loss(ANNUAL_LOST_WAGES, START_AGE, RETIREMENT_AGE, DISCOUNT_RATE,
+                                      mortality, disability, unemployment,
+                                      paths=paths, seed=args.seed, processes=1)
+        assert inline == result, "Result depends on the number of processes"
+
+        percentiles = ', '.join(f"p{p}={v:,.0f}" for p, v in result['percentiles'].items())
+        print(f"{paths:>8,} paths: {elapsed:6.2f} s  mean={result['mean']:,.2f}  "
+              f"factor={result['contingency_factor']:.4f}  {percentiles}")
+
+
+if __name__ == '__main__':
+    main()
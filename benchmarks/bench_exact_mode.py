@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark the float damages pipeline against the exact Decimal mode.
+
+Runs the application's take-home pay, past-loss interest and future-loss present
+value functions for the same randomized corpus used by crosscheck_exact_mode.py
+in both modes and
+reports microseconds per case and the slowdown of exact mode.
+
+Usage:
+    python benchmarks/bench_exact_mode.py [--cases N] [--repeat N]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+from crosscheck_exact_mode import generate_cases, pipeline_outputs  # noqa: E402
+
+
+def time_mode(function, cases, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for case in cases:
+            function(case)
+        timings.append((time.perf_counter() - start) / len(cases))
+    return statistics.median(timings) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cases', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=2024)
+    args = parser.parse_args()
+
+    cases = generate_cases(args.cases, args.seed)
+    float_us = time_mode(lambda case: pipeline_outputs(case, exact=False), cases, args.repeat)
+    exact_us = time_mode(lambda case: pipeline_outputs(case, exact=True), cases, args.repeat)
+
+    print(f"{args.cases:,} cases, median of {args.repeat} runs")
+    print(f"  float   {float_us:8.2f} us/case")
+    print(f"  exact   {exact_us:8.2f} us/case  ({exact_us / float_us:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Measure ActuClaim cold-start import time and enforce the startup budget.
+
+Runs `python -X importtime` in a fresh interpreter that imports app and serves
+`/` through Flask's test client, then reports the slowest imports and fails
+(exit status 1) if the import time exceeds the budget in
+benchmarks/import_budget.json or if any forbidden heavy module (pandas,
+ReportLab, python-docx, ...) was loaded.
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs N] [--top N] [--budget-ms MS]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+BUDGET_PATH = os.path.join(BENCH_DIR, 'import_budget.json')
+
+CHILD_SCRIPT = """
+import json, sys
+import app
+response = app.app.test_client().get('/')
+print(json.dumps({'status': response.status_code, 'modules': sorted(sys.modules)}))
+"""
+
+
+def run_once():
+    """Import the app in a fresh interpreter; return (cumulative import us per module, child report)."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='0')
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD_SCRIPT],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True, check=False
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"App import failed:\n{proc.stderr[-2000:]}")
+
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3:
+            continue
+        name = parts[2].rstrip()
+        # Nested imports are indented by two spaces per level
+        depth = (len(name) - len(name.lstrip())) // 2
+        cumulative[name.strip()] = (int(parts[1]), depth)
+
+    report = json.loads(proc.stdout.strip().splitlines()[-1])
+    return cumulative, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters to time (median is used)')
+    parser.add_argument('--top', type=int, default=15, help='slowest top-level imports to list')
+    parser.add_argument('--budget-ms', type=float, default=None, help='override max_import_ms from the budget file')
+    args = parser.parse_args()
+
+    with open(BUDGET_PATH) as f:
+        budget = json.load(f)
+    max_ms = args.budget_ms if args.budget_ms is not None else budget['max_import_ms']
+
+    totals = []
+    last = None
+    report = None
+    for _ in range(args.runs):
+        cumulative, report = run_once()
+        totals.append(sum(us for us, depth in cumulative.values() if depth == 0) / 1000)
+        last = cumulative
+
+    app_ms = last.get('app', (0, 0))[0] / 1000
+    total_ms = statistics.median(totals)
+    print(f"Total import time (median of {args.runs}): {total_ms:.1f} ms")
+    print(f"  import app: {app_ms:.1f} ms (last run)")
+    print(f"  GET / status: {report['status']}")
+
+    print(f"\nSlowest imports by cumulative time (last run):")
+    slowest = sorted(((us, name) for name, (us, _) in last.items() if name != 'app'), reverse=True)
+    for us, name in slowest[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    failures = []
+    if total_ms > max_ms:
+        failures.append(f"import time {total_ms:.1f} ms exceeds budget of {max_ms:.0f} ms")
+    loaded = set(report['modules'])
+    for module in budget['forbidden_modules']:
+        if module in loaded:
+            failures.append(f"'{module}' was imported while starting the app and serving /")
+    if report['status'] != 200:
+        failures.append(f"GET / returned {report['status']}")
+
+    if failures:
+        print("\nBUDGET EXCEEDED:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+
+    print(f"\nWithin budget ({max_ms:.0f} ms, no forbidden modules loaded)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark the lxml T-Bill rate parser on recorded multi-year pages.
+
+Times tbill_parser against the previous BeautifulSoup/html.parser implementation
+(when bs4 is installed) on every fixture in benchmarks/fixtures, checks both
+produce the same rates, and reports milliseconds per page.
+
+Usage:
+    python benchmarks/bench_tbill_parser.py [--repeat N]
+"""
+import argparse
+import datetime
+import glob
+import os
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from tbill_parser import parse_rates_file, parse_rate_value  # noqa: E402
+
+FIXTURE_DIR = os.path.join(BENCH_DIR, 'fixtures')
+
+
+def legacy_parse_html(content):
+    """The html.parser implementation previously inlined in TBillUpdater.fetch_tbill_rates."""
+    from bs4 import BeautifulSoup
+
+    rates = {}
+    soup = BeautifulSoup(content, 'html.parser')
+    all_tables = soup.find_all('table')
+    if not all_tables:
+        return rates
+
+    data_table = all_tables[-1]
+    headers = []
+    header_row = data_table.find('tr')
+    if header_row:
+        headers = [cell.text.strip() for cell in header_row.find_all(['th', 'td'])]
+
+    if 'V39059' not in headers:
+        return rates
+    v39059_index = headers.index('V39059')
+
+    date_columns = []
+    for i, header in enumerate(headers):
+        if i > v39059_index and header:
+            try:
+                date_columns.append((i, datetime.datetime.strptime(header, '%Y-%m-%d').date()))
+            except (ValueError, TypeError):
+                pass
+
+    data_rows = data_table.find_all('tr')[1:]
+    if not date_columns:
+        for row in data_rows:
+            cells = row.find_all('td')
+            if len(cells) >= 2:
+                try:
+                    date = datetime.datetime.strptime(cells[0].text.strip(), '%Y-%m-%d').date()
+                except ValueError:
+                    continue
+                if v39059_index < len(cells):
+                    rate = parse_rate_value(cells[v39059_index].text)
+                    if rate is not None:
+                        rates[date] = rate
+    else:
+        for row in data_rows:
+            cells = row.find_all('td')
+            for col_index, date in date_columns:
+                if col_index - 1 < len(cells):
+                    rate = parse_rate_value(cells[col_index - 1].text)
+                    if rate is not None:
+                        rates[date] = rate
+
+    if len(all_tables) > 1:
+        for row in all_tables[0].find_all('tr')[1:]:
+            cells = row.find_all('td')
+            if len(cells) >= 2:
+                try:
+                    date = datetime.datetime.strptime(cells[0].text.strip(), '%Y-%m-%d').date()
+                except ValueError:
+                    continue
+                rate = parse_rate_value(cells[1].text)
+                if rate is not None:
+                    rates[date] = rate
+    return rates
+
+
+def time_call(func, arg, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(arg)
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20, help='timing repetitions per fixture')
+    args = parser.parse_args()
+
+    try:
+        import bs4  # noqa: F401
+        have_bs4 = True
+    except ImportError:
+        have_bs4 = False
+
+    fixtures = sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.*')))
+    fixtures = [f for f in fixtures if f.endswith(('.html', '.csv', '.json'))]
+    if not fixtures:
+        print("No fixtures found; run benchmarks/fixtures/make_rate_fixtures.py first")
+        return 1
+
+    print(f"{'fixture':<42} {'rates':>6} {'lxml ms':>9} {'bs4 ms':>9} {'speedup':>8}")
+    for path in fixtures:
+        name = os.path.basename(path)
+        rates, fast_ms = time_call(parse_rates_file, path, args.repeat)
+
+        legacy_ms = None
+        if have_bs4 and path.endswith('.html'):
+            with open(path, 'rb') as f:
+                content = f.read()
+            legacy_rates, legacy_ms = time_call(legacy_parse_html, content, max(1, args.repeat // 4))
+            if legacy_rates != rates:
+                print(f"MISMATCH in {name}: lxml={len(rates)} rates, legacy={len(legacy_rates)} rates")
+                return 1
+
+        legacy_col = f"{legacy_ms:9.2f}" if legacy_ms is not None else f"{'-':>9}"
+        speedup_col = f"{legacy_ms / fast_ms:7.1f}x" if legacy_ms else f"{'-':>8}"
+        print(f"{name:<42} {len(rates):>6} {fast_ms:9.2f} {legacy_col} {speedup_col}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
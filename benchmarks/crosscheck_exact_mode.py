@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Cross-check the float damages pipeline against the exact Decimal mode.
+
+Generates a reproducible randomized corpus of claims (income, province,
+dependents, schedule, past loss, interest rate and period, future horizon and
+discount rate), runs calculate_take_home, calculate_past_lost_wages_with_interest
+and calculate_future_lost_wages_annuity with exact=False and with exact=True,
+and flags every output that differs by more than the tolerance. Exits with
+status 1 if any case is flagged.
+
+Usage:
+    python benchmarks/crosscheck_exact_mode.py [--cases N] [--seed S] [--tolerance 0.01] [--show N]
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from damages_results import labelled_take_home  # noqa: E402
+from income_calculations import calculate_take_home  # noqa: E402
+from lost_wages_calculations import (  # noqa: E402
+    calculate_past_lost_wages_with_interest, calculate_future_lost_wages_annuity
+)
+from tax_calculations import PROVINCIAL_BRACKETS  # noqa: E402
+
+PROVINCES = sorted(PROVINCIAL_BRACKETS)
+
+
+def generate_cases(count, seed):
+    """Reproducible random claims covering every province, hourly and salaried pay and bracket edges."""
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(count):
+        is_hourly = rng.random() < 0.3
+        cases.append({
+            'income': round(rng.choice([rng.uniform(0, 400000), rng.uniform(40000, 120000)]), 2),
+            'province': rng.choice(PROVINCES),
+            'dependents': rng.randint(0, 5),
+            'working_days': rng.choice([200, 230, 250, 260]),
+            'hours_per_day': rng.choice([6, 7.5, 8, 10]),
+            'is_hourly': is_hourly,
+            'hours_per_week': rng.choice([20, 37.5, 40, 44]) if is_hourly else None,
+            'past_loss': round(rng.uniform(0, 150000), 2),
+            'pji_rate': round(rng.uniform(0.5, 6.0), 2),
+            'days': rng.randint(0, 3650),
+            'annual_loss': round(rng.uniform(0, 120000), 2),
+            'time_horizon': round(rng.uniform(0, 45), 4),
+            'discount_rate': rng.choice([0.0, 0.015, 0.025, 0.035, round(rng.uniform(0.005, 0.06), 4)]),
+        })
+    return cases
+
+
+def pipeline_outputs(case, exact):
+    """Take-home pay, past loss with interest and future loss PV from the application's functions."""
+    take_home = calculate_take_home(
+        case['income'], case['province'], case['working_days'], case['hours_per_day'],
+        case['is_hourly'], case['hours_per_week'], case['dependents'], exact=exact
+    )
+    outputs = {key: value for key, value in labelled_take_home(take_home).items() if isinstance(value, (int, float))}
+    # The past-loss calculation runs to today, so date the loss the case's number of days back
+    loss_date = (datetime.date.today() - datetime.timedelta(days=case['days'])).isoformat()
+    outputs['Past Loss with Interest'], _ = calculate_past_lost_wages_with_interest(
+        case['past_loss'], loss_date, pji_rate=case['pji_rate'], exact=exact
+    )
+    outputs['Future Loss Present Value'], _ = calculate_future_lost_wages_annuity(
+        case['annual_loss'], case['time_horizon'], case['discount_rate'], exact=exact
+    )
+    return outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cases', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=2024)
+    parser.add_argument('--tolerance', type=float, default=0.01, help="Largest acceptable difference in dollars")
+    parser.add_argument('--show', type=int, default=10, help="Number of flagged divergences to print")
+    args = parser.parse_args()
+
+    cent_differences = {}
+    flagged = []
+    for index, case in enumerate(generate_cases(args.cases, args.seed)):
+        float_result = pipeline_outputs(case, exact=False)
+        exact_result = pipeline_outputs(case, exact=True)
+        for key, exact_value in exact_result.items():
+            difference = abs(float(exact_value) - float_result[key])
+            if difference >= 0.005:
+                cent_differences[key] = cent_differences.get(key, 0) + 1
+            if difference > args.tolerance + 1e-9:
+                flagged.append((difference, index, key, float_result[key], exact_value, case))
+
+    print(f"Compared {args.cases:,} cases (seed {args.seed}, tolerance ${args.tolerance:.2f})")
+    for key, count in sorted(cent_differences.items(), key=lambda item: -item[1]):
+        print(f"  {key:<55} {count:>7,} cases differ by a cent or more")
+
+    if flagged:
+        flagged.sort(key=lambda item: -item[0])
+        print(f"\n{len(flagged):,} divergences over tolerance; largest:")
+        for difference, index, key, float_value, exact_value, case in flagged[:args.show]:
+            print(f"  case {index}: {key}: float {float_value} vs exact {exact_value} (diff {difference:.4f}) {case}")
+        sys.exit(1)
+    print("No divergences over tolerance")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Build the recorded rate fixtures used by the parser benchmark.
+
+The pages mirror the Bank of Canada bond-yield lookup layouts handled by
+tbill_parser (summary table + row-per-date table, and the transposed
+date-per-column table) and the Valet CSV/JSON exports. Rates come from the
+stored series in data/TBill Rate (2022 to present).xlsx so the fixtures
+cover the same multi-year range the application backfills.
+
+Usage:
+    python benchmarks/fixtures/make_rate_fixtures.py
+"""
+import csv
+import io
+import json
+import os
+
+import pandas as pd
+
+FIXTURE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(os.path.dirname(FIXTURE_DIR))
+EXCEL_PATH = os.path.join(ROOT_DIR, 'data', 'TBill Rate (2022 to present).xlsx')
+
+PAGE_HEAD = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Lookup Bond Yields - Bank of Canada</title>
+<link rel="stylesheet" href="/wp-content/themes/boc/style.css"></head>
+<body><header><nav><ul><li><a href="/rates/">Rates</a></li><li><a href="/markets/">Markets</a></li></ul></nav></header>
+<main><h1>Selected Government of Canada bond yields</h1>
+"""
+PAGE_TAIL = "</main><footer><p>Bank of Canada</p></footer></body></html>\n"
+
+
+def load_series():
+    df = pd.read_excel(EXCEL_PATH)
+    df['Date'] = pd.to_datetime(df['Date']).dt.strftime('%Y-%m-%d')
+    df = df.sort_values('Date')
+    return list(zip(df['Date'], df['T-Bill Rate'].astype(str)))
+
+
+def row_layout_page(series):
+    parts = [PAGE_HEAD]
+    parts.append('<table class="summary"><tr><th>Date</th><th>Rate</th></tr>\n')
+    for date, rate in series:
+        parts.append(f'<tr><td>{date}</td><td>{rate}</td></tr>\n')
+    parts.append('</table>\n<p>Series: V39059</p>\n')
+    parts.append('<table class="bocss-table"><thead><tr><th>Date</th><th>V39059</th></tr></thead><tbody>\n')
+    for date, rate in series:
+        parts.append(f'<tr><td>{date}</td><td>{rate}</td></tr>\n')
+    parts.append('</tbody></table>\n')
+    parts.append(PAGE_TAIL)
+    return ''.join(parts)
+
+
+def transposed_page(series):
+    parts = [PAGE_HEAD, '<table class="bocss-table"><tr><th>Series</th><th>V39059</th>']
+    parts.extend(f'<th>{date}</th>' for date, _ in series)
+    parts.append('</tr>\n<tr><th>1-3 year</th>')
+    # Data cells line up with the date headers after the leading <th> label
+    parts.append('<td></td>')
+    parts.extend(f'<td>{rate}</td>' for _, rate in series)
+    parts.append('</tr></table>\n')
+    parts.append(PAGE_TAIL)
+    return ''.join(parts)
+
+
+def valet_json(series):
+    return json.dumps({
+        'terms': {'url': 'https://www.bankofcanada.ca/terms/'},
+        'seriesDetail': {'V39059': {'label': 'V39059', 'description': 'Government of Canada marketable bonds - 1-3 year'}},
+        'observations': [{'d': date, 'V39059': {'v': rate}} for date, rate in series],
+    }, indent=1)
+
+
+def valet_csv(series):
+    out = io.StringIO()
+    out.write('"TERMS AND CONDITIONS"\n"https://www.bankofcanada.ca/terms/"\n\n')
+    out.write('"SERIES"\n"id","label","description"\n"V39059","V39059","Government of Canada marketable bonds - 1-3 year"\n\n')
+    out.write('"OBSERVATIONS"\n')
+    writer = csv.writer(out, quoting=csv.QUOTE_ALL, lineterminator='\n')
+    writer.writerow(['date', 'V39059'])
+    writer.writerows(series)
+    return out.getvalue()
+
+
+def main():
+    series = load_series()
+    outputs = {
+        'boc_lookup_2022_2025.html': row_layout_page(series),
+        'boc_lookup_2022_2025_transposed.html': transposed_page(series),
+        'valet_V39059_2022_2025.json': valet_json(series),
+        'valet_V39059_2022_2025.csv': valet_csv(series),
+    }
+    for name, content in outputs.items():
+        with open(os.path.join(FIXTURE_DIR, name), 'w', encoding='utf-8') as f:
+            f.write(content)
+        print(f"Wrote {name} ({len(content):,} bytes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Load test for sizing the server: replays a mix of /calculate submissions,
+/calculate-pji calls and report downloads against a locally started gunicorn.
+
+gunicorn is started from the application directory with gunicorn.conf.py (so
+preloading and warm-up match production), bound to a free local port and
+pointed at a scratch database seeded with the fixture T-Bill rates. Client
+threads then send requests for --duration seconds, each one drawn from the mix
+in benchmarks/fixtures/load_mix.json. The request weights choose between a
+/calculate claim (province, salaried or hourly, returning to work or total
+disability, averaged or rate-path interest, and whether future losses are
+calculated), a /calculate-pji call, and a PDF or Word report of the client's
+last claim: POST /reports, wait on /jobs/<id>, then GET /jobs/<id>/download
+with the session cookie from that /calculate. A report is timed from submission
+to the end of the download. Amounts, dates and ages are randomized within
+realistic ranges from a fixed seed, so runs replay the same requests.
+
+Reports throughput, p50/p95/p99 latency (overall and per request type) and the resident (RSS) and proportional
+(PSS, counting copy-on-write pages shared with the master once) memory of each
+worker, sampled during the run. Results are written as JSON; --save-baseline
+stores them as benchmarks/load_baseline.json, and every run is compared with that
+baseline (or --compare): the run fails if throughput drops, or p95 latency or
+worker memory grows, by more than --threshold.
+
+Usage:
+    python benchmarks/load_test.py [--workers N] [--concurrency N] [--duration 30] [--warmup 5]
+                                   [--mix PATH] [--seed 1] [--output PATH]
+                                   [--save-baseline | --compare PATH] [--threshold 1.25]
+"""
+import argparse
+import datetime
+import http.client
+import importlib.util
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+# Importing run_benchmarks points ACTUCLAIM_DB_PATH at a scratch database; gunicorn inherits it
+from run_benchmarks import ROOT_DIR, RESULTS_DIR, seed_rate_store, git_commit, _scratch_dir  # noqa: E402
+
+DEFAULT_MIX = os.path.join(BENCH_DIR, 'fixtures', 'load_mix.json')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'load_baseline.json')
+
+# Claims fall inside the fixture's rate range
+LOSS_DATES = (datetime.date(2022, 2, 1), datetime.date(2024, 6, 30))
+
+
+def pick(rng, weights):
+    """Draw a key from {value: weight}."""
+    values = list(weights)
+    return rng.choices(values, weights=[weights[value] for value in values])[0]
+
+
+def random_date(rng, first, last):
+    return first + datetime.timedelta(days=rng.randrange((last - first).days + 1))
+
+
+def make_claim(rng, mix):
+    """One /calculate form submission drawn from the mix."""
+    loss_date = random_date(rng, *LOSS_DATES)
+    start_date = loss_date + datetime.timedelta(days=rng.randrange(180, 900))
+    form = {
+        'client_name': 'Load Test Claimant',
+        'province': pick(rng, mix['province']),
+        'dependents': str(rng.choice((0, 0, 1, 2, 3))),
+        'employment_type': pick(rng, mix['employment_type']),
+        'working_days': '252',
+        'loss_date': loss_date.isoformat(),
+        'start_date': start_date.isoformat(),
+        'missed_time': str(rng.randrange(3, 37)),
+        'missed_time_unit': 'months',
+        'ei_benefits_to_date': str(rng.choice((0, 4500, 9000, 15000))),
+        'ltd_benefits_annual': str(rng.choice((0, 0, 12000, 24000))),
+        'cppd_benefits_annual': str(rng.choice((0, 0, 6000, 9000))),
+        'pji_method': pick(rng, mix['pji_method']),
+        'return_status': pick(rng, mix['return_status']),
+        'discount_rate': '2.5',
+    }
+    if form['employment_type'] == 'hourly':
+        form['hourly_rate'] = f"{rng.uniform(16, 45):.2f}"
+        form['hours_per_week'] = str(rng.choice((30, 37.5, 40, 44)))
+        if rng.random() < 0.5:
+            form['include_vacation_pay'] = 'yes'
+    else:
+        form['salary'] = str(rng.randrange(35000, 120001, 500))
+        form['hours_per_day'] = '8'
+
+    if form['return_status'] == 'total disability':
+        age = rng.randrange(25, 61)
+        form['birthdate'] = random_date(rng, datetime.date(start_date.year - age - 1, 1, 1),
+                                        datetime.date(start_date.year - age - 1, 12, 28)).isoformat()
+        form['retirement_age'] = str(rng.choice((60, 65, 65, 67)))
+    else:
+        form['end_date'] = (start_date + datetime.timedelta(days=rng.randrange(90, 1100))).isoformat()
+
+    if rng.random() < mix['calculate_future_wages']:
+        form['calculate_future_wages'] = 'on'
+    return form
+
+
+def make_pji_request(rng, mix):
+    """One /calculate-pji JSON body drawn from the mix."""
+    loss_date = random_date(rng, *LOSS_DATES)
+    request = {
+        'loss_date': loss_date.isoformat(),
+        'amount': rng.randrange(5000, 150001, 500),
+        'method': pick(rng, mix['pji_method']),
+    }
+    if rng.random() < 0.5:
+        request['loss_end_date'] = (loss_date + datetime.timedelta(days=rng.randrange(90, 900))).isoformat()
+    return request
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_gunicorn(port, workers, log_path):
+    command = [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}']
+    if workers:
+        command += ['--workers', str(workers)]
+    env = dict(os.environ,
+               ACTUCLAIM_METRICS_DIR=os.path.join(_scratch_dir, 'metrics'),
+               ACTUCLAIM_LOG_FILE=os.path.join(_scratch_dir, 'app.log'))
+    with open(log_path, 'w') as log:
+        return subprocess.Popen(command + ['app:app'], cwd=ROOT_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+def configured_workers():
+    """The worker count gunicorn.conf.py would use on this machine."""
+    spec = importlib.util.spec_from_file_location('gunicorn_conf', os.path.join(ROOT_DIR, 'gunicorn.conf.py'))
+    config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(config)
+    return config.workers
+
+
+def wait_until_ready(port, server, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {server.returncode}")
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            connection.request('GET', '/')
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"gunicorn did not answer on port {port} within {timeout}s")
+
+
+def worker_pids(master_pid):
+    """Pids of the gunicorn master's children (Linux /proc)."""
+    pids = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # The command name is in parentheses and may contain spaces
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == master_pid:
+            pids.append(int(entry))
+    return sorted(pids)
+
+
+def process_memory(pid):
+    """{'rss_mb', 'pss_mb'} from /proc/<pid>/smaps_rollup, or None if unavailable."""
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            text = f.read()
+    except OSError:
+        return None
+    values = {}
+    for line in text.splitlines():
+        name, _, rest = line.partition(':')
+        if name in ('Rss', 'Pss'):
+            values[f'{name.lower()}_mb'] = int(rest.split()[0]) / 1024
+    return values or None
+
+
+class MemorySampler(threading.Thread):
+    """Peak memory per worker, sampled every interval seconds."""
+
+    def __init__(self, master_pid, interval=0.5):
+        super().__init__(daemon=True)
+        self.master_pid = master_pid
+        self.interval = interval
+        self.peaks = {}
+        self.stopped = threading.Event()
+
+    def sample(self):
+        for pid in worker_pids(self.master_pid):
+            memory = process_memory(pid)
+            if memory is None:
+                continue
+            peak = self.peaks.setdefault(pid, {'rss_mb': 0.0, 'pss_mb': 0.0})
+            for name, value in memory.items():
+                peak[name] = max(peak[name], value)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+
+class Client:
+    """One browser: sends requests to the server and keeps its cookies (the session) between them."""
+
+    def __init__(self, port):
+        self.port = port
+        self.cookies = {}
+
+    def request(self, method, path, body=None, content_type=None):
+        """(status, body); status 0 if the connection failed."""
+        headers = {'Content-Type': content_type} if content_type else {}
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{name}={value}' for name, value in self.cookies.items())
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=60)
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            data = response.read()
+            connection.close()
+        except OSError:
+            return 0, b''
+        for cookie in response.headers.get_all('Set-Cookie') or []:
+            name, _, value = cookie.split(';', 1)[0].partition('=')
+            self.cookies[name.strip()] = value
+        return response.status, data
+
+    def calculate(self, form):
+        return self.request('POST', '/calculate', urllib.parse.urlencode(form),
+                            'application/x-www-form-urlencoded')[0]
+
+    def calculate_pji(self, pji_request):
+        return self.request('POST', '/calculate-pji', json.dumps(pji_request), 'application/json')[0]
+
+    def report(self, report_format):
+        """Queue a report of the session's last claim, wait for it and download it; the last status seen."""
+        status, data = self.request('POST', '/reports', urllib.parse.urlencode({'format': report_format}),
+                                    'application/x-www-form-urlencoded')
+        if status != 202:
+            return status
+        job = json.loads(data)
+        while job['status'] not in ('done', 'failed'):
+            status, data = self.request('GET', f"{job['status_url']}?wait=10")
+            if status != 200:
+                return status
+            job = json.loads(data)
+        if job['status'] != 'done':
+            return 500
+        return self.request('GET', job['download_url'])[0]
+
+
+def client_loop(port, rng, mix, stop_at, record_from, results):
+    """
+    Send requests drawn from the mix until stop_at; keep (latency, status,
+    request type, scenario) for requests started after record_from.
+    """
+    client = Client(port)
+    calculated = False
+    while True:
+        kind = pick(rng, mix.get('requests', {'calculate': 1}))
+        if kind == 'report' and not calculated:
+            # A report needs a claim in the session first
+            kind = 'calculate'
+        if kind == 'calculate':
+            form = make_claim(rng, mix)
+            scenario = f"{form['province']} / {form['employment_type']} / {form['return_status']}"
+        elif kind == 'calculate_pji':
+            pji_request = make_pji_request(rng, mix)
+            scenario = f"calculate-pji / {pji_request['method']}"
+        else:
+            report_format = pick(rng, mix['report_format'])
+            scenario = f"report / {report_format}"
+
+        start = time.monotonic()
+        if start >= stop_at:
+            return
+        if kind == 'calculate':
+            status = client.calculate(form)
+            calculated = calculated or status == 200
+        elif kind == 'calculate_pji':
+            status = client.calculate_pji(pji_request)
+        else:
+            status = client.report(report_format)
+        if start >= record_from:
+            results.append((time.monotonic() - start, status, kind, scenario))
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def run_load(port, concurrency, duration, warmup, mix, seed):
+    results = []
+    start = time.monotonic()
+    record_from = start + warmup
+    stop_at = record_from + duration
+    # Each client replays its own seeded sequence of claims
+    threads = [threading.Thread(target=client_loop,
+                                args=(port, random.Random(seed * 1000 + client), mix, stop_at, record_from, results))
+               for client in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = max(time.monotonic(), stop_at) - record_from
+    return results, elapsed
+
+
+def latency_percentiles(latencies):
+    """{'p50', 'p95', 'p99', 'max'} in ms of an ascending list of seconds."""
+    return {
+        name: round(percentile(latencies, fraction) * 1000, 2) if latencies else None
+        for name, fraction in (('p50', 0.50), ('p95', 0.95), ('p99', 0.99), ('max', 1.0))
+    }
+
+
+def summarize(results, elapsed, memory_peaks):
+    latencies = sorted(latency for latency, status, _, _ in results if status == 200)
+    errors = sum(1 for _, status, _, _ in results if status != 200)
+    scenarios = {}
+    by_kind = {}
+    for latency, status, kind, scenario in results:
+        scenarios[scenario] = scenarios.get(scenario, 0) + 1
+        by_kind.setdefault(kind, []).append((latency, status))
+    request_types = {
+        kind: {
+            'requests': len(kind_results),
+            'errors': sum(1 for _, status in kind_results if status != 200),
+            'latency_ms': latency_percentiles(sorted(latency for latency, status in kind_results if status == 200)),
+        }
+        for kind, kind_results in sorted(by_kind.items())
+    }
+    workers = [{'pid': pid, **{name: round(value, 1) for name, value in peak.items()}}
+               for pid, peak in sorted(memory_peaks.items())]
+    return {
+        'requests': len(results),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / elapsed, 2),
+        'latency_ms': latency_percentiles(latencies),
+        'request_types': request_types,
+        'workers': workers,
+        'max_worker_rss_mb': max((worker['rss_mb'] for worker in workers), default=None),
+        'max_worker_pss_mb': max((worker['pss_mb'] for worker in workers), default=None),
+        'scenarios': dict(sorted(scenarios.items())),
+    }
+
+
+def print_summary(summary, settings):
+    print(f"\n{settings['workers']} workers, {settings['concurrency']} clients, {settings['duration']}s "
+          f"(after {settings['warmup']}s warm-up)")
+    print(f"  requests     {summary['requests']} ({summary['errors']} errors)")
+    print(f"  throughput   {summary['throughput_rps']:.1f} req/s")
+    latency = summary['latency_ms']
+    if latency['p50'] is not None:
+        print(f"  latency      p50 {latency['p50']:.1f} ms, p95 {latency['p95']:.1f} ms, "
+              f"p99 {latency['p99']:.1f} ms, max {latency['max']:.1f} ms")
+    for kind, kind_summary in summary['request_types'].items():
+        kind_latency = kind_summary['latency_ms']
+        line = f"  {kind:<14} {kind_summary['requests']} ({kind_summary['errors']} errors)"
+        if kind_latency['p50'] is not None:
+            line += f", p50 {kind_latency['p50']:.1f} ms, p95 {kind_latency['p95']:.1f} ms"
+        print(line)
+    for worker in summary['workers']:
+        print(f"  worker {worker['pid']:<7} peak RSS {worker['rss_mb']:.1f} MB, PSS {worker['pss_mb']:.1f} MB")
+
+
+def compare(summary, baseline_path, threshold):
+    """Print changes against a baseline; return the measures worse than threshold."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)['summary']
+
+    # (name, current, baseline, True if larger is worse)
+    measures = [
+        ('throughput', summary['throughput_rps'], baseline['throughput_rps'], False),
+        ('p95 latency', summary['latency_ms']['p95'], baseline['latency_ms']['p95'], True),
+        ('p99 latency', summary['latency_ms']['p99'], baseline['latency_ms']['p99'], True),
+        ('worker PSS', summary['max_worker_pss_mb'], baseline['max_worker_pss_mb'], True),
+    ]
+    regressions = []
+    print(f"\nCompared with {baseline_path}")
+    for name, current, previous, larger_is_worse in measures:
+        if not current or not previous:
+            continue
+        ratio = current / previous
+        worse = ratio > threshold if larger_is_worse else ratio < 1 / threshold
+        print(f"  {name:<12} {previous:9.1f} -> {current:9.1f}  ({ratio:5.2f}x){'  REGRESSION' if worse else ''}")
+        if worse:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, help='gunicorn workers (default from gunicorn.conf.py)')
+    parser.add_argument('--concurrency', type=int, help='client threads (default 2 per worker)')
+    parser.add_argument('--duration', type=float, default=30, help='measured seconds')
+    parser.add_argument('--warmup', type=float, default=5, help='seconds of load before measuring')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='scenario mix (JSON)')
+    parser.add_argument('--seed', type=int, default=1, help='seed for the generated claims')
+    parser.add_argument('--output', help='results file (default benchmarks/results/load_<commit>.json)')
+    parser.add_argument('--save-baseline', action='store_true', help=f'also write the results to {BASELINE_PATH}')
+    parser.add_argument('--compare', help='baseline to compare against (default load_baseline.json if present)')
+    parser.add_argument('--threshold', type=float, default=1.25, help='change ratio that counts as a regression')
+    args = parser.parse_args()
+
+    with open(args.mix) as f:
+        mix = json.load(f)
+    if args.workers is None:
+        args.workers = configured_workers()
+    concurrency = args.concurrency or 2 * args.workers
+
+    seed_rate_store()
+    port = free_port()
+    server_log = os.path.join(_scratch_dir, 'gunicorn.log')
+    server = start_gunicorn(port, args.workers, server_log)
+    try:
+        wait_until_ready(port, server)
+        sampler = MemorySampler(server.pid)
+        sampler.start()
+        results, elapsed = run_load(port, concurrency, args.duration, args.warmup, mix, args.seed)
+        sampler.stopped.set()
+        sampler.join()
+        sampler.sample()
+    except RuntimeError as e:
+        print(f"{e}; server log: {server_log}")
+        return 1
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    settings = {'workers': args.workers, 'concurrency': concurrency, 'duration': args.duration,
+                'warmup': args.warmup, 'seed': args.seed, 'mix': mix}
+    summary = summarize(results, elapsed, sampler.peaks)
+    print_summary(summary, settings)
+
+    commit = git_commit()
+    record = {
+        'commit': commit,
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'settings': settings,
+        'summary': summary,
+    }
+    outputs = [args.output or os.path.join(RESULTS_DIR, f"load_{commit}.json")]
+    if args.save_baseline:
+        outputs.append(BASELINE_PATH)
+    for output in outputs:
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, 'w') as f:
+            json.dump(record, f, indent=2)
+        print(f"Results written to {output}")
+
+    if summary['errors']:
+        print(f"{summary['errors']} request(s) failed; server log: {server_log}")
+    baseline = args.compare or (BASELINE_PATH if os.path.exists(BASELINE_PATH) and not args.save_baseline else None)
+    if baseline:
+        regressions = compare(summary, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.2f}x: {', '.join(regressions)}")
+            return 1
+    return 1 if summary['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the ActuClaim hot paths.
+
+Times take-home pay, past and future lost wages, T-Bill averaging, PJI, the
+net-income curve, PDF and Word report rendering and an end-to-end /calculate
+through Flask's test client. Everything runs against fixture data: T-Bill
+rates are loaded from benchmarks/fixtures/valet_V39059_2022_2025.json into a
+temporary SQLite store, and all dates are fixed, so results are comparable
+across commits and machines differ only in speed.
+
+Results are written as JSON to benchmarks/results/<commit>.json (or --output).
+With --compare, each benchmark is checked against a previous results file and
+the run fails if any is slower by more than --threshold.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--filter NAME] [--repeat N] [--output PATH]
+                                        [--compare results/<commit>.json] [--threshold 1.25]
+"""
+import argparse
+import dataclasses
+import datetime
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+FIXTURE_DIR = os.path.join(BENCH_DIR, 'fixtures')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+RATES_FIXTURE = os.path.join(FIXTURE_DIR, 'valet_V39059_2022_2025.json')
+
+# Point the datastore at a scratch database before anything imports it
+_scratch_dir = tempfile.mkdtemp(prefix='actuclaim-bench-')
+os.environ['ACTUCLAIM_DB_PATH'] = os.path.join(_scratch_dir, 'bench.db')
+sys.path.insert(0, ROOT_DIR)
+
+# Fixed dates inside the fixture's rate range
+LOSS_DATE = '2022-06-15'
+CALCULATION_DATE = '2025-01-15'
+
+CALCULATE_FORM = {
+    'client_name': 'Benchmark Claimant',
+    'province': 'new brunswick',
+    'dependents': '2',
+    'employment_type': 'salaried',
+    'salary': '78500',
+    'hours_per_day': '8',
+    'working_days': '252',
+    'loss_date': LOSS_DATE,
+    'start_date': CALCULATION_DATE,
+    'missed_time': '18',
+    'missed_time_unit': 'months',
+    'ei_benefits_to_date': '9000',
+    'ltd_benefits_annual': '12000',
+    'cppd_benefits_annual': '6000',
+    'return_status': 'returning to work',
+    'end_date': '2026-01-15',
+    'birthdate': '1980-04-02',
+    'retirement_age': '65',
+    'discount_rate': '2.5',
+}
+
+
+def seed_rate_store():
+    from datastore import get_rate_store
+    from tbill_parser import parse_rates_file
+
+    store = get_rate_store()
+    store.upsert_rates(parse_rates_file(RATES_FIXTURE))
+    return store
+
+
+def report_inputs():
+    """DamagesResult for the report generators, from a /calculate run on the fixture claim."""
+    import app as actuclaim
+    from damages_results import DamagesResult
+
+    client = actuclaim.app.test_client()
+    client.post('/calculate', data=CALCULATE_FORM)
+    with client.session_transaction() as session:
+        damages = DamagesResult.from_dict(session['damages'])
+    return dataclasses.replace(
+        damages,
+        birthdate=datetime.date(1980, 4, 2),
+        loss_date=datetime.date(2022, 6, 15),
+        current_date=datetime.date(2025, 1, 15),
+    )
+
+
+def build_benchmarks():
+    """(name, callable) pairs; each callable runs the hot path once."""
+    from income_calculations import calculate_take_home
+    from lost_wages_calculations import calculate_past_lost_wages_with_interest, calculate_future_lost_wages_annuity
+    from tbill_utils import get_average_tbill_rate
+    from pji_calculator import calculate_pji
+    from net_income_curve import get_net_income_curve
+    from net_to_gross import gross_from_net
+    from pdf_generation import create_enhanced_pdf_report
+    from word_generation import create_word_report
+    import numpy as np
+    import app as actuclaim
+
+    client = actuclaim.app.test_client()
+    inputs = report_inputs()
+    incomes = np.linspace(0, 250000, 10000)
+    curve = get_net_income_curve('nova scotia', 2)
+    pdf_path = os.path.join(_scratch_dir, 'report.pdf')
+    docx_path = os.path.join(_scratch_dir, 'report.docx')
+
+    def post_calculate(result_cache):
+        # The same form every time: with a result cache on, every call after the first is a hit
+        actuclaim.app.config['RESULT_CACHE'] = result_cache
+        return client.post('/calculate', data=CALCULATE_FORM)
+
+    return [
+        ('calculate_take_home', lambda: calculate_take_home(78500, 'nova scotia', 252, 8, dependents=2)),
+        ('calculate_take_home_exact', lambda: calculate_take_home(78500, 'nova scotia', 252, 8, dependents=2, exact=True)),
+        ('past_lost_wages_given_rate', lambda: calculate_past_lost_wages_with_interest(42000, LOSS_DATE, pji_rate=3.1)),
+        ('past_lost_wages_tbill_rate', lambda: calculate_past_lost_wages_with_interest(42000, LOSS_DATE)),
+        ('past_lost_wages_rate_path', lambda: calculate_past_lost_wages_with_interest(42000, LOSS_DATE, method='rate_path')),
+        ('future_lost_wages_annuity', lambda: calculate_future_lost_wages_annuity(52000, 20.5, 0.025)),
+        ('get_average_tbill_rate', lambda: get_average_tbill_rate(LOSS_DATE, CALCULATION_DATE)),
+        ('calculate_pji_average', lambda: calculate_pji(LOSS_DATE, CALCULATION_DATE, 42000)),
+        ('calculate_pji_rate_path', lambda: calculate_pji(LOSS_DATE, CALCULATION_DATE, 42000, method='rate_path',
+                                                          mode='compound')),
+        ('net_income_curve_10k', lambda: curve.net(incomes)),
+        ('gross_from_net', lambda: gross_from_net(54321.09, 'nova scotia', 2)),
+        ('pdf_report', lambda: create_enhanced_pdf_report(inputs, pdf_path)),
+        ('word_report', lambda: create_word_report(inputs, docx_path)),
+        ('calculate_end_to_end', lambda: post_calculate('off')),
+        ('calculate_cache_hit', lambda: post_calculate('memory')),
+        ('calculate_cache_hit_sqlite', lambda: post_calculate('sqlite')),
+    ]
+
+
+def measure(func, repeat, min_time=0.2):
+    """Median, best and mean seconds per call over `repeat` rounds of enough calls to fill min_time."""
+    func()
+    start = time.perf_counter()
+    func()
+    single = max(time.perf_counter() - start, 1e-7)
+    loops = max(1, int(min_time / single))
+
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        rounds.append((time.perf_counter() - start) / loops)
+    return {
+        'median_s': statistics.median(rounds),
+        'min_s': min(rounds),
+        'mean_s': statistics.fmean(rounds),
+        'loops': loops,
+        'rounds': repeat,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def format_time(seconds):
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:9.2f} ms"
+    return f"{seconds * 1e6:9.2f} us"
+
+
+def compare(results, baseline_path, threshold):
+    """Print ratios against a previous results file; return the names slower than threshold."""
+    with open(baseline_path) as f:
+        baseline = {entry['name']: entry for entry in json.load(f)['benchmarks']}
+
+    regressions = []
+    print(f"\nCompared with {baseline_path}")
+    for entry in results:
+        previous = baseline.get(entry['name'])
+        if previous is None:
+            continue
+        ratio = entry['median_s'] / previous['median_s']
+        flag = '  REGRESSION' if ratio > threshold else ''
+        print(f"  {entry['name']:<30} {ratio:6.2f}x{flag}")
+        if ratio > threshold:
+            regressions.append(entry['name'])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', help='only run benchmarks whose name contains this text')
+    parser.add_argument('--repeat', type=int, default=5, help='timing rounds per benchmark')
+    parser.add_argument('--output', help='results file (default benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', help='previous results file to compare against')
+    parser.add_argument('--threshold', type=float, default=1.25, help='slowdown ratio that counts as a regression')
+    args = parser.parse_args()
+
+    seed_rate_store()
+    benchmarks = build_benchmarks()
+    # Report generators log every step, and the Word report logs an error when the
+    # letterhead template is not installed; keep the timing output readable
+    logging.disable(logging.ERROR)
+
+    results = []
+    for name, func in benchmarks:
+        if args.filter and args.filter not in name:
+            continue
+        timing = measure(func, args.repeat)
+        results.append({'name': name, **timing})
+        print(f"{name:<30} {format_time(timing['median_s'])}  (best {format_time(timing['min_s']).strip()}, "
+              f"{timing['loops']} loops x {timing['rounds']})")
+
+    commit = git_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'commit': commit,
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'benchmarks': results,
+        }, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.2f}x: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,276 @@
+# =============================================================================
+# DAMAGES CASE SCHEMA
+# =============================================================================
+"""
+Declarative schema for a damages case: the fields of the /calculate form, their
+types, defaults and limits.
+
+The field list is compiled once into a parser per field, so parse_case reads
+and validates a whole submission in one pass:
+
+    case, errors = parse_case(request.form)
+
+case is a Case (a slotted object with one typed attribute per field) and errors
+a list of {'field', 'message'} dicts; the case should only be used when errors
+is empty. A blank or missing optional field takes its default, but a value that
+is present and malformed or out of range is always reported, never replaced.
+
+The source can be the web form (a MultiDict), a JSON object or a CSV row: any
+mapping with .get(). Run this module on a CSV file (one case per row, columns
+named like the form fields) to validate a batch of cases.
+"""
+import datetime
+import math
+
+# Choice values as the form submits them
+PROVINCES = ('nova scotia', 'newfoundland', 'new brunswick', 'prince edward island')
+EMPLOYMENT_TYPES = ('salaried', 'hourly')
+MISSED_TIME_UNITS = ('days', 'hours', 'weeks', 'months')
+RETURN_STATUSES = ('returning to work', 'total disability')
+PJI_METHODS = ('average', 'rate_path')
+SEXES = ('M', 'F', 'U')
+
+# Checkbox values; an unchecked box is not submitted at all
+TRUE_VALUES = ('on', 'yes', 'true', '1')
+FALSE_VALUES = ('off', 'no', 'false', '0')
+
+
+class Field:
+    """
+    One case field.
+
+    Args:
+        name: Form field name and Case attribute
+        kind: 'text', 'choice', 'integer', 'number', 'date' or 'flag'
+        label: Name used in error messages
+        default: Value when the field is blank or missing
+        required: Report a blank or missing field instead of using the default
+        choices: Allowed values ('choice' fields; compared after case folding)
+        minimum, maximum: Inclusive limits ('integer' and 'number' fields)
+    """
+    __slots__ = ('name', 'kind', 'label', 'default', 'required', 'choices', 'minimum', 'maximum')
+
+    def __init__(self, name, kind, label, default=None, required=False, choices=None, minimum=None, maximum=None):
+        self.name = name
+        self.kind = kind
+        self.label = label
+        self.default = default
+        self.required = required
+        self.choices = choices
+        self.minimum = minimum
+        self.maximum = maximum
+
+
+CASE_FIELDS = (
+    # Client
+    Field('client_name', 'text', 'Client name', default='Client'),
+    Field('province', 'choice', 'Province', required=True, choices=PROVINCES),
+    Field('dependents', 'integer', 'Dependents', default=0, minimum=0),
+
+    # Employment
+    Field('employment_type', 'choice', 'Employment type', default='salaried', choices=EMPLOYMENT_TYPES),
+    Field('salary', 'number', 'Annual salary', default=0.0, minimum=0),
+    Field('hours_per_day', 'number', 'Hours per day', default=8.0, minimum=0, maximum=24),
+    Field('hourly_rate', 'number', 'Hourly rate', default=0.0, minimum=0),
+    Field('hours_per_week', 'number', 'Hours per week', default=40.0, minimum=0, maximum=168),
+    Field('include_vacation_pay', 'flag', 'Include vacation pay'),
+    Field('working_days', 'integer', 'Working days', default=252, minimum=1, maximum=365),
+
+    # Collateral benefits received to date and expected annually
+    Field('ei_benefits_to_date', 'number', 'EI benefits to date', default=0.0, minimum=0),
+    Field('section_b_to_date', 'number', 'Section B benefits to date', default=0.0, minimum=0),
+    Field('ltd_benefits_to_date', 'number', 'LTD benefits to date', default=0.0, minimum=0),
+    Field('cppd_benefits_to_date', 'number', 'CPPD benefits to date', default=0.0, minimum=0),
+    Field('other_benefits_to_date', 'number', 'Other benefits to date', default=0.0, minimum=0),
+    Field('ei_benefits_annual', 'number', 'Annual EI benefits', default=0.0, minimum=0),
+    Field('ei_benefits_start_date', 'date', 'EI benefits start date'),
+    Field('section_b_annual', 'number', 'Annual Section B benefits', default=0.0, minimum=0),
+    Field('ltd_benefits_annual', 'number', 'Annual LTD benefits', default=0.0, minimum=0),
+    Field('cppd_benefits_annual', 'number', 'Annual CPPD benefits', default=0.0, minimum=0),
+    Field('other_benefits_annual', 'number', 'Annual other benefits', default=0.0, minimum=0),
+
+    # Past loss
+    Field('missed_time_unit', 'choice', 'Missed time unit', default='days', choices=MISSED_TIME_UNITS),
+    Field('missed_time', 'number', 'Missed time', required=True, minimum=0),
+    Field('loss_date', 'date', 'Date of loss', required=True),
+    Field('pji_rate', 'number', 'PJI rate'),
+    Field('pji_method', 'choice', 'PJI method', default='average', choices=PJI_METHODS),
+
+    # Future loss
+    Field('calculate_future_wages', 'flag', 'Calculate future lost wages'),
+    Field('start_date', 'date', 'Start date', required=True),
+    Field('return_status', 'choice', 'Return to work status', default='returning to work', choices=RETURN_STATUSES),
+    Field('end_date', 'date', 'Return to work date'),
+    Field('birthdate', 'date', 'Date of birth'),
+    Field('retirement_age', 'integer', 'Retirement age', default=65, minimum=50, maximum=90),
+    Field('sex', 'choice', 'Sex', default='U', choices=SEXES),
+    Field('apply_contingencies', 'flag', 'Apply contingencies'),
+    Field('discount_rate', 'number', 'Discount rate', minimum=0, maximum=10),
+    Field('wage_growth', 'number', 'Real wage growth', default=0.0, minimum=-5, maximum=10),
+    Field('benefit_indexation', 'number', 'Benefit indexation', default=0.0, minimum=0, maximum=10),
+    Field('per_year_tax', 'flag', 'Tax each projection year'),
+)
+
+
+class Case:
+    """A parsed damages case: one attribute per CASE_FIELDS entry (dates as datetime.date, amounts as float)."""
+    __slots__ = tuple(field.name for field in CASE_FIELDS)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"Case({self.client_name!r}, {self.province!r}, loss_date={self.loss_date})"
+
+
+# -----------------------------------------------------------------------------
+# Field parsers: raw value -> typed value, or ValueError with the message to report
+# -----------------------------------------------------------------------------
+def _limit_checker(field):
+    minimum, maximum, label = field.minimum, field.maximum, field.label
+    if minimum is None and maximum is None:
+        return None
+
+    def check(value):
+        if minimum is not None and value < minimum:
+            raise ValueError(f"{label} must be at least {minimum}")
+        if maximum is not None and value > maximum:
+            raise ValueError(f"{label} must be at most {maximum}")
+    return check
+
+
+def _compile_parser(field):
+    label = field.label
+
+    if field.kind == 'text':
+        def parse(raw):
+            return str(raw).strip()
+
+    elif field.kind == 'choice':
+        fold = str.upper if all(choice.isupper() for choice in field.choices) else str.lower
+        choices = frozenset(field.choices)
+
+        def parse(raw):
+            value = fold(str(raw).strip())
+            if value not in choices:
+                raise ValueError(f"{label} must be one of: {', '.join(field.choices)}")
+            return value
+
+    elif field.kind in ('integer', 'number'):
+        integer = field.kind == 'integer'
+        check = _limit_checker(field)
+
+        def parse(raw):
+            try:
+                value = float(raw.replace(',', '')) if isinstance(raw, str) else float(raw)
+            except (TypeError, ValueError):
+                raise ValueError(f"{label} must be a number")
+            if not math.isfinite(value):
+                raise ValueError(f"{label} must be a number")
+            if integer:
+                if not value.is_integer():
+                    raise ValueError(f"{label} must be a whole number")
+                value = int(value)
+            if check is not None:
+                check(value)
+            return value
+
+    elif field.kind == 'date':
+        def parse(raw):
+            if isinstance(raw, datetime.date):
+                return raw
+            text = str(raw).strip()
+            try:
+                if len(text) != 10:
+                    raise ValueError
+                return datetime.date.fromisoformat(text)
+            except ValueError:
+                raise ValueError(f"{label}: invalid date '{text}', use YYYY-MM-DD")
+
+    elif field.kind == 'flag':
+        def parse(raw):
+            if isinstance(raw, bool):
+                return raw
+            value = str(raw).strip().lower()
+            if value in TRUE_VALUES:
+                return True
+            if value in FALSE_VALUES:
+                return False
+            raise ValueError(f"{label} must be checked or unchecked")
+
+    else:
+        raise ValueError(f"Unknown field kind for {field.name}: {field.kind}")
+    return parse
+
+
+def compile_fields(fields):
+    """(name, parse, default, required, label) per field, in order."""
+    compiled = []
+    for field in fields:
+        default = False if field.kind == 'flag' and field.default is None else field.default
+        compiled.append((field.name, _compile_parser(field), default, field.required, field.label))
+    return tuple(compiled)
+
+
+_COMPILED_FIELDS = compile_fields(CASE_FIELDS)
+
+
+def _check_case(case, errors):
+    """Rules that involve more than one field."""
+    if case.loss_date and case.start_date and case.start_date < case.loss_date:
+        errors.append({'field': 'start_date', 'message': 'Start date cannot be before the date of loss'})
+    if case.end_date and case.start_date and case.end_date < case.start_date:
+        errors.append({'field': 'end_date', 'message': 'Return to work date cannot be before the start date'})
+    if case.birthdate and case.loss_date and case.birthdate >= case.loss_date:
+        errors.append({'field': 'birthdate', 'message': 'Date of birth must be before the date of loss'})
+
+
+def parse_case(data):
+    """
+    Parse and validate one case.
+
+    Args:
+        data: Field values by name (a form MultiDict, JSON object or CSV row)
+
+    Returns:
+        (Case, errors): errors lists {'field', 'message'} for every invalid field
+    """
+    case = Case()
+    errors = []
+    get = data.get
+    for name, parse, default, required, label in _COMPILED_FIELDS:
+        raw = get(name)
+        if raw is None or raw == '':
+            if required:
+                errors.append({'field': name, 'message': f"{label} is required"})
+            setattr(case, name, default)
+            continue
+        try:
+            setattr(case, name, parse(raw))
+        except ValueError as e:
+            errors.append({'field': name, 'message': str(e)})
+            setattr(case, name, default)
+    if not errors:
+        _check_case(case, errors)
+    return case, errors
+
+
+if __name__ == "__main__":
+    import csv
+    import sys
+
+    if len(sys.argv) != 2:
+        print(f"Usage: python {sys.argv[0]} cases.csv")
+        sys.exit(2)
+
+    invalid = 0
+    with open(sys.argv[1], newline='') as f:
+        rows = list(csv.DictReader(f))
+    for row_number, row in enumerate(rows, start=2):
+        case, errors = parse_case(row)
+        if errors:
+            invalid += 1
+            for error in errors:
+                print(f"Row {row_number} ({error['field']}): {error['message']}")
+    print(f"{len(rows) - invalid} of {len(rows)} cases valid")
+    sys.exit(1 if invalid else 0)
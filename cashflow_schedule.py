@@ -0,0 +1,207 @@
+# =============================================================================
+# MONTHLY CASH-FLOW SCHEDULE FOR FUTURE LOST WAGES
+# =============================================================================
+import datetime
+
+import numpy as np
+
+DAY = np.timedelta64(1, 'D')
+
+
+def _months_from_dates(start_date, end_date):
+    """Horizon in months between two dates: whole months plus the fraction of the final month."""
+    start = np.datetime64(start_date, 'D')
+    end = np.datetime64(end_date, 'D')
+    if end <= start:
+        return 0.0
+    whole = int((np.datetime64(end_date, 'M') - np.datetime64(start_date, 'M')).astype(int))
+    boundary = _add_months(start, start_date.day, np.array([whole]))[0]
+    if boundary > end:
+        whole -= 1
+        boundary = _add_months(start, start_date.day, np.array([whole]))[0]
+    next_boundary = _add_months(start, start_date.day, np.array([whole + 1]))[0]
+    return whole + (end - boundary) / (next_boundary - boundary)
+
+
+def _add_months(start, anchor_day, offsets):
+    """Dates `offsets` months after start, keeping the anchor day (clamped to the month length)."""
+    months = start.astype('datetime64[M]') + offsets
+    month_starts = months.astype('datetime64[D]')
+    days_in_month = ((months + 1).astype('datetime64[D]') - month_starts).astype(int)
+    return month_starts + (np.minimum(anchor_day, days_in_month) - 1) * DAY
+
+
+def build_monthly_schedule(annual_lost_wages, start_date, time_horizon=None, end_date=None,
+                           discount_rate=0.0, annual_collateral_benefits=0.0,
+                           ei_benefits_annual=0.0, ei_end_date=None, timing='annuity',
+                           wage_growth=0.0, indexed_collateral_benefits=0.0, collateral_indexation=0.0):
+    """
+    Generate the month-by-month future loss schedule in one vectorized pass.
+
+    Periods run monthly from start_date (so mid-year starts are handled naturally),
+    with a partial final period when the horizon is not a whole number of months.
+    Collateral benefits are deducted for the whole horizon; EI benefits are deducted
+    only until ei_end_date (EI run-off). Wages and indexed benefits step up at each
+    anniversary of start_date by wage_growth and collateral_indexation.
+
+    Discount timing:
+        'annuity' - period discount factor v^t0 × (1 - v^Δ) / (r × Δ). The factors
+                    telescope, so with level inputs the schedule sums exactly to the
+                    closed form used by calculate_future_lost_wages_annuity.
+        'end'     - each month is discounted from the end of the period
+        'mid'     - each month is discounted from the middle of the period
+
+    Args:
+        annual_lost_wages: Annual lost wages before collateral offsets
+        start_date: First day of future losses (datetime.date)
+        time_horizon: Horizon in years (used when end_date is not given)
+        end_date: Last day of future losses (datetime.date), alternative to time_horizon
+        discount_rate: Annual discount rate as a decimal
+        annual_collateral_benefits: Level annual collateral benefits deducted for the whole horizon
+        ei_benefits_annual: Annual EI benefit rate deducted until ei_end_date
+        ei_end_date: Date EI benefits stop (datetime.date); defaults to no EI deduction
+        timing: 'annuity', 'end' or 'mid'
+        wage_growth: Annual wage growth as a decimal
+        indexed_collateral_benefits: Annual collateral benefits (e.g. CPPD) that grow with collateral_indexation
+        collateral_indexation: Annual indexation of indexed_collateral_benefits as a decimal
+
+    Returns:
+        Dictionary of NumPy arrays (one element per month) plus totals
+    """
+    if end_date is not None:
+        total_months = _months_from_dates(start_date, end_date)
+    else:
+        total_months = max(float(time_horizon or 0), 0.0) * 12
+
+    whole_months = int(np.floor(total_months + 1e-9))
+    final_fraction = total_months - whole_months
+    if final_fraction < 1e-9:
+        final_fraction = 0.0
+    period_count = whole_months + (1 if final_fraction > 0 else 0)
+
+    start = np.datetime64(start_date, 'D')
+    offsets = np.arange(period_count + 1)
+    boundaries = _add_months(start, start_date.day, offsets)
+
+    period_start = boundaries[:-1]
+    period_end = boundaries[1:].copy()
+
+    # Fraction of a month in each period (1 except possibly the last), and in years
+    month_fraction = np.ones(period_count)
+    if final_fraction > 0:
+        month_fraction[-1] = final_fraction
+        month_days = (boundaries[-1] - boundaries[-2]).astype(int)
+        period_end[-1] = period_start[-1] + int(round(final_fraction * month_days)) * DAY
+    year_fraction = month_fraction / 12
+    elapsed_before = np.concatenate(([0.0], np.cumsum(year_fraction)[:-1]))
+    elapsed_after = elapsed_before + year_fraction
+
+    # Whole years elapsed at the start of each period, for anniversary increases
+    anniversary = np.floor(elapsed_before + 1e-9)
+    lost_wages = annual_lost_wages * (1.0 + wage_growth) ** anniversary * year_fraction
+    collateral = annual_collateral_benefits * year_fraction
+    if indexed_collateral_benefits:
+        collateral = collateral + indexed_collateral_benefits * (1.0 + collateral_indexation) ** anniversary * year_fraction
+
+    ei = np.zeros(period_count)
+    if ei_benefits_annual and ei_end_date is not None:
+        ei_end = np.datetime64(ei_end_date, 'D')
+        period_days = (period_end - period_start).astype(float)
+        covered_days = np.clip((ei_end - period_start).astype(float), 0.0, period_days)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            covered = np.where(period_days > 0, covered_days / period_days, 0.0)
+        ei = ei_benefits_annual * year_fraction * covered
+
+    net = lost_wages - collateral - ei
+
+    if discount_rate == 0:
+        discount_factor = np.ones(period_count)
+    else:
+        v = 1.0 / (1.0 + discount_rate)
+        if timing == 'end':
+            discount_factor = v ** elapsed_after
+        elif timing == 'mid':
+            discount_factor = v ** ((elapsed_before + elapsed_after) / 2)
+        elif timing == 'annuity':
+            discount_factor = (v ** elapsed_before) * (1.0 - v ** year_fraction) / (discount_rate * year_fraction)
+        else:
+            raise ValueError(f"Unknown discount timing: {timing}")
+
+    present_value = net * discount_factor
+
+    return {
+        "period_start": period_start,
+        "period_end": period_end,
+        "year_fraction": year_fraction,
+        "lost_wages": lost_wages,
+        "collateral": collateral,
+        "ei": ei,
+        "net": net,
+        "discount_factor": discount_factor,
+        "present_value": present_value,
+        "total_months": total_months,
+        "time_horizon": total_months / 12,
+        "discount_rate": discount_rate,
+        "total_lost_wages": float(lost_wages.sum()),
+        "total_collateral": float(collateral.sum() + ei.sum()),
+        "total_net": float(net.sum()),
+        "total_present_value": round(float(present_value.sum()), 2)
+    }
+
+
+def aggregate_yearly(schedule):
+    """
+    Roll a monthly schedule up to calendar-year totals for the results page and reports.
+
+    Returns:
+        List of dictionaries (one per calendar year) with months, lost wages, collateral, net and present value
+    """
+    starts = schedule["period_start"]
+    if len(starts) == 0:
+        return []
+
+    years = starts.astype('datetime64[Y]').astype(int) + 1970
+    first_year = int(years[0])
+    index = years - first_year
+    size = int(index[-1]) + 1
+
+    def total(values):
+        return np.bincount(index, weights=values, minlength=size)
+
+    months = total(schedule["year_fraction"] * 12)
+    lost_wages = total(schedule["lost_wages"])
+    collateral = total(schedule["collateral"] + schedule["ei"])
+    net = total(schedule["net"])
+    present_value = total(schedule["present_value"])
+
+    return [
+        {
+            "year": first_year + i,
+            "months": round(float(months[i]), 2),
+            "lost_wages": round(float(lost_wages[i]), 2),
+            "collateral": round(float(collateral[i]), 2),
+            "net": round(float(net[i]), 2),
+            "present_value": round(float(present_value[i]), 2)
+        }
+        for i in range(size) if months[i] > 0
+    ]
+
+
+def schedule_rows(schedule):
+    """Period-by-period rows (ISO dates and rounded amounts) for display or export."""
+    return [
+        {
+            "period_start": str(start),
+            "period_end": str(end),
+            "lost_wages": round(float(lost_wages), 2),
+            "collateral": round(float(collateral + ei), 2),
+            "net": round(float(net), 2),
+            "discount_factor": round(float(factor), 6),
+            "present_value": round(float(pv), 2)
+        }
+        for start, end, lost_wages, collateral, ei, net, factor, pv in zip(
+            schedule["period_start"], schedule["period_end"], schedule["lost_wages"],
+            schedule["collateral"], schedule["ei"], schedule["net"],
+            schedule["discount_factor"], schedule["present_value"]
+        )
+    ]
@@ -0,0 +1,158 @@
+# =============================================================================
+# MONTE CARLO CONTINGENCY SIMULATION FOR FUTURE LOST WAGES
+# =============================================================================
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from wage_projection import yearly_periods
+
+# Paths are simulated in fixed-size chunks, each with its own child seed, so the
+# result for a given seed does not depend on how many processes run the chunks
+CHUNK_SIZE = 10000
+
+# Runs smaller than this are simulated in-process even when processes are
+# requested; pool start-up would dominate
+MIN_PATHS_FOR_POOL = 4 * CHUNK_SIZE
+
+DEFAULT_PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+
+def _table_lookup(table, ages):
+    """Annual probabilities for integer ages, holding the last value beyond the end of the table."""
+    table = np.asarray(table, dtype=float)
+    return table[np.clip(ages, 0, len(table) - 1)]
+
+
+def _simulate_chunk(args):
+    """
+    Simulate one chunk of working-life paths and return their present values.
+
+    Each simulated year a claimant still in the workforce may die or become
+    disabled (leaving the workforce part-way through the year), and spends a
+    binomial number of months unemployed.
+    """
+    (seed, paths, annual_lost_wages, start_age, year_fraction, discount_factor,
+     mortality, disability, unemployment) = args
+
+    rng = np.random.default_rng(seed)
+    years = len(year_fraction)
+    ages = np.floor(start_age + np.arange(years)).astype(int)
+
+    q_death = _table_lookup(mortality, ages) if mortality is not None else np.zeros(years)
+    q_disability = _table_lookup(disability, ages) if disability is not None else np.zeros(years)
+    u_rate = _table_lookup(unemployment, ages) if unemployment is not None else np.zeros(years)
+
+    # Scale annual exit probabilities to partial years
+    q_exit = 1.0 - (1.0 - q_death) * (1.0 - q_disability)
+    q_exit = 1.0 - (1.0 - q_exit) ** year_fraction
+
+    # Year in which each path leaves the workforce (years means never)
+    exits = rng.random((paths, years)) < q_exit
+    exit_year = np.where(exits.any(axis=1), exits.argmax(axis=1), years)
+    exit_fraction = rng.random(paths)
+
+    year_index = np.arange(years)
+    worked = (year_index < exit_year[:, np.newaxis]).astype(float)
+    in_exit_year = year_index == exit_year[:, np.newaxis]
+    worked += in_exit_year * exit_fraction[:, np.newaxis]
+
+    if unemployment is not None:
+        months_unemployed = rng.binomial(12, u_rate, size=(paths, years))
+        worked *= 1.0 - months_unemployed / 12.0
+
+    earnings = annual_lost_wages * year_fraction * worked
+    return earnings @ discount_factor
+
+
+def _pool_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def simulate_future_loss(annual_lost_wages, start_age, retirement_age, discount_rate,
+                         mortality=None, disability=None, unemployment=None,
+                         paths=10000, seed=None, processes=1, percentiles=DEFAULT_PERCENTILES,
+                         tables=None, sex=None):
+    """
+    Monte Carlo distribution of the present value of future lost wages with contingencies.
+
+    Tables are arrays of annual probabilities indexed by integer age (index 0 is age 0):
+    mortality (q_x), disability incidence and unemployment (probability of being
+    unemployed in any given month). Pass loaded ContingencyTables and a sex to use
+    their rates; tables given explicitly take precedence. Any table left as None
+    is not applied.
+
+    Args:
+        annual_lost_wages: Annual net lost wages
+        start_age: Claimant's age (fractional years) at the start of future losses
+        retirement_age: Age at which losses stop
+        discount_rate: Annual discount rate as a decimal
+        mortality, disability, unemployment: Contingency tables (see above)
+        paths: Number of simulated working lives
+        seed: Integer seed; the same seed always gives the same result
+        processes: Worker processes. 1 (the default) simulates in-process, as web
+            requests should; offline and batch callers can pass more, or None for
+            the CPU count, to spread large runs over a process pool
+        percentiles: Percentiles of the present-value distribution to report
+        tables, sex: ContingencyTables (see contingency_tables) and the claimant's sex
+
+    Returns:
+        Dictionary with mean, standard deviation, percentiles and the no-contingency present value
+    """
+    if tables is not None:
+        rates = tables.table(sex)
+        mortality = rates['mortality'] if mortality is None else mortality
+        disability = rates['disability'] if disability is None else disability
+        unemployment = rates['unemployment'] if unemployment is None else unemployment
+
+    time_horizon = max(float(retirement_age) - float(start_age), 0.0)
+    year_fraction, discount_factor = yearly_periods(time_horizon, discount_rate)
+    deterministic_pv = float(annual_lost_wages * (year_fraction @ discount_factor))
+
+    paths = int(paths)
+    if paths <= 0:
+        raise ValueError("Number of paths must be positive")
+
+    seed_sequence = np.random.SeedSequence(seed)
+    chunk_sizes = [CHUNK_SIZE] * (paths // CHUNK_SIZE)
+    if paths % CHUNK_SIZE:
+        chunk_sizes.append(paths % CHUNK_SIZE)
+    child_seeds = seed_sequence.spawn(len(chunk_sizes))
+
+    tables = tuple(np.asarray(table, dtype=float) if table is not None else None
+                   for table in (mortality, disability, unemployment))
+    jobs = [
+        (child_seed, size, annual_lost_wages, float(start_age), year_fraction, discount_factor) + tables
+        for child_seed, size in zip(child_seeds, chunk_sizes)
+    ]
+
+    if len(year_fraction) == 0:
+        results = [np.zeros(size) for size in chunk_sizes]
+    elif paths < MIN_PATHS_FOR_POOL or processes == 1:
+        results = [_simulate_chunk(job) for job in jobs]
+    else:
+        workers = min(processes or os.cpu_count() or 1, len(jobs))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+            results = list(pool.map(_simulate_chunk, jobs))
+
+    present_values = np.concatenate(results)
+    mean = float(present_values.mean())
+
+    return {
+        "paths": paths,
+        "seed": seed_sequence.entropy,
+        "time_horizon": time_horizon,
+        "deterministic_present_value": round(deterministic_pv, 2),
+        "mean": round(mean, 2),
+        "std": round(float(present_values.std()), 2),
+        "standard_error": round(float(present_values.std() / math.sqrt(paths)), 2),
+        "percentiles": {
+            int(p): round(float(value), 2)
+            for p, value in zip(percentiles, np.percentile(present_values, percentiles))
+        },
+        "contingency_factor": round(mean / deterministic_pv, 6) if deterministic_pv else None
+    }
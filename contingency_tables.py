@@ -0,0 +1,318 @@
+# =============================================================================
+# LIFE TABLES AND LABOUR-FORCE CONTINGENCY TABLES
+# =============================================================================
+import csv
+import logging
+import math
+import os
+import threading
+
+import numpy as np
+
+from metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+# Column names accepted for each table (first match wins)
+_COLUMN_ALIASES = {
+    'sex': ('sex', 'gender'),
+    'age': ('age', 'x'),
+    'mortality': ('mortality', 'qx', 'q_x'),
+    'disability': ('disability', 'ix', 'i_x', 'disability_incidence'),
+    'unemployment': ('unemployment', 'ux', 'u_x', 'unemployment_rate'),
+}
+
+_SEX_CODES = {'m': 'M', 'male': 'M', 'f': 'F', 'female': 'F', 'u': 'U', 'unisex': 'U', 'all': 'U', '': 'U'}
+
+
+def _normalise_sex(value):
+    code = _SEX_CODES.get(str(value or '').strip().lower())
+    if code is None:
+        raise ValueError(f"Unknown sex in contingency table: {value!r}")
+    return code
+
+
+def _read_rows(path):
+    """Read a CSV or Excel table into a list of dictionaries with lower-case column names."""
+    if path.lower().endswith(('.xlsx', '.xls')):
+        import pandas as pd
+
+        df = pd.read_excel(path)
+        df.columns = [str(column).strip().lower() for column in df.columns]
+        return df.to_dict('records')
+
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        return [{key.strip().lower(): value for key, value in row.items() if key} for row in reader]
+
+
+def _resolve_columns(columns):
+    resolved = {}
+    for name, aliases in _COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in columns:
+                resolved[name] = alias
+                break
+    if 'age' not in resolved or 'mortality' not in resolved:
+        raise ValueError(f"Contingency table needs age and mortality (qx) columns. Columns: {sorted(columns)}")
+    return resolved
+
+
+def _as_rate(value):
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return 0.0
+    rate = float(value)
+    if rate != rate:  # NaN from empty Excel cells
+        return 0.0
+    if not 0.0 <= rate <= 1.0:
+        raise ValueError(f"Contingency rates must be probabilities between 0 and 1, got {rate}")
+    return rate
+
+
+class ContingencyTables:
+    """
+    Mortality, disability and unemployment rates by sex and integer age, with
+    cumulative columns precomputed at load time.
+
+    For each sex the loader builds:
+        l_x      - lives surviving to age x (mortality only), l_0 = 1
+        la_x     - lives still in the labour force (alive and not disabled), la_0 = 1
+        e_x      - expected fraction of the year employed (1 - unemployment)
+
+    Survival between any two ages is a ratio of two array entries, and the
+    survival-weighted annuity factor uses commutation columns that are built once
+    per (sex, discount rate), so lookups never re-read or re-derive the tables.
+    Within each year of age lives decay at a constant force, so fractional ages
+    are interpolated log-linearly.
+    """
+
+    def __init__(self, rates, source=None):
+        """
+        Args:
+            rates: {sex: {'mortality': array, 'disability': array, 'unemployment': array}},
+                arrays indexed by integer age from 0
+            source: Where the tables were loaded from (for logging)
+        """
+        self.source = source
+        self.rates = {}
+        self.lives = {}
+        self.active_lives = {}
+        self.employment = {}
+        self._commutation = {}
+        self._commutation_lock = threading.Lock()
+
+        for sex, columns in rates.items():
+            mortality = np.asarray(columns['mortality'], dtype=float)
+            size = len(mortality)
+            disability = np.asarray(columns.get('disability', np.zeros(size)), dtype=float)
+            unemployment = np.asarray(columns.get('unemployment', np.zeros(size)), dtype=float)
+
+            self.rates[sex] = {'mortality': mortality, 'disability': disability, 'unemployment': unemployment}
+            # One extra entry so l_{x+1} exists for the oldest age in the table
+            self.lives[sex] = np.concatenate(([1.0], np.cumprod(1.0 - mortality)))
+            self.active_lives[sex] = np.concatenate(([1.0], np.cumprod((1.0 - mortality) * (1.0 - disability))))
+            self.employment[sex] = 1.0 - unemployment
+
+    @property
+    def sexes(self):
+        return sorted(self.rates)
+
+    @property
+    def max_age(self):
+        return min(len(columns['mortality']) for columns in self.rates.values()) - 1
+
+    def _sex_key(self, sex):
+        code = _normalise_sex(sex)
+        if code in self.rates:
+            return code
+        if 'U' in self.rates:
+            return 'U'
+        raise ValueError(f"No contingency table for sex {sex!r} (available: {', '.join(self.sexes)})")
+
+    def table(self, sex):
+        """Annual rates for a sex as a dict of arrays (mortality, disability, unemployment)."""
+        return self.rates[self._sex_key(sex)]
+
+    @staticmethod
+    def _interpolate(column, age):
+        """Value of a lives column at a fractional age (log-linear: constant force within the year)."""
+        age = min(max(float(age), 0.0), len(column) - 1.0)
+        lower = int(age)
+        if lower >= len(column) - 1:
+            return float(column[-1])
+        weight = age - lower
+        if weight == 0:
+            return float(column[lower])
+        return float(column[lower] ** (1.0 - weight) * column[lower + 1] ** weight)
+
+    def survival(self, sex, age, years):
+        """Probability a life aged `age` survives `years` more years (mortality only)."""
+        lives = self.lives[self._sex_key(sex)]
+        start = self._interpolate(lives, age)
+        return self._interpolate(lives, age + years) / start if start > 0 else 0.0
+
+    def active_survival(self, sex, age, years):
+        """Probability a worker aged `age` is still alive and not disabled `years` later."""
+        lives = self.active_lives[self._sex_key(sex)]
+        start = self._interpolate(lives, age)
+        return self._interpolate(lives, age + years) / start if start > 0 else 0.0
+
+    def _commutation_column(self, sex, discount_rate):
+        """
+        Commutation columns for the survival-weighted annuity, built once per (sex, discount rate).
+
+        Within each year of age a the discounted active lives D = v^t × la_t decay
+        geometrically by g_a = v × la_{a+1} / la_a, and payments are made
+        continuously scaled by δ / r (δ = ln(1 + r)), the timing under which the
+        certain annuity (1 - v^n) / r holds for fractional as well as whole n.
+
+        Returns:
+            (C, D, g, force, scale): C_y, the cumulative discounted payments before
+            age y; D_a; g_a; the force -ln(g_a); and e_a × δ / r per year of age
+        """
+        key = (sex, round(float(discount_rate), 10))
+        columns = self._commutation.get(key)
+        if columns is not None:
+            return columns
+
+        with self._commutation_lock:
+            columns = self._commutation.get(key)
+            if columns is None:
+                active = self.active_lives[sex]
+                if discount_rate == 0:
+                    v, timing = 1.0, 1.0
+                else:
+                    v = 1.0 / (1.0 + discount_rate)
+                    timing = math.log1p(discount_rate) / discount_rate
+                discounted_lives = v ** np.arange(len(active), dtype=float) * active
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    decay = v * np.where(active[:-1] > 0, active[1:] / active[:-1], 0.0)
+                    force = -np.log(decay)
+                    # Integral of D_a × g_a^t over the whole year (D_a when there is no decay)
+                    whole_year = np.where(force > 1e-12, discounted_lives[:-1] * (1.0 - decay) / force,
+                                          discounted_lives[:-1])
+                scale = self.employment[sex] * timing
+                cumulative = np.concatenate(([0.0], np.cumsum(scale * whole_year)))
+                columns = (cumulative, discounted_lives, decay, force, scale)
+                self._commutation[key] = columns
+        return columns
+
+    @staticmethod
+    def _at(columns, age):
+        """(C, D) at a fractional age, integrating and decaying within the year of age."""
+        cumulative, discounted_lives, decay, force, scale = columns
+        age = max(float(age), 0.0)
+        lower = int(age)
+        if lower >= len(decay):
+            return float(cumulative[-1]), float(discounted_lives[-1])
+        fraction = age - lower
+        remaining = decay[lower] ** fraction
+        if force[lower] > 1e-12:
+            partial = discounted_lives[lower] * (1.0 - remaining) / force[lower]
+        else:
+            partial = discounted_lives[lower] * fraction
+        return float(cumulative[lower] + scale[lower] * partial), float(discounted_lives[lower] * remaining)
+
+    def annuity_factor(self, sex, age, years, discount_rate):
+        """
+        Present value of 1 a year for up to `years` while the claimant is alive,
+        not disabled and employed (survival-weighted annuity). Payments have the
+        timing of the certain annuity (1 - v^n) / r, so with no contingencies the
+        two are equal.
+        """
+        if years <= 0:
+            return 0.0
+        columns = self._commutation_column(self._sex_key(sex), discount_rate)
+        start, denominator = self._at(columns, age)
+        if denominator <= 0:
+            return 0.0
+        end, _ = self._at(columns, age + years)
+        return (end - start) / denominator
+
+    def contingency_factor(self, sex, age, years, discount_rate):
+        """
+        Ratio of the survival-weighted annuity to the certain annuity over the same
+        horizon; multiply the future-loss present value by this factor. At most 1
+        (exactly 1 when every contingency rate is zero).
+        """
+        if years <= 0:
+            return 1.0
+        if discount_rate == 0:
+            certain = years
+        else:
+            certain = (1 - (1 + discount_rate) ** -years) / discount_rate
+        # Rounding can leave a contingency-free factor a hair above 1
+        return min(self.annuity_factor(sex, age, years, discount_rate) / certain, 1.0)
+
+
+def load_contingency_tables(path):
+    """
+    Load contingency tables from a CSV or Excel file.
+
+    The file has one row per age (and sex) with columns:
+        sex          - M / F (optional; without it one unisex table is used)
+        age          - integer age, contiguous from the first listed age
+        mortality    - q_x, probability of death within the year (or 'qx')
+        disability   - probability of becoming disabled within the year (optional)
+        unemployment - probability of being unemployed in a given month (optional)
+
+    Ages below the first listed age use the first row's rates.
+    """
+    rows = _read_rows(path)
+    if not rows:
+        raise ValueError(f"Contingency table {path} is empty")
+
+    columns = _resolve_columns(rows[0].keys())
+    by_sex = {}
+    for row in rows:
+        sex = _normalise_sex(row.get(columns['sex'])) if 'sex' in columns else 'U'
+        age = int(float(row[columns['age']]))
+        by_sex.setdefault(sex, {})[age] = {
+            name: _as_rate(row.get(columns[name])) if name in columns else 0.0
+            for name in ('mortality', 'disability', 'unemployment')
+        }
+
+    rates = {}
+    for sex, by_age in by_sex.items():
+        first_age, last_age = min(by_age), max(by_age)
+        missing = [age for age in range(first_age, last_age + 1) if age not in by_age]
+        if missing:
+            raise ValueError(f"Contingency table {path} ({sex}) is missing ages {missing[:5]}")
+        ages = [max(age, first_age) for age in range(last_age + 1)]
+        rates[sex] = {
+            name: np.array([by_age[age][name] for age in ages])
+            for name in ('mortality', 'disability', 'unemployment')
+        }
+
+    tables = ContingencyTables(rates, source=path)
+    logger.info(f"Loaded contingency tables from {path} (sexes: {', '.join(tables.sexes)}, ages 0-{tables.max_age})")
+    return tables
+
+
+_cached_tables = {}
+_cached_tables_lock = threading.Lock()
+
+
+def get_contingency_tables(path):
+    """
+    Shared tables for a file, loaded once and reloaded only when the file changes.
+
+    Returns:
+        ContingencyTables, or None if the file does not exist
+    """
+    if not path or not os.path.exists(path):
+        return None
+
+    mtime = os.path.getmtime(path)
+    cached = _cached_tables.get(path)
+    if cached is not None and cached[0] == mtime:
+        CACHE_LOOKUPS.inc(cache='contingency_tables', result='hit')
+        return cached[1]
+
+    with _cached_tables_lock:
+        cached = _cached_tables.get(path)
+        if cached is None or cached[0] != mtime:
+            CACHE_LOOKUPS.inc(cache='contingency_tables', result='reload')
+            cached = (mtime, load_contingency_tables(path))
+            _cached_tables[path] = cached
+    return cached[1]
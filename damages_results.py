@@ -0,0 +1,291 @@
+# =============================================================================
+# DAMAGES CALCULATION RESULTS
+# =============================================================================
+"""
+Typed results of a damages calculation, and the one place they are given their
+display labels.
+
+calculate_case returns a DamagesResult holding one record per part of the
+calculation:
+
+    TakeHome            annual take-home pay and the deductions behind it
+    CollateralBenefits  benefits received to date and expected annually
+    PastLoss            missed pay, the net past loss and prejudgment interest
+    FutureLoss          the present value of the future loss and its inputs
+
+The records are frozen and slotted, so they are cheap to build and can be
+shared by the results page, the report generators and the result cache
+without copying. DamagesResult.to_dict()/from_dict() convert to and from the
+JSON form stored in the session, the result cache and report jobs.
+
+The presentation section maps fields to the labels the page, reports and API
+show, and computes the page's interest figures when no interest was calculated.
+"""
+import dataclasses
+import datetime
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True, slots=True)
+class TakeHome:
+    """Annual take-home pay after the deductions that apply for damages in the province."""
+    province: str
+    gross_income: float
+    federal_tax: float
+    provincial_tax: float
+    cpp_contribution: float
+    cpp2_contribution: float
+    ei_contribution: float
+    dependent_benefit: float
+    total_deductions: float
+    net_pay: float
+    daily_net_pay: float
+    hourly_net_pay: float
+    weekly_net_pay: float
+    monthly_net_pay: float
+    working_days: float
+
+    def net_pay_per(self, unit):
+        """Net pay per missed-time unit ('days', 'hours', 'weeks' or 'months'; anything else counts as days)."""
+        return getattr(self, NET_PAY_BY_UNIT.get(unit, 'daily_net_pay'))
+
+
+# Missed-time unit -> TakeHome field with the net pay for one unit
+NET_PAY_BY_UNIT = {
+    'days': 'daily_net_pay',
+    'hours': 'hourly_net_pay',
+    'weeks': 'weekly_net_pay',
+    'months': 'monthly_net_pay',
+}
+
+
+@dataclass(frozen=True, slots=True)
+class CollateralBenefits:
+    """Collateral benefits received to date and expected annually, by benefit."""
+    ei_to_date: float
+    section_b_to_date: float
+    ltd_to_date: float
+    cppd_to_date: float
+    other_to_date: float
+    ei_annual: float
+    section_b_annual: float
+    ltd_annual: float
+    cppd_annual: float
+    other_annual: float
+
+    @property
+    def total_to_date(self):
+        return self.ei_to_date + self.section_b_to_date + self.ltd_to_date + self.cppd_to_date + self.other_to_date
+
+    @property
+    def total_annual(self):
+        return self.ei_annual + self.section_b_annual + self.ltd_annual + self.cppd_annual + self.other_annual
+
+    def to_date(self, benefit):
+        """Amount received to date of one benefit ('ei', 'section_b', 'ltd', 'cppd' or 'other')."""
+        return getattr(self, benefit + '_to_date')
+
+    def annual(self, benefit):
+        """Annual amount of one benefit ('ei', 'section_b', 'ltd', 'cppd' or 'other')."""
+        return getattr(self, benefit + '_annual')
+
+
+@dataclass(frozen=True, slots=True)
+class PastLoss:
+    """
+    Past loss from the date of loss to the calculation date.
+
+    years_between, pji_rate, interest_amount and with_interest are only set when
+    prejudgment interest was calculated (pji_rate is None and the rest 0 otherwise).
+    """
+    missed_time: float
+    missed_time_unit: str
+    missed_pay: float
+    net_loss: float
+    years_between: float
+    pji_rate: Optional[float]
+    interest_amount: float
+    with_interest: float
+
+
+@dataclass(frozen=True, slots=True)
+class FutureLoss:
+    """
+    Future loss from the start date to the end of the loss period.
+
+    annual_salary is the annual net pay less annual collateral benefits; rates
+    are decimals. All zero (see not_calculated) when no future loss was asked for.
+    """
+    annual_salary: float
+    monthly_payment: float
+    time_horizon: float
+    total_months: int
+    discount_rate: float
+    present_value: float
+    future_collateral_benefits: float
+    contingency_factor: Optional[float]
+    wage_growth: float
+    benefit_indexation: float
+    indexed_collateral_benefits: float
+    per_year_tax: bool
+    gross_salary: float
+
+    @classmethod
+    def not_calculated(cls):
+        return cls(0, 0, 0, 0, 0, 0, 0, None, 0, 0, 0, False, 0)
+
+
+@dataclass(frozen=True, slots=True)
+class DamagesResult:
+    """The calculated damages for one case."""
+    client_name: str
+    province: str
+    dependents: int
+    loss_date: datetime.date
+    start_date: datetime.date
+    current_date: datetime.date
+    return_status: str
+    end_date: Optional[datetime.date]
+    birthdate: Optional[datetime.date]
+    retirement_age: Optional[int]
+    ei_days_remaining: int
+    take_home: TakeHome
+    collateral_benefits: CollateralBenefits
+    past_loss: PastLoss
+    future_loss: FutureLoss
+    total_damages: float
+
+    def to_dict(self):
+        """JSON-serializable form (dates as YYYY-MM-DD) for the session, the result cache and report jobs."""
+        data = dataclasses.asdict(self)
+        for name in _DATE_FIELDS:
+            if data[name] is not None:
+                data[name] = data[name].isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """The DamagesResult stored by to_dict."""
+        values = dict(data)
+        for name in _DATE_FIELDS:
+            if values[name] is not None:
+                values[name] = datetime.date.fromisoformat(values[name])
+        for name, record in _RECORD_FIELDS:
+            values[name] = record(**values[name])
+        return cls(**values)
+
+
+_DATE_FIELDS = ('loss_date', 'start_date', 'current_date', 'end_date', 'birthdate')
+_RECORD_FIELDS = (
+    ('take_home', TakeHome),
+    ('collateral_benefits', CollateralBenefits),
+    ('past_loss', PastLoss),
+    ('future_loss', FutureLoss),
+)
+
+
+# -----------------------------------------------------------------------------
+# Presentation: display labels and the figures shown on the results page
+# -----------------------------------------------------------------------------
+PROVINCE_NAMES = {
+    'nova scotia': 'Nova Scotia',
+    'new brunswick': 'New Brunswick',
+    'prince edward island': 'Prince Edward Island',
+    'newfoundland': 'Newfoundland and Labrador',
+    'newfoundland and labrador': 'Newfoundland and Labrador',
+}
+
+# TakeHome field -> label, in display order (None: the provincial tax, labelled by province)
+TAKE_HOME_LABELS = (
+    ('gross_income', "Gross Income"),
+    ('federal_tax', "Federal Tax"),
+    ('provincial_tax', None),
+    ('cpp_contribution', "CPP Contribution"),
+    ('cpp2_contribution', "CPP2 Contribution"),
+    ('ei_contribution', "EI Contribution"),
+    ('dependent_benefit', "Dependent Benefit"),
+    ('total_deductions', "Total Deductions"),
+    ('net_pay', "Net Pay (Provincially specific deductions for damages)"),
+    ('daily_net_pay', "Daily Net Pay"),
+    ('hourly_net_pay', "Hourly Net Pay"),
+    ('weekly_net_pay', "Weekly Net Pay"),
+    ('monthly_net_pay', "Monthly Net Pay"),
+    ('working_days', "Working Days"),
+)
+
+# (CollateralBenefits prefix, label, description) in display order
+BENEFITS = (
+    ('ei', "EI Benefits", "Employment Insurance sickness benefits (limited to 26 weeks)"),
+    ('section_b', "Section B Benefits", "No-fault automobile insurance benefits"),
+    ('ltd', "LTD Benefits", "Long-term disability benefits from employer or private insurance"),
+    ('cppd', "CPPD Benefits", "Canada Pension Plan disability benefits"),
+    ('other', "Other Benefits", "Additional benefits from other sources"),
+)
+
+# PJI rate (%) the results page assumes when no interest was calculated
+DEFAULT_PJI_RATE = 2.5
+
+
+def province_display(province):
+    """Full province name for reports, e.g. 'newfoundland' -> 'Newfoundland and Labrador'."""
+    return PROVINCE_NAMES.get(province.lower(), province.capitalize())
+
+
+def provincial_tax_label(province):
+    return f"{province.capitalize()} Tax"
+
+
+def labelled_take_home(take_home):
+    """TakeHome as a dictionary keyed by display label (the /api/net-to-gross 'take_home' object)."""
+    return {
+        label or provincial_tax_label(take_home.province): getattr(take_home, name)
+        for name, label in TAKE_HOME_LABELS
+    }
+
+
+@dataclass(frozen=True, slots=True)
+class ResultsFigures:
+    """
+    Past loss figures as the results page shows them.
+
+    When no interest was calculated the page still shows an estimate: interest
+    on the net past loss from the date of loss to the calculation date at the
+    given rate, or DEFAULT_PJI_RATE.
+    """
+    years_between: float
+    pji_rate: float
+    interest_amount: float
+    past_with_interest: float
+    total_damages: float
+
+
+def results_figures(damages):
+    """ResultsFigures for a DamagesResult."""
+    past = damages.past_loss
+    pji_rate = past.pji_rate if past.pji_rate is not None else DEFAULT_PJI_RATE
+    if past.years_between > 0:
+        years_between = past.years_between
+    else:
+        years_between = (damages.current_date - damages.loss_date).days / 365.25
+
+    if past.years_between > 0 and pji_rate > 0:
+        estimated_interest = past.net_loss * (past.years_between * pji_rate / 100)
+    else:
+        estimated_interest = past.net_loss * (years_between * pji_rate / 100)
+
+    # A negative calculated interest (negative net loss) is shown as the estimate,
+    # but still counts towards the totals
+    interest_amount = past.interest_amount if past.interest_amount > 0 else estimated_interest
+    total_interest = past.interest_amount or estimated_interest
+    if past.with_interest > 0:
+        past_with_interest = past.with_interest
+    else:
+        past_with_interest = past.net_loss + total_interest
+    return ResultsFigures(
+        years_between=years_between,
+        pji_rate=pji_rate,
+        interest_amount=interest_amount,
+        past_with_interest=past_with_interest,
+        total_damages=past.net_loss + total_interest + damages.future_loss.present_value,
+    )
@@ -0,0 +1,337 @@
+# =============================================================================
+# EMBEDDED SQLITE DATASTORE
+# =============================================================================
+import os
+import datetime
+import logging
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Shared database file for rates (and other ActuClaim state); override with ACTUCLAIM_DB_PATH
+DEFAULT_DB_PATH = os.environ.get(
+    'ACTUCLAIM_DB_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'actuclaim.db')
+)
+
+# Connections are per thread and per process: sqlite3 connections must not cross a fork
+_local = threading.local()
+
+RATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tbill_rates (
+    rate_date TEXT PRIMARY KEY,
+    rate REAL NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS tbill_rate_prefix (
+    rate_date TEXT PRIMARY KEY,
+    cum_sum REAL NOT NULL,
+    cum_count INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+"""
+
+
+def get_connection(db_path=None):
+    """
+    Get a WAL-mode connection to the datastore for the current thread and process.
+
+    Connections run in autocommit mode; callers group statements with explicit
+    BEGIN/COMMIT so readers always see a consistent snapshot.
+    """
+    db_path = db_path or DEFAULT_DB_PATH
+    connections = getattr(_local, 'connections', None)
+    if connections is None or getattr(_local, 'pid', None) != os.getpid():
+        connections = _local.connections = {}
+        _local.pid = os.getpid()
+
+    conn = connections.get(db_path)
+    if conn is None:
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        connections[db_path] = conn
+    return conn
+
+
+def close_connections():
+    """Close this thread's connections (e.g. in the gunicorn master before workers fork)."""
+    connections = getattr(_local, 'connections', None) or {}
+    for conn in connections.values():
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    connections.clear()
+
+
+def _to_iso(value):
+    """Normalise a date, datetime or 'YYYY-MM-DD' string to an ISO date string."""
+    if isinstance(value, datetime.datetime):
+        return value.date().isoformat()
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return str(value)[:10]
+
+
+class RateStore:
+    """
+    T-Bill rate series stored in SQLite with a date index.
+
+    Writers bulk-upsert rates and rebuild a cumulative (prefix-sum) table in the
+    same transaction, so the average over any date range is two indexed lookups.
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or DEFAULT_DB_PATH
+        self._ensure_schema()
+
+    def _conn(self):
+        return get_connection(self.db_path)
+
+    def _ensure_schema(self):
+        self._conn().executescript(RATE_SCHEMA)
+
+    # -------------------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------------------
+    def upsert_rates(self, rates_dict):
+        """
+        Insert or update rates in a single transaction.
+
+        Args:
+            rates_dict: Dictionary mapping dates to rates (percent)
+
+        Returns:
+            Tuple of (new_count, updated_count)
+        """
+        rows = [(_to_iso(date), float(rate)) for date, rate in rates_dict.items() if rate is not None]
+        if not rows:
+            return 0, 0
+
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            before = conn.execute('SELECT COUNT(*) FROM tbill_rates').fetchone()[0]
+            changes_before = conn.total_changes
+            conn.executemany(
+                """
+                INSERT INTO tbill_rates (rate_date, rate) VALUES (?, ?)
+                ON CONFLICT(rate_date) DO UPDATE SET rate = excluded.rate
+                WHERE tbill_rates.rate != excluded.rate
+                """,
+                rows
+            )
+            changed = conn.total_changes - changes_before
+            after = conn.execute('SELECT COUNT(*) FROM tbill_rates').fetchone()[0]
+            new_count = after - before
+            updated_count = changed - new_count
+
+            if changed:
+                self._rebuild_prefix(conn)
+                self._bump_version(conn)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        logger.info(f"Upserted T-Bill rates (New: {new_count}, Updated: {updated_count})")
+        return new_count, updated_count
+
+    def _rebuild_prefix(self, conn):
+        conn.execute('DELETE FROM tbill_rate_prefix')
+        conn.execute(
+            """
+            INSERT INTO tbill_rate_prefix (rate_date, cum_sum, cum_count)
+            SELECT rate_date,
+                   SUM(rate) OVER (ORDER BY rate_date),
+                   COUNT(*) OVER (ORDER BY rate_date)
+            FROM tbill_rates
+            """
+        )
+
+    def _bump_version(self, conn):
+        now = datetime.datetime.now().isoformat(timespec='seconds')
+        conn.execute(
+            """
+            INSERT INTO store_meta (key, value) VALUES ('rates_version', '1')
+            ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1
+            """
+        )
+        conn.execute(
+            "INSERT INTO store_meta (key, value) VALUES ('rates_updated_at', ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (now,)
+        )
+
+    # -------------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------------
+    def is_empty(self):
+        return self._conn().execute('SELECT 1 FROM tbill_rates LIMIT 1').fetchone() is None
+
+    def data_version(self):
+        """Integer that increases every time the rate series changes."""
+        row = self._conn().execute("SELECT value FROM store_meta WHERE key = 'rates_version'").fetchone()
+        return int(row[0]) if row else 0
+
+    def updated_at(self):
+        """ISO timestamp of the last write that changed the series, or None."""
+        row = self._conn().execute("SELECT value FROM store_meta WHERE key = 'rates_updated_at'").fetchone()
+        return row[0] if row else None
+
+    def range_average(self, start_date, end_date):
+        """
+        Average rate over [start_date, end_date] inclusive from the prefix-sum table.
+
+        Both lookups run in one read transaction so they see the same snapshot
+        even while the updater is writing.
+
+        Returns:
+            Tuple of (average_rate, observation_count); average is None when no rates fall in range
+        """
+        start_iso, end_iso = _to_iso(start_date), _to_iso(end_date)
+        conn = self._conn()
+        conn.execute('BEGIN')
+        try:
+            upper = conn.execute(
+                'SELECT cum_sum, cum_count FROM tbill_rate_prefix WHERE rate_date <= ? '
+                'ORDER BY rate_date DESC LIMIT 1',
+                (end_iso,)
+            ).fetchone()
+            lower = conn.execute(
+                'SELECT cum_sum, cum_count FROM tbill_rate_prefix WHERE rate_date < ? '
+                'ORDER BY rate_date DESC LIMIT 1',
+                (start_iso,)
+            ).fetchone()
+        finally:
+            conn.execute('COMMIT')
+
+        upper_sum, upper_count = upper if upper else (0.0, 0)
+        lower_sum, lower_count = lower if lower else (0.0, 0)
+        count = upper_count - lower_count
+        if count <= 0:
+            return None, 0
+        return (upper_sum - lower_sum) / count, count
+
+    def bounds(self):
+        """
+        Earliest and latest observations.
+
+        Returns:
+            ((earliest_date, earliest_rate), (latest_date, latest_rate)) as ISO strings and floats,
+            or None if the store is empty
+        """
+        conn = self._conn()
+        conn.execute('BEGIN')
+        try:
+            first = conn.execute('SELECT rate_date, rate FROM tbill_rates ORDER BY rate_date ASC LIMIT 1').fetchone()
+            last = conn.execute('SELECT rate_date, rate FROM tbill_rates ORDER BY rate_date DESC LIMIT 1').fetchone()
+        finally:
+            conn.execute('COMMIT')
+        if first is None:
+            return None
+        return first, last
+
+    def get_rates(self, start_date=None, end_date=None):
+        """
+        Rates in date order, optionally limited to [start_date, end_date].
+
+        Returns:
+            List of (datetime.date, rate) tuples
+        """
+        query = 'SELECT rate_date, rate FROM tbill_rates'
+        clauses, params = [], []
+        if start_date is not None:
+            clauses.append('rate_date >= ?')
+            params.append(_to_iso(start_date))
+        if end_date is not None:
+            clauses.append('rate_date <= ?')
+            params.append(_to_iso(end_date))
+        if clauses:
+            query += ' WHERE ' + ' AND '.join(clauses)
+        query += ' ORDER BY rate_date'
+
+        return [
+            (datetime.date.fromisoformat(rate_date), rate)
+            for rate_date, rate in self._conn().execute(query, params)
+        ]
+
+    # -------------------------------------------------------------------------
+    # Excel import/export
+    # -------------------------------------------------------------------------
+    def import_excel(self, excel_path):
+        """
+        Load rates from the legacy Excel file ('Date' and 'T-Bill Rate' columns).
+
+        Non-numeric entries such as 'Bank holiday' are skipped.
+
+        Returns:
+            Tuple of (new_count, updated_count)
+        """
+        import pandas as pd
+
+        df = pd.read_excel(excel_path)
+        if 'Date' not in df.columns or 'T-Bill Rate' not in df.columns:
+            column_names = df.columns.tolist()
+            if len(column_names) < 2:
+                raise ValueError(f"Unexpected Excel structure. Columns: {column_names}")
+            df = df.rename(columns={column_names[0]: 'Date', column_names[1]: 'T-Bill Rate'})
+
+        df['Date'] = pd.to_datetime(df['Date'])
+        df['T-Bill Rate'] = pd.to_numeric(df['T-Bill Rate'], errors='coerce')
+        df = df.dropna(subset=['Date', 'T-Bill Rate'])
+
+        rates = dict(zip(df['Date'].dt.date, df['T-Bill Rate'].astype(float)))
+        logger.info(f"Importing {len(rates)} T-Bill rates from {excel_path}")
+        return self.upsert_rates(rates)
+
+    def export_excel(self, excel_path):
+        """Write the full series to Excel (newest first) in the layout the application has always used."""
+        import pandas as pd
+
+        rows = self.get_rates()
+        df = pd.DataFrame(
+            {'Date': [pd.Timestamp(date) for date, _ in rows], 'T-Bill Rate': [rate for _, rate in rows]}
+        )
+        df = df.sort_values(by='Date', ascending=False)
+
+        directory = os.path.dirname(excel_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        df.to_excel(excel_path, index=False)
+        logger.info(f"Exported {len(df)} T-Bill rates to {excel_path}")
+        return len(df)
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_rate_store(bootstrap_excel_path=None):
+    """
+    Shared RateStore for the default database.
+
+    On first use an empty store is seeded from bootstrap_excel_path, so existing
+    deployments migrate from the Excel file without a manual step.
+    """
+    global _default_store
+    if _default_store is None:
+        with _default_store_lock:
+            if _default_store is None:
+                store = RateStore()
+                if store.is_empty() and bootstrap_excel_path and os.path.exists(bootstrap_excel_path):
+                    try:
+                        store.import_excel(bootstrap_excel_path)
+                    except Exception as e:
+                        logger.error(f"Error seeding rate store from {bootstrap_excel_path}: {e}")
+                _default_store = store
+    return _default_store
@@ -5,8 +5,6 @@ import os
 import logging
 import socket
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # SMTP configuration for Google Workspace
@@ -63,4 +61,6 @@ def test_connection():
 
 # Run test when this file is executed directly
 if __name__ == "__main__":
+    # Logging for the standalone run; the web app configures it in logging_config
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
     test_connection()
@@ -3,14 +3,14 @@
 # =============================================================================
 import logging
 import traceback
-import datetime
 import os
 import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+from damages_results import DEFAULT_PJI_RATE
+from metrics import EMAILS_IN_PROGRESS, EMAILS_SENT
+
 logger = logging.getLogger(__name__)
 
 # Import SMTP configuration
@@ -26,35 +26,25 @@ except ImportError:
     SMTP_PASSWORD = os.environ.get('ACTUCLAIM_SMTP_PASSWORD', '')
     SENDER_EMAIL = os.environ.get('ACTUCLAIM_SENDER_EMAIL', 'info@actuclaim.com')
 
-def send_results_email(recipient_email, client_name, province, calculation_details, present_value_details, 
-                      result, collateral_benefits, missed_time_unit, missed_time, 
-                      past_lost_wages_with_interest, net_past_lost_wages, missed_pay, total_damages,
-                      birthdate=None, retirement_age=None, loss_date=None, current_date=None, 
-                      ei_days_remaining=0, **kwargs):
+@EMAILS_IN_PROGRESS.track_in_progress()
+def send_results_email(recipient_email, damages):
     """
     Send calculation results via email using standard SMTP.
+
+    Args:
+        recipient_email: Address to send the results to
+        damages: damages_results.DamagesResult of the calculation
     """
     try:
-        # Set defaults for current_date if not provided
-        if current_date is None:
-            current_date = datetime.date.today()
-            
+        client_name = damages.client_name
+        province = damages.province
+        take_home = damages.take_home
+        past_loss = damages.past_loss
+        future_loss = damages.future_loss
+
         # Format dates
-        today_date = current_date.strftime("%B %d, %Y") if isinstance(current_date, datetime.date) else str(current_date)
-        
-        # Handle loss_date formatting
-        loss_date_str = ""
-        if loss_date:
-            if isinstance(loss_date, datetime.date):
-                loss_date_str = loss_date.strftime("%B %d, %Y")
-            elif isinstance(loss_date, str):
-                try:
-                    parsed_date = datetime.datetime.strptime(loss_date, '%Y-%m-%d').date()
-                    loss_date_str = parsed_date.strftime("%B %d, %Y")
-                except ValueError:
-                    loss_date_str = loss_date
-            else:
-                loss_date_str = str(loss_date)
+        today_date = damages.current_date.strftime("%B %d, %Y")
+        loss_date_str = damages.loss_date.strftime("%B %d, %Y") if damages.loss_date else ""
         
         # Build HTML email content
         html_content = f"""
@@ -166,15 +156,15 @@ def send_results_email(recipient_email, client_name, province, calculation_detai
                         <tbody>
                             <tr>
                                 <td>Past Lost Wages with Interest</td>
-                                <td class="text-end">${past_lost_wages_with_interest:,.2f}</td>
+                                <td class="text-end">${past_loss.with_interest:,.2f}</td>
                             </tr>
                             <tr>
                                 <td>Future Lost Wages</td>
-                                <td class="text-end">${present_value_details.get('present_value', 0):,.2f}</td>
+                                <td class="text-end">${future_loss.present_value:,.2f}</td>
                             </tr>
                             <tr class="total-row">
                                 <td>Total Economic Damages</td>
-                                <td class="text-end" id="total-damages-amount">${total_damages:,.2f}</td>
+                                <td class="text-end" id="total-damages-amount">${damages.total_damages:,.2f}</td>
                             </tr>
                         </tbody>
                     </table>
@@ -188,40 +178,35 @@ def send_results_email(recipient_email, client_name, province, calculation_detai
                                 <tbody>
                                     <tr>
                                         <td>Gross Income</td>
-                                        <td class="text-end">${result.get("Gross Income", 0):,.2f}</td>
+                                        <td class="text-end">${take_home.gross_income:,.2f}</td>
                                     </tr>
         """
         
         # Add dependent benefit if present
-        if result.get('Dependent Benefit', 0) > 0:
+        if take_home.dependent_benefit > 0:
             html_content += f"""
                                     <tr>
-                                        <td>Dependent Benefit ({calculation_details.get('Dependents', '0')} dependents)</td>
-                                        <td class="text-end">${result.get('Dependent Benefit', 0):,.2f}</td>
+                                        <td>Dependent Benefit ({damages.dependents} dependents)</td>
+                                        <td class="text-end">${take_home.dependent_benefit:,.2f}</td>
                                     </tr>
             """
         
-        # Handle different provincial tax naming conventions
-        provincial_tax = result.get(f"{province.title()} Tax", 
-                                   result.get('Provincial Tax', 
-                                             result.get(f"{province.capitalize()} Tax", 0)))
-        
         html_content += f"""
                                     <tr>
                                         <td>Federal Tax</td>
-                                        <td class="text-end">-${result.get('Federal Tax', 0):,.2f}</td>
+                                        <td class="text-end">-${take_home.federal_tax:,.2f}</td>
                                     </tr>
                                     <tr>
                                         <td>Provincial Tax ({province.title()})</td>
-                                        <td class="text-end">-${provincial_tax:,.2f}</td>
+                                        <td class="text-end">-${take_home.provincial_tax:,.2f}</td>
                                     </tr>
                                     <tr>
                                         <td>CPP/EI Contributions</td>
-                                        <td class="text-end">-${result.get('CPP Contribution', 0) + result.get('EI Contribution', 0):,.2f}</td>
+                                        <td class="text-end">-${take_home.cpp_contribution + take_home.ei_contribution:,.2f}</td>
                                     </tr>
                                     <tr class="total-row">
                                         <td>Net Income</td>
-                                        <td class="text-end">${result.get('Net Pay (Provincially specific deductions for damages)', 0):,.2f}</td>
+                                        <td class="text-end">${take_home.net_pay:,.2f}</td>
                                     </tr>
                                 </tbody>
                             </table>
@@ -233,19 +218,19 @@ def send_results_email(recipient_email, client_name, province, calculation_detai
                                 <tbody>
                                     <tr>
                                         <td>Missed Time</td>
-                                        <td class="text-end">{missed_time} {missed_time_unit}</td>
+                                        <td class="text-end">{past_loss.missed_time} {past_loss.missed_time_unit}</td>
                                     </tr>
                                     <tr>
                                         <td>Gross Missed Income</td>
-                                        <td class="text-end">${missed_pay:,.2f}</td>
+                                        <td class="text-end">${past_loss.missed_pay:,.2f}</td>
                                     </tr>
                                     <tr>
                                         <td>Collateral Benefits Deduction</td>
-                                        <td class="text-end">-${collateral_benefits.get('Total Past Benefits', 0):,.2f}</td>
+                                        <td class="text-end">-${damages.collateral_benefits.total_to_date:,.2f}</td>
                                     </tr>
                                     <tr class="total-row">
                                         <td>Net Past Lost Wages</td>
-                                        <td class="text-end">${net_past_lost_wages:,.2f}</td>
+                                        <td class="text-end">${past_loss.net_loss:,.2f}</td>
                                     </tr>
                                 </tbody>
                             </table>
@@ -259,7 +244,7 @@ def send_results_email(recipient_email, client_name, province, calculation_detai
                                 <tbody>
                                     <tr>
                                         <td>Original Past Lost Wages</td>
-                                        <td class="text-end">${net_past_lost_wages:,.2f}</td>
+                                        <td class="text-end">${past_loss.net_loss:,.2f}</td>
                                     </tr>
                                     <tr>
                                         <td>Loss Date</td>
@@ -271,19 +256,19 @@ def send_results_email(recipient_email, client_name, province, calculation_detai
                                     </tr>
                                     <tr>
                                         <td>Years Between</td>
-                                        <td class="text-end">{calculation_details.get('Years Between', 0):.2f}</td>
+                                        <td class="text-end">{past_loss.years_between:.2f}</td>
                                     </tr>
                                     <tr>
                                         <td>PJI Rate</td>
-                                        <td class="text-end">{calculation_details.get('PJI Rate', 2.5):.2f}%</td>
+                                        <td class="text-end">{past_loss.pji_rate if past_loss.pji_rate is not None else DEFAULT_PJI_RATE:.2f}%</td>
                                     </tr>
                                     <tr>
                                         <td>Pre-Judgment Interest Amount</td>
-                                        <td class="text-end">${calculation_details.get('Interest Amount', 0):,.2f}</td>
+                                        <td class="text-end">${past_loss.interest_amount:,.2f}</td>
                                     </tr>
                                     <tr class="total-row highlight">
                                         <td>Past Lost Wages with Interest</td>
-                                        <td class="text-end">${past_lost_wages_with_interest:,.2f}</td>
+                                        <td class="text-end">${past_loss.with_interest:,.2f}</td>
                                     </tr>
                                 </tbody>
                             </table>
@@ -291,7 +276,7 @@ def send_results_email(recipient_email, client_name, province, calculation_detai
         """
         
         # Only include Future Lost Wages section if there are future lost wages
-        if present_value_details.get('present_value', 0) > 0:
+        if future_loss.present_value > 0:
             html_content += f"""
                         <div class="future-lost-wages">
                             <h2>Future Lost Wages</h2>
@@ -299,23 +284,23 @@ def send_results_email(recipient_email, client_name, province, calculation_detai
                                 <tbody>
                                     <tr>
                                         <td>Annual Net Salary</td>
-                                        <td class="text-end">${present_value_details.get('annual_salary', 0):,.2f}</td>
+                                        <td class="text-end">${future_loss.annual_salary:,.2f}</td>
                                     </tr>
                                     <tr>
                                         <td>Annual Collateral Benefits</td>
-                                        <td class="text-end">-${collateral_benefits.get('Total Annual Future Benefits', 0):,.2f}</td>
+                                        <td class="text-end">-${damages.collateral_benefits.total_annual:,.2f}</td>
                                     </tr>
                                     <tr>
                                         <td>Time Horizon</td>
-                                        <td class="text-end">{present_value_details.get('time_horizon', 0):.2f} years</td>
+                                        <td class="text-end">{future_loss.time_horizon:.2f} years</td>
                                     </tr>
                                     <tr>
                                         <td>Discount Rate</td>
-                                        <td class="text-end">{present_value_details.get('discount_rate', 0) * 100:.2f}%</td>
+                                        <td class="text-end">{future_loss.discount_rate * 100:.2f}%</td>
                                     </tr>
                                     <tr class="total-row">
                                         <td>Present Value of Future Lost Wages</td>
-                                        <td class="text-end">${present_value_details.get('present_value', 0):,.2f}</td>
+                                        <td class="text-end">${future_loss.present_value:,.2f}</td>
                                     </tr>
                                 </tbody>
                             </table>
@@ -351,9 +336,9 @@ ACTUCLAIM ECONOMIC DAMAGES CALCULATION
 Results for {client_name} | Generated on {today_date}
 
 ECONOMIC DAMAGES SUMMARY
-Past Lost Wages with Interest: ${past_lost_wages_with_interest:,.2f}
-Future Lost Wages: ${present_value_details.get('present_value', 0):,.2f}
-Total Economic Damages: ${total_damages:,.2f}
+Past Lost Wages with Interest: ${past_loss.with_interest:,.2f}
+Future Lost Wages: ${future_loss.present_value:,.2f}
+Total Economic Damages: ${damages.total_damages:,.2f}
 
 This report was generated by ActuClaim Economic Damages Calculator.
         """
@@ -382,11 +367,13 @@ This report was generated by ActuClaim Economic Damages Calculator.
             logger.debug(f"Sending email")
             server.send_message(msg)
             logger.info(f"Email sent successfully to {recipient_email}")
+            EMAILS_SENT.inc(outcome='sent')
             return True
         
     except Exception as e:
         logger.error(f"Failed to send email: {str(e)}")
         logger.error(f"Detailed error: {traceback.format_exc()}")
+        EMAILS_SENT.inc(outcome='failed')
         return False
 
 # Testing function
@@ -408,4 +395,6 @@ def test_smtp_connection():
 
 # Run test when this file is executed directly
 if __name__ == "__main__":
+    # Logging for the standalone run; the web app configures it in logging_config
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
     test_smtp_connection()
@@ -0,0 +1,171 @@
+# =============================================================================
+# EXACT-CENT DECIMAL CALCULATIONS
+# =============================================================================
+"""
+Decimal versions of the damages pipeline for exact-cent results.
+
+The float functions in income_calculations and lost_wages_calculations remain
+the default. These run the same steps with decimal.Decimal and these rounding
+rules (all ROUND_HALF_UP to the cent, as in a spreadsheet ROUND(x, 2)):
+
+    - Each tax and contribution is computed exactly and rounded to the cent
+    - Net pay is gross income less the sum of the rounded deductions
+    - Daily, hourly, weekly and monthly pay are rounded from the net pay
+    - Interest and present values are computed at 28 significant digits and
+      rounded once at the end
+"""
+import dataclasses
+from decimal import Decimal, ROUND_HALF_UP, localcontext
+
+from damages_results import TakeHome
+from tax_calculations import (
+    FEDERAL_BRACKETS, PROVINCIAL_BRACKETS, DEPENDENT_AMOUNT, DEPENDENT_MAX,
+    CPP_RATE, CPP_MAX_EARNINGS, CPP_EXEMPTION, CPP2_RATE, CPP2_MAX_EARNINGS,
+    EI_RATE, EI_MAX_EARNINGS
+)
+
+CENT = Decimal('0.01')
+ZERO = Decimal('0')
+ONE = Decimal('1')
+DAYS_PER_YEAR = Decimal('365.25')
+PRECISION = 28
+
+
+def to_decimal(value):
+    """Convert a number to Decimal via its shortest repr, so 0.0595 becomes exactly 0.0595."""
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def round_cents(value):
+    return to_decimal(value).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def _brackets(brackets):
+    """Bracket tuples as Decimals, with None for the open-ended top bracket."""
+    return [
+        (to_decimal(lower), None if upper == float('inf') else to_decimal(upper), to_decimal(rate))
+        for lower, upper, rate in brackets
+    ]
+
+
+_FEDERAL = _brackets(FEDERAL_BRACKETS)
+_PROVINCIAL = {province: _brackets(brackets) for province, brackets in PROVINCIAL_BRACKETS.items()}
+
+
+def bracket_tax(taxable_income, brackets):
+    """Exact tax on taxable_income under (lower, upper, rate) Decimal brackets."""
+    tax = ZERO
+    for lower, upper, rate in brackets:
+        if taxable_income <= lower:
+            break
+        top = taxable_income if upper is None else min(taxable_income, upper)
+        tax += (top - lower) * rate
+    return tax
+
+
+def dependent_benefit(dependents):
+    return min(int(dependents) * to_decimal(DEPENDENT_AMOUNT), to_decimal(DEPENDENT_MAX))
+
+
+def cpp_contributions(income):
+    """CPP and CPP2 contributions, each rounded to the cent."""
+    cpp_max = to_decimal(CPP_MAX_EARNINGS)
+    cpp2_max = to_decimal(CPP2_MAX_EARNINGS)
+    exemption = to_decimal(CPP_EXEMPTION)
+
+    cpp = (min(income, cpp_max) - exemption) * to_decimal(CPP_RATE) if income > exemption else ZERO
+    cpp2 = (min(income, cpp2_max) - cpp_max) * to_decimal(CPP2_RATE) if income > cpp_max else ZERO
+    return round_cents(cpp), round_cents(cpp2)
+
+
+def ei_contribution(income):
+    return round_cents(min(income, to_decimal(EI_MAX_EARNINGS)) * to_decimal(EI_RATE))
+
+
+def exact_take_home(income, province, working_days, hours_per_day, is_hourly=False, hours_per_week=None, dependents=0):
+    """
+    calculate_take_home with Decimal arithmetic and cent rounding of every deduction.
+
+    Returns:
+        damages_results.TakeHome with Decimal amounts
+    """
+    with localcontext() as context:
+        context.prec = PRECISION
+        income = to_decimal(income)
+        taxable_income = max(income - dependent_benefit(dependents), ZERO)
+
+        federal_tax = round_cents(bracket_tax(taxable_income, _FEDERAL))
+        provincial_tax = round_cents(bracket_tax(taxable_income, _PROVINCIAL[province]))
+        cpp_contribution, cpp2_contribution = cpp_contributions(income)
+        ei = ei_contribution(income)
+
+        if province.lower() == "new brunswick":
+            cpp_contribution, cpp2_contribution, ei = ZERO, ZERO, ZERO
+        elif province.lower() == "prince edward island":
+            federal_tax, provincial_tax, cpp_contribution, cpp2_contribution, ei = ZERO, ZERO, ZERO, ZERO, ZERO
+
+        total_deductions = federal_tax + provincial_tax + cpp_contribution + cpp2_contribution + ei
+        take_home_pay = income - total_deductions
+
+        if is_hourly and hours_per_week is not None:
+            weekly_net_pay = take_home_pay / 52
+            daily_net_pay = weekly_net_pay / 5
+            hourly_net_pay = weekly_net_pay / to_decimal(hours_per_week)
+            monthly_net_pay = weekly_net_pay * Decimal('4.33')
+        else:
+            working_days = to_decimal(working_days)
+            daily_net_pay = take_home_pay / working_days
+            hourly_net_pay = take_home_pay / (working_days * to_decimal(hours_per_day))
+            weekly_net_pay = take_home_pay / 52
+            monthly_net_pay = take_home_pay / 12
+
+        return TakeHome(
+            province=province,
+            gross_income=income,
+            federal_tax=federal_tax,
+            provincial_tax=provincial_tax,
+            cpp_contribution=cpp_contribution,
+            cpp2_contribution=cpp2_contribution,
+            ei_contribution=ei,
+            dependent_benefit=dependent_benefit(dependents),
+            total_deductions=total_deductions,
+            net_pay=round_cents(take_home_pay),
+            daily_net_pay=round_cents(daily_net_pay),
+            hourly_net_pay=round_cents(hourly_net_pay),
+            weekly_net_pay=round_cents(weekly_net_pay),
+            monthly_net_pay=round_cents(monthly_net_pay),
+            working_days=working_days
+        )
+
+
+def exact_compound_interest(amount, rate_percent, days):
+    """amount × (1 + rate)^(days / 365.25) rounded to the cent."""
+    with localcontext() as context:
+        context.prec = PRECISION
+        years = to_decimal(days) / DAYS_PER_YEAR
+        growth = (ONE + to_decimal(rate_percent) / 100) ** years
+        return round_cents(to_decimal(amount) * growth)
+
+
+def exact_annuity_present_value(annual_lost_wages, time_horizon, discount_rate):
+    """PMT × (1 - (1 + r)^-n) / r rounded to the cent (PMT × n when r is 0)."""
+    with localcontext() as context:
+        context.prec = PRECISION
+        payment = to_decimal(annual_lost_wages)
+        n = to_decimal(time_horizon)
+        r = to_decimal(discount_rate)
+        if r == 0:
+            return round_cents(payment * n)
+        return round_cents(payment * (ONE - (ONE + r) ** -n) / r)
+
+
+def as_floats(values):
+    """Convert the Decimal values in a result dictionary or record (e.g. a TakeHome) to floats for templates and sessions."""
+    if isinstance(values, dict):
+        return {key: float(value) if isinstance(value, Decimal) else value for key, value in values.items()}
+    return dataclasses.replace(values, **{
+        field.name: float(getattr(values, field.name))
+        for field in dataclasses.fields(values) if isinstance(getattr(values, field.name), Decimal)
+    })
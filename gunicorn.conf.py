@@ -0,0 +1,30 @@
+# Gunicorn configuration for ActuClaim
+#
+# Loaded automatically when gunicorn is started from the application directory:
+#     gunicorn app:app
+import multiprocessing
+
+bind = "127.0.0.1:8000"
+workers = min(multiprocessing.cpu_count() * 2 + 1, 4)
+
+# Import the application in the master so workers inherit it copy-on-write
+preload_app = True
+
+
+def on_starting(server):
+    """Warm rate data, templates and report styles once in the master process."""
+    from warmup import preload
+    from metrics import clear_metrics_dir
+
+    # Worker pids from a previous run may be reused; start every run's metrics from zero
+    clear_metrics_dir()
+    timings = preload(freeze=True)
+    server.log.info("Master warm-up: " + ", ".join(f"{step} {seconds * 1000:.1f} ms" for step, seconds in timings.items()))
+
+
+def post_fork(server, worker):
+    """Confirm the worker inherited the warmed state; any step not done in the master runs here."""
+    from warmup import preload
+
+    timings = preload()
+    server.log.info(f"Worker {worker.pid} warm-up: {timings['total'] * 1000:.1f} ms")
@@ -2,9 +2,27 @@
 # INCOME CALCULATION FUNCTIONS
 # =============================================================================
 import datetime
+import logging
 
-def calculate_take_home(income, province, working_days, hours_per_day, is_hourly=False, hours_per_week=None, dependents=0):
-    """Calculate take-home pay after taxes and deductions."""
+from damages_results import TakeHome
+
+logger = logging.getLogger(__name__)
+
+def calculate_take_home(income, province, working_days, hours_per_day, is_hourly=False, hours_per_week=None, dependents=0, exact=False):
+    """
+    Calculate take-home pay after taxes and deductions.
+
+    exact=True runs the Decimal version with every deduction rounded to the cent
+    (see exact_calculations); amounts are still returned as floats.
+
+    Returns:
+        damages_results.TakeHome (labelled_take_home gives the display-keyed dictionary)
+    """
+    if exact:
+        from exact_calculations import exact_take_home, as_floats
+        return as_floats(exact_take_home(income, province, working_days, hours_per_day,
+                                         is_hourly, hours_per_week, dependents))
+    
     # Import necessary functions from tax_calculations.py
     from tax_calculations import (
         calculate_federal_tax,
@@ -46,22 +64,23 @@ def calculate_take_home(income, province, working_days, hours_per_day, is_hourly
         weekly_net_pay = take_home_pay / 52
         monthly_net_pay = take_home_pay / 12
 
-    return {
-        "Gross Income": income,
-        "Federal Tax": round(federal_tax, 2),
-        f"{province.capitalize()} Tax": round(provincial_tax, 2),
-        "CPP Contribution": cpp_contribution,
-        "CPP2 Contribution": cpp2_contribution,
-        "EI Contribution": ei_contribution,
-        "Dependent Benefit": dependent_benefit,
-        "Total Deductions": round(total_deductions, 2),
-        "Net Pay (Provincially specific deductions for damages)": round(take_home_pay, 2),
-        "Daily Net Pay": round(daily_net_pay, 2),
-        "Hourly Net Pay": round(hourly_net_pay, 2),
-        "Weekly Net Pay": round(weekly_net_pay, 2),
-        "Monthly Net Pay": round(monthly_net_pay, 2),
-        "Working Days": working_days
-    }
+    return TakeHome(
+        province=province,
+        gross_income=income,
+        federal_tax=round(federal_tax, 2),
+        provincial_tax=round(provincial_tax, 2),
+        cpp_contribution=cpp_contribution,
+        cpp2_contribution=cpp2_contribution,
+        ei_contribution=ei_contribution,
+        dependent_benefit=dependent_benefit,
+        total_deductions=round(total_deductions, 2),
+        net_pay=round(take_home_pay, 2),
+        daily_net_pay=round(daily_net_pay, 2),
+        hourly_net_pay=round(hourly_net_pay, 2),
+        weekly_net_pay=round(weekly_net_pay, 2),
+        monthly_net_pay=round(monthly_net_pay, 2),
+        working_days=working_days
+    )
 
 def calculate_collateral_benefits(ei_benefits_to_date=0, section_b_to_date=0, ltd_benefits_to_date=0, 
                                  cppd_benefits_to_date=0, other_benefits_to_date=0,
@@ -139,7 +158,7 @@ def calculate_collateral_benefits(ei_benefits_to_date=0, section_b_to_date=0, lt
             
         except Exception as e:
             # If there's an error in date calculation, use the original annual amount
-            print(f"Error calculating EI limitation: {e}")
+            logger.warning(f"Error calculating EI limitation: {e}")
             adjusted_annual_ei = ei_benefits_annual
     
     # Calculate total annual future benefits with adjusted EI
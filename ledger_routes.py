@@ -0,0 +1,77 @@
+from flask import Blueprint, request, jsonify
+
+# Create a Blueprint for the past-loss accrual ledger API
+ledger_routes = Blueprint('ledger', __name__)
+
+@ledger_routes.route('/api/claims', methods=['POST'])
+def api_create_claim():
+    """Register a claim ledger. JSON body: claim_id, mode ('compound' or 'simple'), period ('month', 'quarter', 'half-year')"""
+    from accrual_ledger import get_ledger
+
+    data = request.get_json(silent=True) or {}
+    if not data.get('claim_id'):
+        return jsonify({'error': 'Claim ID is required'}), 400
+
+    try:
+        ledger = get_ledger()
+        ledger.create_claim(str(data['claim_id']), data.get('mode', 'compound'), data.get('period', 'month'))
+        return jsonify(ledger.get_claim(str(data['claim_id']))), 201
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@ledger_routes.route('/api/claims/<claim_id>/entries', methods=['POST'])
+def api_add_entries(claim_id):
+    """
+    Add entries to a claim ledger and snapshot its accrual to today.
+
+    JSON body:
+        entries: List of {date, kind ('loss', 'benefit', 'adjustment'), amount, description}, and/or
+        stream: {start_date, end_date, amount, kind} spread into monthly entries
+    """
+    from accrual_ledger import get_ledger
+
+    data = request.get_json(silent=True) or {}
+    try:
+        ledger = get_ledger()
+        added = ledger.add_entries(claim_id, [
+            (entry['date'], entry.get('kind', 'loss'), entry['amount'], entry.get('description'))
+            for entry in data.get('entries', [])
+        ])
+        stream = data.get('stream')
+        if stream:
+            added += ledger.add_loss_stream(
+                claim_id, stream['start_date'], stream['end_date'], float(stream['amount']),
+                kind=stream.get('kind', 'loss'), description=stream.get('description')
+            )
+        if added:
+            ledger.snapshot(claim_id)
+        return jsonify({'claim_id': claim_id, 'added': added})
+    except KeyError as e:
+        return jsonify({'error': f"Missing or unknown {e}"}), 400
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
+
+@ledger_routes.route('/api/claims/<claim_id>/accrual', methods=['GET'])
+def api_claim_accrual(claim_id):
+    """Principal and interest accrued on a claim to ?as_of=YYYY-MM-DD (default today). Read-only."""
+    from accrual_ledger import get_ledger
+
+    try:
+        return jsonify(get_ledger().accrue(claim_id, request.args.get('as_of')))
+    except KeyError as e:
+        return jsonify({'error': str(e)}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@ledger_routes.route('/api/claims/<claim_id>/snapshot', methods=['POST'])
+def api_snapshot_claim(claim_id):
+    """Accrue a claim to as_of (JSON body, default today) and save the result as a snapshot for later accruals."""
+    from accrual_ledger import get_ledger
+
+    data = request.get_json(silent=True) or {}
+    try:
+        return jsonify(get_ledger().snapshot(claim_id, data.get('as_of'))), 201
+    except KeyError as e:
+        return jsonify({'error': str(e)}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
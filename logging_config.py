@@ -0,0 +1,254 @@
+# =============================================================================
+# APPLICATION LOGGING
+# =============================================================================
+"""
+Non-blocking, rotated, structured logging for the web application.
+
+configure_logging() puts a single QueueHandler on the root logger. Request
+threads only format the message and put the record on an in-memory queue; a
+QueueListener thread per process writes it to the log file, so no request waits
+on disk I/O. When the queue is full (the disk has stalled) records are dropped
+and counted in actuclaim_log_records_dropped_total rather than blocking.
+
+Records are written as one JSON object per line (time, level, logger, message,
+any `extra=` fields such as the stage timings, and the traceback), or in the old
+plain-text format with ACTUCLAIM_LOG_FORMAT=text. The file is rotated by size;
+rotation is coordinated through a lock file so all gunicorn workers can share
+one log.
+
+Environment:
+    ACTUCLAIM_LOG_FILE      log file (default /var/www/actuclaim/tax_debug.log)
+    ACTUCLAIM_LOG_LEVEL     root level (default INFO)
+    ACTUCLAIM_LOG_LEVELS    per-module levels, e.g. "word_generation=DEBUG,tbill_utils=WARNING"
+    ACTUCLAIM_LOG_FORMAT    json (default) or text
+    ACTUCLAIM_LOG_MAX_BYTES / ACTUCLAIM_LOG_BACKUPS   rotation size and number of old files kept
+
+Debug calls on the calculation paths pass their values as arguments
+(logger.debug("Salary: %s", salary)) or sit behind logger.isEnabledFor(), so
+nothing is formatted when DEBUG is off.
+"""
+import atexit
+import copy
+import datetime
+import fcntl
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+
+from metrics import LOG_RECORDS_DROPPED
+
+LOG_FILE = os.environ.get('ACTUCLAIM_LOG_FILE', '/var/www/actuclaim/tax_debug.log')
+LOG_LEVEL = os.environ.get('ACTUCLAIM_LOG_LEVEL', 'INFO')
+LOG_LEVELS = os.environ.get('ACTUCLAIM_LOG_LEVELS', '')
+LOG_FORMAT = os.environ.get('ACTUCLAIM_LOG_FORMAT', 'json')
+LOG_MAX_BYTES = int(os.environ.get('ACTUCLAIM_LOG_MAX_BYTES', 20 * 1024 * 1024))
+LOG_BACKUPS = int(os.environ.get('ACTUCLAIM_LOG_BACKUPS', 5))
+QUEUE_SIZE = 10000
+
+# Chatty third-party loggers, unless ACTUCLAIM_LOG_LEVELS says otherwise
+DEFAULT_MODULE_LEVELS = {
+    'werkzeug': 'WARNING',
+    'urllib3': 'WARNING',
+    'matplotlib': 'WARNING',
+    'PIL': 'WARNING',
+}
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# LogRecord attributes; anything else on a record came from extra= and is written as a field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'taskName'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with extra= fields kept as structured values."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'pid': record.process,
+        }
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRIBUTES and not name.startswith('_'):
+                entry[name] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never waits: the record's message and traceback are
+    rendered to text in the calling thread, and a full queue drops the record.
+    """
+
+    def prepare(self, record):
+        # Keep the record's fields for the JSON formatter; only make it safe to hand to another thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.message = record.msg
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+class SharedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Size-rotated log file written by several processes.
+
+    Rotation happens under an exclusive lock on <log>.lock and only if the file
+    on disk is still over the limit; a process whose open file has been rotated
+    away by another process reopens the current file before writing.
+    """
+
+    def _open(self):
+        stream = super()._open()
+        stat = os.fstat(stream.fileno())
+        self._identity = (stat.st_dev, stat.st_ino)
+        return stream
+
+    def _rotated_elsewhere(self):
+        try:
+            stat = os.stat(self.baseFilename)
+        except FileNotFoundError:
+            return True
+        return (stat.st_dev, stat.st_ino) != self._identity
+
+    def format(self, record):
+        # shouldRollover() and the write both format the record; do it once
+        formatted = record.__dict__.get('_formatted')
+        if formatted is None:
+            formatted = record._formatted = super().format(record)
+        return formatted
+
+    def emit(self, record):
+        if self.stream is not None and self._rotated_elsewhere():
+            self.stream.close()
+            self.stream = self._open()
+        super().emit(record)
+
+    def doRollover(self):
+        with open(self.baseFilename + '.lock', 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if self._rotated_elsewhere():
+                self.stream.close()
+                self.stream = self._open()
+                return
+            super().doRollover()
+
+
+class _LogPipeline:
+    """The per-process queue and listener thread, rebuilt in a forked child."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.handler = None
+        self.output_handlers = ()
+        self.listener = None
+
+    def start(self, output_handlers):
+        self.stop()
+        self.output_handlers = tuple(output_handlers)
+        self.handler = NonBlockingQueueHandler(queue.Queue(QUEUE_SIZE))
+        self._start_listener()
+
+    def _start_listener(self):
+        self.listener = logging.handlers.QueueListener(self.handler.queue, *self.output_handlers)
+        self.listener.start()
+
+    def stop(self):
+        """Flush queued records to the file and stop the listener thread."""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def after_fork(self):
+        # The listener thread did not survive the fork, and the queue's lock may have been
+        # held by it; give the child a fresh queue and its own listener
+        self.lock = threading.Lock()
+        if self.handler is None:
+            return
+        self.handler.queue = queue.Queue(QUEUE_SIZE)
+        self._start_listener()
+
+
+_pipeline = _LogPipeline()
+os.register_at_fork(after_in_child=_pipeline.after_fork)
+
+
+def parse_module_levels(spec):
+    """'word_generation=DEBUG, tbill_utils=warning' -> {'word_generation': 'DEBUG', 'tbill_utils': 'WARNING'}"""
+    levels = {}
+    for item in spec.split(','):
+        if not item.strip():
+            continue
+        name, _, level = item.partition('=')
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def _output_handler(log_file, log_format, max_bytes, backups):
+    formatter = JsonFormatter() if log_format == 'json' else logging.Formatter(TEXT_FORMAT)
+    try:
+        handler = SharedRotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backups)
+    except OSError as e:
+        # Development machines usually have no /var/www/actuclaim; log to stderr instead
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(formatter)
+        handler.handle(logging.makeLogRecord({
+            'name': __name__, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+            'msg': f"Cannot open log file {log_file} ({e}); logging to stderr"
+        }))
+        return handler
+    handler.setFormatter(formatter)
+    return handler
+
+
+def configure_logging(log_file=LOG_FILE, level=LOG_LEVEL, module_levels=None, log_format=LOG_FORMAT,
+                      max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS):
+    """
+    Route all logging through the background writer. Safe to call more than once;
+    the last call wins.
+
+    Args:
+        module_levels: {logger name: level}; defaults to DEFAULT_MODULE_LEVELS
+            updated with ACTUCLAIM_LOG_LEVELS
+    """
+    if module_levels is None:
+        module_levels = {**DEFAULT_MODULE_LEVELS, **parse_module_levels(LOG_LEVELS)}
+
+    with _pipeline.lock:
+        _pipeline.start([_output_handler(log_file, log_format, max_bytes, backups)])
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(_pipeline.handler)
+        root.setLevel(level.upper() if isinstance(level, str) else level)
+        for name, module_level in module_levels.items():
+            logging.getLogger(name).setLevel(module_level)
+    return _pipeline.handler
+
+
+def shutdown_logging():
+    """Write out everything still queued; runs automatically at interpreter exit."""
+    with _pipeline.lock:
+        _pipeline.stop()
+
+
+atexit.register(shutdown_logging)
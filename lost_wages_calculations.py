@@ -1,12 +1,25 @@
-from datetime import datetime
+from datetime import datetime, date
+import logging
 from tbill_utils import get_average_tbill_rate
 
-def calculate_past_lost_wages_with_interest(net_past_lost_wages, loss_date, pji_rate=None):
-    """Calculate past lost wages with interest, using provided rate or fetching T-Bill rates."""
+logger = logging.getLogger(__name__)
+
+def calculate_past_lost_wages_with_interest(net_past_lost_wages, loss_date, pji_rate=None,
+                                            method='average', period='month', loss_end_date=None,
+                                            exact=False):
+    """
+    Calculate past lost wages with interest, using provided rate or fetching T-Bill rates.
+
+    With method='rate_path' (and no provided rate) interest compounds at the T-Bill
+    rate in force each period instead of one averaged rate; loss_end_date spreads
+    the loss monthly from loss_date to that date. exact=True computes the averaged-rate
+    interest in Decimal (see exact_calculations).
+    """
     # Get current date
     current_date = datetime.now()
     
-    print(f"calculate_past_lost_wages_with_interest called with: net_past_lost_wages={net_past_lost_wages}, loss_date={loss_date}, pji_rate={pji_rate}")
+    logger.debug("calculate_past_lost_wages_with_interest called with: net_past_lost_wages=%s, loss_date=%s, pji_rate=%s",
+                 net_past_lost_wages, loss_date, pji_rate)
 
     # Calculate years between loss date and current date
     loss_date_obj = datetime.strptime(loss_date, '%Y-%m-%d')
@@ -17,17 +30,17 @@ def calculate_past_lost_wages_with_interest(net_past_lost_wages, loss_date, pji_
         try:
             # Convert string to float if necessary
             if isinstance(pji_rate, str):
-                print(f"Converting string PJI rate '{pji_rate}' to float")
+                logger.debug("Converting string PJI rate %r to float", pji_rate)
                 pji_rate = float(pji_rate)
-            print(f"Using provided PJI rate: {pji_rate}%")
             pji_decimal = pji_rate / 100  # Convert percentage to decimal
         except (ValueError, TypeError) as e:
-            print(f"Error converting PJI rate '{pji_rate}': {e}")
+            logger.warning(f"Error converting PJI rate '{pji_rate}': {e}")
             pji_rate = None  # Fall back to calculating from T-Bill rates
     
     # If we need to calculate the rate
+    rate_from_tbills = pji_rate is None
     if pji_rate is None:
-        print("No valid PJI rate provided, calculating from T-Bill rates")
+        logger.debug("No valid PJI rate provided, calculating from T-Bill rates")
         # Get average T-Bill rate for the period
         avg_tbill_rate = get_average_tbill_rate(loss_date, current_date.strftime('%Y-%m-%d'))
         
@@ -35,18 +48,34 @@ def calculate_past_lost_wages_with_interest(net_past_lost_wages, loss_date, pji_
         if avg_tbill_rate is None:
             pji_decimal = 0.025  # Default to 2.5%
             pji_rate = 2.5
-            print(f"Using default PJI rate: {pji_rate}%")
+            logger.warning(f"No T-Bill average available, using default PJI rate: {pji_rate}%")
         else:
             pji_decimal = avg_tbill_rate / 100  # Convert percentage to decimal
             pji_rate = avg_tbill_rate
-            print(f"Using calculated T-Bill rate: {pji_rate}%")
+            logger.debug("Using calculated T-Bill rate: %s%%", pji_rate)
     else:
         # We already have a valid pji_rate in percentage form
         pji_decimal = pji_rate / 100
-        print(f"Using provided PJI rate: {pji_rate}% ({pji_decimal} decimal)")
+        logger.debug("Using provided PJI rate: %s%% (%s decimal)", pji_rate, pji_decimal)
+
+    if method == 'rate_path' and rate_from_tbills:
+        from pji_engine import calculate_rate_path_interest
 
-    # Calculate past loss with interest: Past Loss × (1 + Interest Rate)^Years Between
-    past_loss_with_interest = net_past_lost_wages * (1 + pji_decimal) ** years_between
+        accrual = calculate_rate_path_interest(
+            net_past_lost_wages, loss_date, current_date, mode='compound', period=period,
+            loss_end_date=loss_end_date
+        )
+        past_loss_with_interest = accrual['total_amount']
+        pji_rate = round(accrual['effective_rate'], 2)
+    elif exact:
+        from exact_calculations import exact_compound_interest
+
+        past_loss_with_interest = float(exact_compound_interest(
+            net_past_lost_wages, pji_rate, (current_date - loss_date_obj).days
+        ))
+    else:
+        # Calculate past loss with interest: Past Loss × (1 + Interest Rate)^Years Between
+        past_loss_with_interest = net_past_lost_wages * (1 + pji_decimal) ** years_between
     
     # Prepare calculation details
     calculation_details = {
@@ -62,17 +91,20 @@ def calculate_past_lost_wages_with_interest(net_past_lost_wages, loss_date, pji_
     # After creating the calculation_details dictionary, add:
     calculation_details["Original Past Lost Wages"] = net_past_lost_wages
     
-    print(f"Returning calculation_details with PJI Rate: {calculation_details['PJI Rate']}")
+    logger.debug("Returning calculation_details with PJI Rate: %s", calculation_details['PJI Rate'])
     return round(past_loss_with_interest, 2), calculation_details
 
-def calculate_future_lost_wages_annuity(annual_lost_wages, time_horizon, discount_rate):
-    """Calculate future lost wages as an annuity."""
+def calculate_future_lost_wages_annuity(annual_lost_wages, time_horizon, discount_rate, exact=False):
+    """Calculate future lost wages as an annuity (in Decimal to the exact cent if exact=True)."""
     # Calculate total months for the time horizon
     total_months = int(time_horizon * 12)
     
     # Calculate present value using annuity formula
     # PV = PMT × (1 - (1 + r)^-n) / r
-    if discount_rate == 0:
+    if exact:
+        from exact_calculations import exact_annuity_present_value
+        present_value = float(exact_annuity_present_value(annual_lost_wages, time_horizon, discount_rate))
+    elif discount_rate == 0:
         present_value = annual_lost_wages * time_horizon
     else:
         r = discount_rate
@@ -88,4 +120,12 @@ def calculate_future_lost_wages_annuity(annual_lost_wages, time_horizon, discoun
         "Present Value": present_value
     }
     
-    return round(present_value, 2), total_months    
+    return round(present_value, 2), total_months
+
+def time_horizon_to_retirement(birthdate, retirement_age, start_date):
+    """Years from start_date to the claimant's retirement date (0 if already past it)."""
+    retirement_date = date(birthdate.year + retirement_age, birthdate.month,
+                           min(birthdate.day, 28))  # Avoid issues with month lengths
+    if retirement_date <= start_date:
+        return 0
+    return (retirement_date - start_date).days / 365.25
@@ -4,8 +4,6 @@
 import os
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # MailGun API Config
@@ -59,4 +57,6 @@ def test_mailgun_connection():
 
 # Run test when this file is executed directly
 if __name__ == "__main__":
+    # Logging for the standalone run; the web app configures it in logging_config
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
     test_mailgun_connection()
@@ -0,0 +1,360 @@
+# =============================================================================
+# MULTIPROCESS METRICS (PROMETHEUS TEXT FORMAT)
+# =============================================================================
+"""
+Counters, gauges and histograms shared across gunicorn workers.
+
+Each process writes its samples into its own memory-mapped file in
+METRICS_DIR (values_<pid>.db), so recording a sample is an in-memory write
+with no system call. /metrics reads every process's file and adds them up:
+counters and histograms include processes that have exited (their counts
+still happened); gauges only include live processes.
+
+A process forked from one that already recorded samples (the gunicorn master
+after warm-up) starts from zero, so nothing is counted twice.
+"""
+import glob
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+
+METRICS_DIR = os.environ.get(
+    'ACTUCLAIM_METRICS_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'metrics')
+)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_HEADER = struct.Struct('<Q')
+_LENGTH = struct.Struct('<I')
+_VALUE = struct.Struct('<d')
+_INITIAL_SIZE = 64 * 1024
+
+
+class _ValueFile:
+    """
+    Append-only key -> float64 map in a memory-mapped file.
+
+    Layout: an 8-byte count of used bytes, then entries of a 4-byte key length,
+    the UTF-8 key padded to 8 bytes, and the 8-byte value. A new entry is written
+    before the used-bytes count moves past it, so readers never see half an entry.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'w+b')
+        self._file.truncate(_INITIAL_SIZE)
+        self._map = mmap.mmap(self._file.fileno(), _INITIAL_SIZE)
+        self._used = _HEADER.size
+        _HEADER.pack_into(self._map, 0, self._used)
+        self._positions = {}
+
+    def _append(self, key):
+        encoded = key.encode('utf-8')
+        padded = len(encoded) + (-(_LENGTH.size + len(encoded)) % 8)
+        size = _LENGTH.size + padded + _VALUE.size
+        if self._used + size > len(self._map):
+            new_size = max(len(self._map) * 2, self._used + size)
+            self._map.close()
+            self._file.truncate(new_size)
+            self._map = mmap.mmap(self._file.fileno(), new_size)
+
+        start = self._used
+        _LENGTH.pack_into(self._map, start, len(encoded))
+        self._map[start + _LENGTH.size:start + _LENGTH.size + len(encoded)] = encoded
+        position = start + _LENGTH.size + padded
+        _VALUE.pack_into(self._map, position, 0.0)
+        self._used += size
+        _HEADER.pack_into(self._map, 0, self._used)
+        self._positions[key] = position
+        return position
+
+    def add(self, key, amount):
+        position = self._positions.get(key)
+        if position is None:
+            position = self._append(key)
+        _VALUE.pack_into(self._map, position, _VALUE.unpack_from(self._map, position)[0] + amount)
+
+    def set(self, key, value):
+        position = self._positions.get(key)
+        if position is None:
+            position = self._append(key)
+        _VALUE.pack_into(self._map, position, value)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def read_values(path):
+    """All (key, value) pairs in a process's values file."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < _HEADER.size:
+        return []
+    used = min(_HEADER.unpack_from(data, 0)[0], len(data))
+    values = []
+    position = _HEADER.size
+    while position + _LENGTH.size <= used:
+        length = _LENGTH.unpack_from(data, position)[0]
+        key_start = position + _LENGTH.size
+        value_position = key_start + length + (-(_LENGTH.size + length) % 8)
+        if value_position + _VALUE.size > used:
+            break
+        values.append((data[key_start:key_start + length].decode('utf-8'), _VALUE.unpack_from(data, value_position)[0]))
+        position = value_position + _VALUE.size
+    return values
+
+
+class _ProcessValues:
+    """The current process's values file, reopened after a fork."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._file = None
+
+    def _values_file(self):
+        pid = os.getpid()
+        if self._pid != pid:
+            os.makedirs(METRICS_DIR, exist_ok=True)
+            # A fork inherits the parent's mapping; start a fresh file for this pid
+            self._file = _ValueFile(os.path.join(METRICS_DIR, f'values_{pid}.db'))
+            self._pid = pid
+        return self._file
+
+    def add(self, key, amount):
+        with self._lock:
+            self._values_file().add(key, amount)
+
+    def set(self, key, value):
+        with self._lock:
+            self._values_file().set(key, value)
+
+
+_process_values = _ProcessValues()
+_registry = []
+
+
+def _sample_key(sample_name, labels):
+    return json.dumps([sample_name, labels], sort_keys=True, separators=(',', ':'))
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._keys = {}
+        _registry.append(self)
+
+    def _key(self, sample_name, labels):
+        """Encoded sample key, cached per label set."""
+        cache_key = (sample_name, tuple(sorted(labels.items())))
+        key = self._keys.get(cache_key)
+        if key is None:
+            names = set(labels) - {'le'}
+            if names != set(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(sorted(names))}")
+            key = _sample_key(sample_name, {name: str(value) for name, value in labels.items()})
+            self._keys[cache_key] = key
+        return key
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        _process_values.add(self._key(f'{self.name}_total', labels), amount)
+
+
+class Gauge(_Metric):
+    """Gauge summed over live processes (e.g. work in progress in each worker)."""
+    kind = 'gauge'
+
+    def inc(self, amount=1, **labels):
+        _process_values.add(self._key(self.name, labels), amount)
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        _process_values.set(self._key(self.name, labels), value)
+
+    @contextmanager
+    def track_in_progress(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._bucket_labels = tuple(repr(bound) for bound in self.buckets)
+
+    def observe(self, value, **labels):
+        for bound, le in zip(self.buckets, self._bucket_labels):
+            if value <= bound:
+                _process_values.add(self._key(f'{self.name}_bucket', dict(labels, le=le)), 1)
+                break
+        _process_values.add(self._key(f'{self.name}_count', labels), 1)
+        _process_values.add(self._key(f'{self.name}_sum', labels), value)
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a with-block, or of every call when used as a decorator."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+
+# -----------------------------------------------------------------------------
+# ActuClaim metrics
+# -----------------------------------------------------------------------------
+REQUEST_LATENCY = Histogram(
+    'actuclaim_request_duration_seconds', 'Request latency by route', ('method', 'route', 'status')
+)
+CALCULATIONS = Counter(
+    'actuclaim_calculations', 'Completed damages calculations by province', ('province',)
+)
+CACHE_LOOKUPS = Counter(
+    'actuclaim_cache_lookups', 'Rate, table and result cache lookups; result is hit, reload (rebuilt) or miss', ('cache', 'result')
+)
+REPORT_RENDER = Histogram(
+    'actuclaim_report_render_seconds', 'Report rendering time by format', ('format',),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+EMAILS_IN_PROGRESS = Gauge(
+    'actuclaim_email_queue_depth', 'Result emails being composed or sent'
+)
+EMAILS_SENT = Counter(
+    'actuclaim_emails', 'Result emails by outcome (sent or failed)', ('outcome',)
+)
+REPORT_JOBS = Counter(
+    'actuclaim_report_jobs', 'Background report jobs by format and outcome (done or failed)', ('format', 'outcome')
+)
+LOG_RECORDS_DROPPED = Counter(
+    'actuclaim_log_records_dropped', 'Log records dropped because the log writer queue was full'
+)
+
+
+def _is_alive(pid):
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def collect():
+    """Sum every process's samples: {sample key: value}."""
+    gauge_names = {metric.name for metric in _registry if metric.kind == 'gauge'}
+    totals = {}
+    for path in glob.glob(os.path.join(METRICS_DIR, 'values_*.db')):
+        try:
+            pid = int(os.path.basename(path)[len('values_'):-len('.db')])
+        except ValueError:
+            continue
+        alive = _is_alive(pid)
+        try:
+            values = read_values(path)
+        except OSError:
+            continue
+        for key, value in values:
+            if not alive and json.loads(key)[0] in gauge_names:
+                continue
+            totals[key] = totals.get(key, 0.0) + value
+    return totals
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_sample(sample_name, labels, value):
+    if labels:
+        label_text = ','.join(f'{name}="{_escape(labels[name])}"' for name in labels)
+        sample_name = f'{sample_name}{{{label_text}}}'
+    return f'{sample_name} {int(value)}' if value == int(value) else f'{sample_name} {value!r}'
+
+
+def render(extra_gauges=None):
+    """
+    Text exposition of all metrics, aggregated across processes.
+
+    Args:
+        extra_gauges: [(name, documentation, value)] computed at scrape time
+    """
+    samples = {}
+    for key, value in collect().items():
+        sample_name, labels = json.loads(key)
+        samples.setdefault(sample_name, []).append((labels, value))
+
+    lines = []
+    for metric in _registry:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        if metric.kind == 'histogram':
+            lines.extend(_histogram_lines(metric, samples))
+            continue
+        sample_name = f'{metric.name}_total' if metric.kind == 'counter' else metric.name
+        for labels, value in sorted(samples.get(sample_name, []), key=lambda item: sorted(item[0].items())):
+            lines.append(_format_sample(sample_name, labels, value))
+
+    for name, documentation, value in extra_gauges or ():
+        lines.append(f'# HELP {name} {documentation}')
+        lines.append(f'# TYPE {name} gauge')
+        lines.append(_format_sample(name, {}, value))
+    return '\n'.join(lines) + '\n'
+
+
+def _histogram_lines(metric, samples):
+    """Cumulative buckets, +Inf, sum and count for each label set."""
+    series = {}
+    for labels, value in samples.get(f'{metric.name}_count', []):
+        series.setdefault(json.dumps(labels, sort_keys=True), {'labels': labels, 'buckets': {}})['count'] = value
+    for labels, value in samples.get(f'{metric.name}_sum', []):
+        series.setdefault(json.dumps(labels, sort_keys=True), {'labels': labels, 'buckets': {}})['sum'] = value
+    for labels, value in samples.get(f'{metric.name}_bucket', []):
+        labels = dict(labels)
+        bound = float(labels.pop('le'))
+        series.setdefault(json.dumps(labels, sort_keys=True), {'labels': labels, 'buckets': {}})['buckets'][bound] = value
+
+    lines = []
+    for _, entry in sorted(series.items()):
+        labels = entry['labels']
+        cumulative = 0.0
+        for bound in metric.buckets:
+            cumulative += entry['buckets'].get(bound, 0.0)
+            lines.append(_format_sample(f'{metric.name}_bucket', dict(labels, le=repr(bound)), cumulative))
+        lines.append(_format_sample(f'{metric.name}_bucket', dict(labels, le='+Inf'), entry.get('count', 0.0)))
+        lines.append(_format_sample(f'{metric.name}_sum', labels, entry.get('sum', 0.0)))
+        lines.append(_format_sample(f'{metric.name}_count', labels, entry.get('count', 0.0)))
+    return lines
+
+
+def clear_metrics_dir():
+    """Remove values files left by a previous server run (call once, before workers start)."""
+    for path in glob.glob(os.path.join(METRICS_DIR, 'values_*.db')):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
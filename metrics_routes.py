@@ -0,0 +1,41 @@
+from flask import Blueprint, Response, g, request
+import datetime
+import time
+
+from metrics import REQUEST_LATENCY, render
+
+# Create a Blueprint for the metrics endpoint and per-request latency recording
+metrics_routes = Blueprint('metrics', __name__)
+
+@metrics_routes.before_app_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@metrics_routes.after_app_request
+def record_request_latency(response):
+    start = g.pop('request_start', None)
+    if start is not None:
+        # Label by route pattern, not URL, so /api/claims/<claim_id>/accrual is one series
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        REQUEST_LATENCY.observe(time.perf_counter() - start,
+                                method=request.method, route=route, status=response.status_code)
+    return response
+
+def tbill_rate_age():
+    """Days since the newest stored T-Bill rate, or None if the store is empty."""
+    from tbill_utils import get_store
+
+    bounds = get_store().bounds()
+    if bounds is None:
+        return None
+    latest_date = datetime.date.fromisoformat(str(bounds[1][0])[:10])
+    return (datetime.date.today() - latest_date).days
+
+@metrics_routes.route('/metrics', methods=['GET'])
+def metrics():
+    """All workers' metrics in the Prometheus text exposition format."""
+    extra_gauges = []
+    age = tbill_rate_age()
+    if age is not None:
+        extra_gauges.append(('actuclaim_tbill_latest_rate_age_days', 'Days since the newest stored T-Bill rate', age))
+    return Response(render(extra_gauges), mimetype='text/plain; version=0.0.4; charset=utf-8')
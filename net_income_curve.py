@@ -0,0 +1,180 @@
+# =============================================================================
+# PRECOMPUTED NET-INCOME CURVES
+# =============================================================================
+"""
+Net income as a precompiled piecewise-linear curve of gross income.
+
+For a given province, dependent count and tax year, net pay changes slope only
+at a fixed set of gross incomes: the federal and provincial bracket thresholds
+(shifted by the dependent benefit), the CPP exemption and the CPP, CPP2 and EI
+maximum earnings. The curve stores those kinks with the net income and
+marginal deduction rate at each, so evaluating any income is a searchsorted
+and one multiply-add instead of a loop over brackets.
+
+Values are those of the unrounded line; calculate_take_home rounds each
+contribution to the cent, so its net pay can differ from the curve by a cent
+or two (net_to_gross settles that difference).
+"""
+import bisect
+from functools import lru_cache
+
+import numpy as np
+
+from tax_calculations import (
+    FEDERAL_BRACKETS, PROVINCIAL_BRACKETS,
+    CPP_RATE, CPP_MAX_EARNINGS, CPP_EXEMPTION, CPP2_RATE, CPP2_MAX_EARNINGS,
+    EI_RATE, EI_MAX_EARNINGS,
+    calculate_dependent_benefit
+)
+
+
+class NetIncomeCurve:
+    """
+    Kinks of the net income line for one (province, dependents, year).
+
+    Segment k runs from kinks[k] to kinks[k + 1] (the last is open-ended) and
+    net income rises by 1 - marginal_rates[k] for each dollar of gross income in it.
+    """
+
+    def __init__(self, kinks, marginal_rates, province, dependents=0, year=None):
+        self.province = province
+        self.dependents = dependents
+        self.year = year
+        self.kinks = np.asarray(kinks, dtype=float)
+        self.marginal_rates = np.asarray(marginal_rates, dtype=float)
+        self.slopes = 1.0 - self.marginal_rates
+        self.nets = np.concatenate(([0.0], np.cumsum(self.slopes[:-1] * np.diff(self.kinks))))
+        # Plain tuples for single-value lookups, where NumPy call overhead dominates
+        self._kink_list = tuple(self.kinks.tolist())
+        self._net_list = tuple(self.nets.tolist())
+        self._slope_list = tuple(self.slopes.tolist())
+
+    def _segments(self, values, breakpoints):
+        return np.maximum(np.searchsorted(breakpoints, values, side='right') - 1, 0)
+
+    def net(self, incomes):
+        """Net income for each gross income."""
+        incomes = np.asarray(incomes, dtype=float)
+        k = self._segments(incomes, self.kinks)
+        return self.nets[k] + self.slopes[k] * (incomes - self.kinks[k])
+
+    def marginal_rate(self, incomes):
+        """Combined deduction rate on the next dollar of each gross income."""
+        return self.marginal_rates[self._segments(np.asarray(incomes, dtype=float), self.kinks)]
+
+    def gross(self, nets):
+        """Gross income on the line for each net income (the inverse of net)."""
+        nets = np.asarray(nets, dtype=float)
+        k = self._segments(nets, self.nets)
+        return self.kinks[k] + (nets - self.nets[k]) / self.slopes[k]
+
+    def solve_net(self, net):
+        """gross for a single net income, returned with the slope of its segment."""
+        k = max(bisect.bisect_right(self._net_list, net) - 1, 0)
+        slope = self._slope_list[k]
+        return self._kink_list[k] + (net - self._net_list[k]) / slope, slope
+
+    def rows(self, income=None):
+        """
+        One row per segment for marginal-rate tables and charts.
+
+        Adjacent segments with the same rate are merged. `current` marks the
+        segment holding `income`.
+        """
+        rows = []
+        for k, rate in enumerate(self._slope_list):
+            rate = round(1.0 - rate, 6)
+            upper = self._kink_list[k + 1] if k + 1 < len(self._kink_list) else None
+            if rows and rows[-1]["marginal_rate"] == rate:
+                rows[-1]["upper"] = upper
+                continue
+            rows.append({
+                "lower": self._kink_list[k],
+                "upper": upper,
+                "marginal_rate": rate,
+                "net_at_lower": round(self._net_list[k], 2)
+            })
+        for row in rows:
+            row["current"] = income is not None and row["lower"] <= income and (row["upper"] is None or income < row["upper"])
+        return rows
+
+
+def _rate_at(brackets, taxable_income):
+    """Rate of the (threshold, rate) bracket containing taxable_income."""
+    k = bisect.bisect_right([threshold for threshold, _ in brackets], taxable_income) - 1
+    return brackets[k][1] if k >= 0 else 0.0
+
+
+def build_curve(province, dependents=0, federal=None, provincial=None, contribution_limits=None, year=None):
+    """
+    Compile the net income curve.
+
+    Args:
+        province: Province name as used by calculate_take_home
+        dependents: Number of dependents under 18
+        federal, provincial: (threshold, rate) brackets (default: those used by calculate_take_home)
+        contribution_limits: (CPP exemption, CPP maximum, CPP2 maximum, EI maximum) earnings
+        year: Tax year the brackets belong to, for labelling
+    """
+    province_key = province.lower()
+    if province_key not in PROVINCIAL_BRACKETS:
+        raise ValueError(f"Unknown province: {province}")
+    if federal is None:
+        federal = [(lower, rate) for lower, _, rate in FEDERAL_BRACKETS]
+    if provincial is None:
+        provincial = [(lower, rate) for lower, _, rate in PROVINCIAL_BRACKETS[province_key]]
+    exemption, cpp_max, cpp2_max, ei_max = contribution_limits or (
+        CPP_EXEMPTION, CPP_MAX_EARNINGS, CPP2_MAX_EARNINGS, EI_MAX_EARNINGS
+    )
+    dependent_benefit = calculate_dependent_benefit(dependents)
+
+    kinks = {0.0, float(exemption), float(cpp_max), float(cpp2_max), float(ei_max)}
+    kinks.update(float(threshold + dependent_benefit) for threshold, _ in federal + provincial)
+    kinks = sorted(kinks)
+
+    marginal_rates = []
+    for low, high in zip(kinks, kinks[1:] + [kinks[-1] + 2.0]):
+        income = (low + high) / 2
+        rate = 0.0
+        if province_key != "prince edward island":
+            taxable_income = income - dependent_benefit
+            if taxable_income > 0:
+                rate += _rate_at(federal, taxable_income) + _rate_at(provincial, taxable_income)
+            if province_key != "new brunswick":
+                if exemption < income < cpp_max:
+                    rate += CPP_RATE
+                elif cpp_max < income < cpp2_max:
+                    rate += CPP2_RATE
+                if income < ei_max:
+                    rate += EI_RATE
+        marginal_rates.append(rate)
+
+    return NetIncomeCurve(kinks, marginal_rates, province_key, int(dependents), year)
+
+
+@lru_cache(maxsize=128)
+def _cached_curve(province_key, dependents, year):
+    if year is None:
+        return build_curve(province_key, dependents)
+
+    from tax_tables import get_tax_tables, PROVINCE_CODES
+    if province_key not in PROVINCE_CODES:
+        raise ValueError(f"Unknown province: {province_key}")
+    tables = get_tax_tables()
+    return build_curve(
+        province_key, dependents,
+        federal=tables.brackets(year, 'Federal'),
+        provincial=tables.brackets(year, PROVINCE_CODES[province_key]),
+        contribution_limits=tables.contribution_limits(year),
+        year=year
+    )
+
+
+def get_net_income_curve(province, dependents=0, year=None):
+    """
+    Shared curve for a province, dependent count and tax year.
+
+    year=None gives the brackets calculate_take_home uses; a calendar year uses
+    that year's tables from tax_tables (indexed beyond the last published year).
+    """
+    return _cached_curve(province.lower(), int(dependents), None if year is None else int(year))
@@ -0,0 +1,142 @@
+# =============================================================================
+# NET-TO-GROSS INCOME RECONSTRUCTION
+# =============================================================================
+"""
+Gross income that produces a given net pay under calculate_take_home.
+
+Net pay is piecewise linear in gross income (see net_income_curve). The
+solver locates the segment of the precompiled curve containing the target net
+pay and solves the line directly, then steps the gross to the cent with Newton
+iterations, kept inside a bracket, to absorb the cent rounding of
+contributions in calculate_take_home.
+"""
+import numpy as np
+
+from net_income_curve import get_net_income_curve
+from tax_calculations import (
+    FEDERAL_BRACKETS, PROVINCIAL_BRACKETS,
+    CPP_RATE, CPP_MAX_EARNINGS, CPP_EXEMPTION, CPP2_RATE, CPP2_MAX_EARNINGS,
+    EI_RATE, EI_MAX_EARNINGS,
+    calculate_dependent_benefit, calculate_federal_tax, calculate_provincial_tax,
+    calculate_cpp_contributions, calculate_ei_contribution
+)
+
+MAX_ITERATIONS = 8
+CENT = 0.01
+
+
+def net_pay(income, province, dependents=0):
+    """Annual net pay exactly as calculate_take_home reports it, without the pay-period breakdown."""
+    province_key = province.lower()
+    if province_key == "prince edward island":
+        return round(income, 2)
+
+    total_deductions = calculate_federal_tax(income, dependents) + calculate_provincial_tax(income, province, dependents)
+    if province_key != "new brunswick":
+        cpp_contribution, cpp2_contribution = calculate_cpp_contributions(income)
+        total_deductions += cpp_contribution + cpp2_contribution + calculate_ei_contribution(income)
+    return round(income - total_deductions, 2)
+
+
+def _settle(target, gross, slope, province, dependents):
+    """
+    Newton steps in whole cents until net_pay(gross) rounds to target.
+
+    Steps never leave the interval between the last gross found too low and the
+    last found too high; if no cent in it hits the target exactly, the closest is kept.
+    """
+    low = high = None
+    best_gross, best_error = gross, None
+    for _ in range(MAX_ITERATIONS):
+        error = target - net_pay(gross, province, dependents)
+        if best_error is None or abs(error) < abs(best_error):
+            best_gross, best_error = gross, error
+        if abs(error) < CENT / 2:
+            return gross
+        if error > 0:
+            low = gross
+        else:
+            high = gross
+
+        step = round(error / slope, 2) or (CENT if error > 0 else -CENT)
+        candidate = round(gross + step, 2)
+        if (low is not None and candidate <= low) or (high is not None and candidate >= high):
+            if low is None or high is None or high - low < 1.5 * CENT:
+                break
+            candidate = round((low + high) / 2, 2)
+        gross = candidate
+    return best_gross
+
+
+def gross_from_net(target_net, province, dependents=0):
+    """
+    Gross annual income, to the cent, whose calculate_take_home net pay is target_net.
+
+    Args:
+        target_net: Annual net pay (TakeHome.net_pay)
+        province: Province name as used by calculate_take_home
+        dependents: Number of dependents under 18
+
+    Returns:
+        Gross annual income rounded to the cent
+    """
+    if target_net < 0:
+        raise ValueError("Net pay cannot be negative")
+    gross, slope = get_net_income_curve(province, dependents).solve_net(target_net)
+    return _settle(round(target_net, 2), round(gross, 2), slope, province, dependents)
+
+
+def net_pay_array(incomes, province, dependents=0):
+    """Vectorized net_pay: the same bracket loop and cent rounding applied to an array of incomes."""
+    incomes = np.asarray(incomes, dtype=float)
+    province_key = province.lower()
+    if province_key == "prince edward island":
+        return np.round(incomes, 2)
+
+    taxable = np.maximum(incomes - calculate_dependent_benefit(dependents), 0)
+    total_deductions = np.zeros_like(incomes)
+    for brackets in (FEDERAL_BRACKETS, PROVINCIAL_BRACKETS[province_key]):
+        tax = np.zeros_like(incomes)
+        for lower, upper, rate in brackets:
+            tax += np.maximum(np.minimum(taxable, upper) - lower, 0) * rate
+        total_deductions += tax
+
+    if province_key != "new brunswick":
+        cpp = np.where(incomes > CPP_EXEMPTION, (np.minimum(incomes, CPP_MAX_EARNINGS) - CPP_EXEMPTION) * CPP_RATE, 0)
+        cpp2 = np.where(incomes > CPP_MAX_EARNINGS,
+                        (np.minimum(incomes, CPP2_MAX_EARNINGS) - CPP_MAX_EARNINGS) * CPP2_RATE, 0)
+        ei = np.minimum(incomes, EI_MAX_EARNINGS) * EI_RATE
+        total_deductions += np.round(cpp, 2) + np.round(cpp2, 2) + np.round(ei, 2)
+    return np.round(incomes - total_deductions, 2)
+
+
+def gross_from_net_batch(target_nets, province, dependents=0):
+    """
+    gross_from_net for an array of net pays.
+
+    The segment solve is one pass over the curve; the cent correction runs as
+    vectorized Newton steps, falling back to the scalar solver for any entry
+    that has not settled after MAX_ITERATIONS.
+
+    Returns:
+        NumPy array of gross annual incomes rounded to the cent
+    """
+    targets = np.round(np.asarray(target_nets, dtype=float), 2)
+    if np.any(targets < 0):
+        raise ValueError("Net pay cannot be negative")
+    curve = get_net_income_curve(province, dependents)
+    slope = curve.slopes[np.maximum(np.searchsorted(curve.nets, targets, side='right') - 1, 0)]
+    gross = np.round(curve.gross(targets), 2)
+
+    for _ in range(MAX_ITERATIONS):
+        error = targets - net_pay_array(gross, province, dependents)
+        unsettled = np.abs(error) >= CENT / 2
+        if not unsettled.any():
+            return gross
+        step = np.round(error / slope, 2)
+        step = np.where(step == 0, np.copysign(CENT, error), step)
+        gross = np.where(unsettled, np.round(gross + step, 2), gross)
+
+    for i in np.flatnonzero(unsettled):
+        gross[i] = gross_from_net(targets[i], province, dependents)
+    return gross
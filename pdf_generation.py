@@ -2,6 +2,7 @@
 # ENHANCED PDF GENERATION WITH DETAILED TABLES
 # =============================================================================
 import os
+import functools
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
@@ -10,34 +11,18 @@ from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
 import datetime
 
-def create_enhanced_pdf_report(client_name, province, calculation_details, present_value_details, 
-                             result, collateral_benefits, missed_time_unit, missed_time, output_path, 
-                             birthdate=None, retirement_age=None, **kwargs):
+from damages_results import BENEFITS, province_display
+from metrics import REPORT_RENDER
+from stage_timing import stage, timed_stage
+
+@functools.lru_cache(maxsize=1)
+def get_report_styles():
     """
-    Create a professionally-styled PDF report with comprehensive details organized in distinct sections.
-    
-    Args:
-        client_name: Name of the client
-        province: Client's province for taxation purposes
-        calculation_details: Dictionary containing past lost wages calculation details
-        present_value_details: Dictionary containing future lost wages calculation details
-        result: Dictionary containing income and deduction details
-        collateral_benefits: Dictionary containing collateral benefit details
-        missed_time_unit: Unit of missed time (days, weeks, months, etc.)
-        missed_time: Amount of missed time
-        output_path: Path where the PDF will be saved
-        birthdate: Client's date of birth (optional)
-        retirement_age: Client's retirement age (optional)
-    
-    Returns:
-        Path to the created PDF file
+    Build the paragraph styles used by the PDF report.
+
+    The styles never change between reports, so they are built once per process
+    (and can be built ahead of time by warmup.preload).
     """
-    # Create document
-    doc = SimpleDocTemplate(output_path, pagesize=letter, 
-                          leftMargin=1.0*inch, rightMargin=1.0*inch,
-                          topMargin=1.0*inch, bottomMargin=1.0*inch)
-    
-    # Create styles
     styles = getSampleStyleSheet()
     
     # Custom styles
@@ -97,6 +82,51 @@ def create_enhanced_pdf_report(client_name, province, calculation_details, prese
         alignment=TA_CENTER
     )
     
+    return {
+        'title': title_style,
+        'subtitle': subtitle_style,
+        'section_title': section_title_style,
+        'normal': normal_style,
+        'table_header': table_header_style,
+        'footer': footer_style
+    }
+
+@REPORT_RENDER.time(format='pdf')
+@timed_stage('pdf_report')
+def create_enhanced_pdf_report(damages, output_path, future_loss_schedule=None):
+    """
+    Create a professionally-styled PDF report with comprehensive details organized in distinct sections.
+    
+    Args:
+        damages: damages_results.DamagesResult of the calculation
+        output_path: Path where the PDF will be saved
+        future_loss_schedule: Year-by-year rows from cashflow_schedule.aggregate_yearly (optional)
+    
+    Returns:
+        Path to the created PDF file
+    """
+    province = damages.province
+    take_home = damages.take_home
+    collateral_benefits = damages.collateral_benefits
+    past_loss = damages.past_loss
+    future_loss = damages.future_loss
+    birthdate = damages.birthdate
+    retirement_age = damages.retirement_age
+    
+    # Create document
+    doc = SimpleDocTemplate(output_path, pagesize=letter, 
+                          leftMargin=1.0*inch, rightMargin=1.0*inch,
+                          topMargin=1.0*inch, bottomMargin=1.0*inch)
+    
+    # Shared report styles
+    report_styles = get_report_styles()
+    title_style = report_styles['title']
+    subtitle_style = report_styles['subtitle']
+    section_title_style = report_styles['section_title']
+    normal_style = report_styles['normal']
+    table_header_style = report_styles['table_header']
+    footer_style = report_styles['footer']
+    
     # Start building document
     elements = []
     
@@ -105,7 +135,7 @@ def create_enhanced_pdf_report(client_name, province, calculation_details, prese
     elements.append(Spacer(1, 0.1*inch))
     
     # Client name
-    elements.append(Paragraph(f"{client_name}", subtitle_style))
+    elements.append(Paragraph(f"{damages.client_name}", subtitle_style))
     
     # Date
     today = datetime.date.today().strftime("%B %d, %Y")
@@ -115,23 +145,12 @@ def create_enhanced_pdf_report(client_name, province, calculation_details, prese
     # 1. ASSUMPTIONS SECTION
     elements.append(Paragraph("Assumptions", section_title_style))
     
-    # Get formatted province name
-    if province.lower() == "nova scotia":
-        province_display = "Nova Scotia"
-    elif province.lower() == "new brunswick":
-        province_display = "New Brunswick" 
-    elif province.lower() == "prince edward island":
-        province_display = "Prince Edward Island"
-    elif province.lower() == "newfoundland" or province.lower() == "newfoundland and labrador":
-        province_display = "Newfoundland and Labrador"
-    else:
-        province_display = province.capitalize()
-    
     # Jurisdiction information
+    province_name = province_display(province)
     jurisdiction_data = [
         [Paragraph("Parameter", table_header_style), Paragraph("Value", table_header_style)],
-        ["Applicable Law:", province_display],
-        ["Applicable Tax Rates:", province_display]
+        ["Applicable Law:", province_name],
+        ["Applicable Tax Rates:", province_name]
     ]
     
     jurisdiction_table = Table(jurisdiction_data, colWidths=[2.5*inch, 4*inch])
@@ -158,7 +177,7 @@ def create_enhanced_pdf_report(client_name, province, calculation_details, prese
     # Income and deductions information - Filter out zero values except for specific cases
     income_data = [
         [Paragraph("Income & Deductions", table_header_style), Paragraph("Amount", table_header_style)],
-        ["Gross Salary:", f"${result.get('Gross Income', 0):,.2f}"]
+        ["Gross Salary:", f"${take_home.gross_income:,.2f}"]
     ]
     
     # For PEI, add a special note about calculations being based on gross salary
@@ -166,26 +185,20 @@ def create_enhanced_pdf_report(client_name, province, calculation_details, prese
         income_data.append(["Note:", "In Prince Edward Island, past and future lost wages are calculated using gross salary, not net."])
     else:
         # For other provinces, add non-zero deductions
-        if result.get('Federal Tax', 0) > 0:
-            income_data.append(["Federal Tax:", f"${result.get('Federal Tax', 0):,.2f}"])
-        
-        if result.get(f'{province.capitalize()} Tax', 0) > 0:
-            income_data.append([f"{province_display} Tax:", f"${result.get(f'{province.capitalize()} Tax', 0):,.2f}"])
-        
-        if result.get('CPP Contribution', 0) > 0:
-            income_data.append(["CPP Contribution:", f"${result.get('CPP Contribution', 0):,.2f}"])
-        
-        if result.get('CPP2 Contribution', 0) > 0:
-            income_data.append(["CPP2 Contribution:", f"${result.get('CPP2 Contribution', 0):,.2f}"])
-        
-        if result.get('EI Contribution', 0) > 0:
-            income_data.append(["EI Contribution:", f"${result.get('EI Contribution', 0):,.2f}"])
-        
-        if result.get('Total Deductions', 0) > 0:
-            income_data.append(["Total Deductions:", f"${result.get('Total Deductions', 0):,.2f}"])
+        deductions = (
+            ("Federal Tax:", take_home.federal_tax),
+            (f"{province_name} Tax:", take_home.provincial_tax),
+            ("CPP Contribution:", take_home.cpp_contribution),
+            ("CPP2 Contribution:", take_home.cpp2_contribution),
+            ("EI Contribution:", take_home.ei_contribution),
+            ("Total Deductions:", take_home.total_deductions),
+        )
+        for label, amount in deductions:
+            if amount > 0:
+                income_data.append([label, f"${amount:,.2f}"])
     
     # Always include net pay
-    income_data.append(["Net of Taxes:", f"${result.get('Net Pay (Provincially specific deductions for damages)', 0):,.2f}"])
+    income_data.append(["Net of Taxes:", f"${take_home.net_pay:,.2f}"])
     
     income_table = Table(income_data, colWidths=[2.5*inch, 4*inch])
     
@@ -226,46 +239,13 @@ def create_enhanced_pdf_report(client_name, province, calculation_details, prese
          Paragraph("Description", table_header_style)]
     ]
     
-    # Filter and add only non-zero benefits with descriptions
-    benefit_descriptions = {
-        "EI Benefits": "Employment Insurance sickness benefits (limited to 26 weeks)",
-        "Section B Benefits": "No-fault automobile insurance benefits",
-        "LTD Benefits": "Long-term disability benefits from employer or private insurance",
-        "CPPD Benefits": "Canada Pension Plan disability benefits",
-        "Other Benefits": "Additional benefits from other sources"
-    }
-    
+    # Add only non-zero benefits, with descriptions
     has_benefits = False
-    
-    if collateral_benefits.get('EI Benefits (annual)', 0) > 0:
-        benefits_data.append(["EI Benefits:", 
-                             f"${collateral_benefits.get('EI Benefits (annual)', 0):,.2f}",
-                             benefit_descriptions["EI Benefits"]])
-        has_benefits = True
-        
-    if collateral_benefits.get('Section B Benefits (annual)', 0) > 0:
-        benefits_data.append(["Section B Benefits:", 
-                             f"${collateral_benefits.get('Section B Benefits (annual)', 0):,.2f}",
-                             benefit_descriptions["Section B Benefits"]])
-        has_benefits = True
-        
-    if collateral_benefits.get('LTD Benefits (annual)', 0) > 0:
-        benefits_data.append(["LTD Benefits:", 
-                             f"${collateral_benefits.get('LTD Benefits (annual)', 0):,.2f}",
-                             benefit_descriptions["LTD Benefits"]])
-        has_benefits = True
-        
-    if collateral_benefits.get('CPPD Benefits (annual)', 0) > 0:
-        benefits_data.append(["CPPD Benefits:", 
-                             f"${collateral_benefits.get('CPPD Benefits (annual)', 0):,.2f}",
-                             benefit_descriptions["CPPD Benefits"]])
-        has_benefits = True
-        
-    if collateral_benefits.get('Other Benefits (annual)', 0) > 0:
-        benefits_data.append(["Other Benefits:", 
-                             f"${collateral_benefits.get('Other Benefits (annual)', 0):,.2f}",
-                             benefit_descriptions["Other Benefits"]])
-        has_benefits = True
+    for benefit, label, description in BENEFITS:
+        amount = collateral_benefits.annual(benefit)
+        if amount > 0:
+            benefits_data.append([f"{label}:", f"${amount:,.2f}", description])
+            has_benefits = True
     
     # Add New Brunswick specific note if applicable
     if province.lower() == "new brunswick":
@@ -275,7 +255,7 @@ def create_enhanced_pdf_report(client_name, province, calculation_details, prese
     # Only add total if there are benefits
     if has_benefits:
         benefits_data.append(["Total Collateral Benefits:", 
-                             f"${collateral_benefits.get('Total Annual Future Benefits', 0):,.2f}",
+                             f"${collateral_benefits.total_annual:,.2f}",
                              "Sum of all annual collateral benefits"])
     else:
         benefits_data.append(["No Collateral Benefits", "$0.00", "No offsetting benefits are being received"])
@@ -314,8 +294,8 @@ def create_enhanced_pdf_report(client_name, province, calculation_details, prese
         [Paragraph("Personal Information", table_header_style), Paragraph("Details", table_header_style)],
         ["Date of Birth:", birthdate.strftime("%Y-%m-%d") if birthdate else "Not specified"],
         ["Retirement Age:", str(retirement_age) if retirement_age else "Not specified"],
-        ["Time Missed:", f"{missed_time} {missed_time_unit}"],
-        ["Dependents (under 18):", str(calculation_details.get("Dependents", 0))],
+        ["Time Missed:", f"{past_loss.missed_time} {past_loss.missed_time_unit}"],
+        ["Dependents (under 18):", str(damages.dependents)],
     ]
     
     personal_table = Table(personal_data, colWidths=[2.5*inch, 4*inch])
@@ -343,29 +323,31 @@ def create_enhanced_pdf_report(client_name, province, calculation_details, prese
     elements.append(Paragraph("Past Wage Loss", section_title_style))
     
     # Get gross lost wages
-    if missed_time_unit.lower() == "days":
-        gross_daily_wage = result.get('Gross Income', 0) / (result.get('Working Days', 252) or 252)
-        gross_lost_wages = gross_daily_wage * float(missed_time)
-    elif missed_time_unit.lower() == "weeks":
-        gross_weekly_wage = result.get('Gross Income', 0) / 52
-        gross_lost_wages = gross_weekly_wage * float(missed_time)
-    elif missed_time_unit.lower() == "months":
-        gross_monthly_wage = result.get('Gross Income', 0) / 12
-        gross_lost_wages = gross_monthly_wage * float(missed_time)
+    missed_time = float(past_loss.missed_time)
+    missed_time_unit = past_loss.missed_time_unit.lower()
+    if missed_time_unit == "days":
+        gross_daily_wage = take_home.gross_income / (take_home.working_days or 252)
+        gross_lost_wages = gross_daily_wage * missed_time
+    elif missed_time_unit == "weeks":
+        gross_weekly_wage = take_home.gross_income / 52
+        gross_lost_wages = gross_weekly_wage * missed_time
+    elif missed_time_unit == "months":
+        gross_monthly_wage = take_home.gross_income / 12
+        gross_lost_wages = gross_monthly_wage * missed_time
     else:
-        gross_lost_wages = result.get('Gross Income', 0) * float(missed_time)
+        gross_lost_wages = take_home.gross_income * missed_time
     
     # Calculate collateral benefits deduction for past period
-    past_collateral_benefits = collateral_benefits.get('Total Past Benefits', 0)
+    past_collateral_benefits = collateral_benefits.total_to_date
     
     past_data = [
         [Paragraph("Item", table_header_style), Paragraph("Amount", table_header_style)],
         ["Gross Lost Income:", f"${gross_lost_wages:,.2f}"],
-        ["Net Lost Income:", f"${calculation_details.get('Original Past Lost Wages', calculation_details.get('Base Amount', 0)):,.2f}"],
-        ["Prejudgment Interest Rate:", f"{calculation_details.get('PJI Rate', 0):.2f}%"],
-        ["Prejudgment Interest:", f"${calculation_details.get('Interest Amount', 0):,.2f}"],
+        ["Net Lost Income:", f"${past_loss.net_loss:,.2f}"],
+        ["Prejudgment Interest Rate:", f"{past_loss.pji_rate or 0:.2f}%"],
+        ["Prejudgment Interest:", f"${past_loss.interest_amount:,.2f}"],
         ["Collateral Benefits Deduction:", f"-${past_collateral_benefits:,.2f}"],
-        ["Total Past Lost Wages:", f"${calculation_details.get('Past Lost Wages with Interest', 0):,.2f}"]
+        ["Total Past Lost Wages:", f"${past_loss.with_interest:,.2f}"]
     ]
     
     past_table = Table(past_data, colWidths=[3.25*inch, 3.25*inch])
@@ -414,11 +396,11 @@ def create_enhanced_pdf_report(client_name, province, calculation_details, prese
         elements.append(Spacer(1, 0.1*inch))
     
     # Calculate annual collateral benefits
-    annual_collateral_benefits = collateral_benefits.get('Total Annual Future Benefits', 0)
+    annual_collateral_benefits = collateral_benefits.total_annual
     
     future_data = [
         [Paragraph("Item", table_header_style), Paragraph("Amount", table_header_style), Paragraph("Explanation", table_header_style)],
-        ["Annual Gross Income:", f"${result.get('Gross Income', 0):,.2f}", "Projected annual salary"]
+        ["Annual Gross Income:", f"${take_home.gross_income:,.2f}", "Projected annual salary"]
     ]
     
     # Add collateral benefits if applicable
@@ -431,25 +413,32 @@ def create_enhanced_pdf_report(client_name, province, calculation_details, prese
     
     future_data.append([
         "Net Annual Income:", 
-        f"${present_value_details.get('annual_salary', 0):,.2f}", 
+        f"${future_loss.annual_salary:,.2f}", 
         "Gross income minus collateral benefits"
     ])
     
     future_data.append([
         "Loss Period:", 
-        f"{present_value_details.get('time_horizon', 0):.2f} years", 
+        f"{future_loss.time_horizon:.2f} years", 
         "Duration of expected future losses"
     ])
     
     future_data.append([
         "Discount Rate:", 
-        f"{present_value_details.get('discount_rate', 0)*100:.2f}%", 
+        f"{future_loss.discount_rate*100:.2f}%", 
         "Rate used to calculate present value of future losses"
     ])
-    
+
+    if future_loss.contingency_factor:
+        future_data.append([
+            "Contingency Factor:",
+            f"{future_loss.contingency_factor:.4f}",
+            "Mortality, disability and unemployment contingencies"
+        ])
+
     future_data.append([
-        "Total Future Lost Wages:", 
-        f"${present_value_details.get('present_value', 0):,.2f}", 
+        "Total Future Lost Wages:",
+        f"${future_loss.present_value:,.2f}", 
         "Present value of future income stream"
     ])
     
@@ -482,6 +471,38 @@ def create_enhanced_pdf_report(client_name, province, calculation_details, prese
     elements.append(future_table)
     elements.append(Spacer(1, 0.2*inch))
     
+    # Optional year-by-year schedule (from cashflow_schedule.aggregate_yearly)
+    if future_loss_schedule:
+        schedule_data = [[
+            Paragraph("Year", table_header_style), Paragraph("Months", table_header_style),
+            Paragraph("Lost Wages", table_header_style), Paragraph("Collateral", table_header_style),
+            Paragraph("Net Loss", table_header_style), Paragraph("Present Value", table_header_style)
+        ]]
+        for row in future_loss_schedule:
+            schedule_data.append([
+                str(row['year']),
+                f"{row['months']:.2f}",
+                f"${row['lost_wages']:,.2f}",
+                f"-${row['collateral']:,.2f}",
+                f"${row['net']:,.2f}",
+                f"${row['present_value']:,.2f}"
+            ])
+        
+        schedule_table = Table(schedule_data, colWidths=[0.8*inch, 0.8*inch, 1.25*inch, 1.15*inch, 1.25*inch, 1.25*inch], repeatRows=1)
+        schedule_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e6eef7')),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#cccccc')),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 2),
+            ('TOPPADDING', (0, 1), (-1, -1), 2),
+        ]))
+        elements.append(Paragraph("Year-by-Year Schedule", table_header_style))
+        elements.append(Spacer(1, 0.05*inch))
+        elements.append(schedule_table)
+        elements.append(Spacer(1, 0.2*inch))
+    
     # 4. TOTAL ECONOMIC DAMAGES SECTION
     elements.append(Paragraph("Total Wage Loss", section_title_style))
     
@@ -494,8 +515,8 @@ def create_enhanced_pdf_report(client_name, province, calculation_details, prese
     elements.append(Spacer(1, 0.1*inch))
     
     # Calculate totals
-    past_lost_wages = calculation_details.get('Past Lost Wages with Interest', 0)
-    future_lost_wages = present_value_details.get('present_value', 0)
+    past_lost_wages = past_loss.with_interest
+    future_lost_wages = future_loss.present_value
     total_damages = past_lost_wages + future_lost_wages
     
     total_data = [
@@ -560,81 +581,52 @@ def create_enhanced_pdf_report(client_name, province, calculation_details, prese
     elements.append(Paragraph(footer_text, footer_style))
     
     # Build the document
-    doc.build(elements)
+    with stage('pdf_build'):
+        doc.build(elements)
     
     return output_path
 
 # For testing and standalone use
 if __name__ == "__main__":
+    from damages_results import CollateralBenefits, DamagesResult, FutureLoss, PastLoss, TakeHome
+
     # Example usage with sample data
-    client_name = "John Doe"
-    province = "Nova Scotia"
-    calculation_details = {
-        "Loss Date": "2022-01-01",
-        "Current Date": "2023-01-01",
-        "Midpoint Date": "2022-07-01",
-        "Years Between Midpoint and Current Date": 0.5,
-        "Original Past Lost Wages": 50000.00,
-        "PJI Rate": 5.0,
-        "Interest Amount": 1250.00,
-        "Past Lost Wages with Interest": 51250.00
-    }
-    present_value_details = {
-        "annual_salary": 75000.00,
-        "monthly_payment": 6250.00,
-        "time_horizon": 10.0,
-        "total_months": 120,
-        "discount_rate": 0.025,
-        "present_value": 675000.00,
-        "future_collateral_benefits": 0.00
-    }
-    result = {
-        "Gross Income": 100000.00,
-        "Federal Tax": 15000.00,
-        "Nova Scotia Tax": 10000.00,
-        "CPP Contribution": 3500.00,
-        "CPP2 Contribution": 500.00,
-        "EI Contribution": 1000.00,
-        "Total Deductions": 30000.00,
-        "Net Pay (Provincially specific deductions for damages)": 70000.00,
-        "Daily Net Pay": 277.78,
-        "Hourly Net Pay": 34.72,
-        "Weekly Net Pay": 1346.15,
-        "Monthly Net Pay": 5833.33,
-        "Working Days": 252
-    }
-    collateral_benefits = {
-        "EI Benefits (to date)": 5000.00,
-        "Section B Benefits (to date)": 2000.00,
-        "LTD Benefits (to date)": 0.00,
-        "CPPD Benefits (to date)": 0.00,
-        "Other Benefits (to date)": 0.00,
-        "Total Past Benefits": 7000.00,
-        "EI Benefits (annual)": 10000.00,
-        "Section B Benefits (annual)": 5000.00,
-        "LTD Benefits (annual)": 0.00,
-        "CPPD Benefits (annual)": 0.00,
-        "Other Benefits (annual)": 0.00,
-        "Total Annual Future Benefits": 15000.00
-    }
-    
-    # Sample birthdate and retirement age
-    birthdate = datetime.date(1980, 1, 1)
-    retirement_age = 65
+    damages = DamagesResult(
+        client_name="John Doe",
+        province="nova scotia",
+        dependents=0,
+        loss_date=datetime.date(2022, 1, 1),
+        start_date=datetime.date(2023, 1, 1),
+        current_date=datetime.date(2023, 1, 1),
+        return_status="total disability",
+        end_date=None,
+        birthdate=datetime.date(1980, 1, 1),
+        retirement_age=65,
+        ei_days_remaining=0,
+        take_home=TakeHome(
+            province="nova scotia", gross_income=100000.00, federal_tax=15000.00, provincial_tax=10000.00,
+            cpp_contribution=3500.00, cpp2_contribution=500.00, ei_contribution=1000.00, dependent_benefit=0,
+            total_deductions=30000.00, net_pay=70000.00, daily_net_pay=277.78, hourly_net_pay=34.72,
+            weekly_net_pay=1346.15, monthly_net_pay=5833.33, working_days=252
+        ),
+        collateral_benefits=CollateralBenefits(
+            ei_to_date=5000.00, section_b_to_date=2000.00, ltd_to_date=0, cppd_to_date=0, other_to_date=0,
+            ei_annual=10000.00, section_b_annual=5000.00, ltd_annual=0, cppd_annual=0, other_annual=0
+        ),
+        past_loss=PastLoss(
+            missed_time=6, missed_time_unit="months", missed_pay=35000.00, net_loss=50000.00,
+            years_between=1.0, pji_rate=5.0, interest_amount=1250.00, with_interest=51250.00
+        ),
+        future_loss=FutureLoss(
+            annual_salary=75000.00, monthly_payment=6250.00, time_horizon=10.0, total_months=120,
+            discount_rate=0.025, present_value=675000.00, future_collateral_benefits=0.00,
+            contingency_factor=None, wage_growth=0, benefit_indexation=0, indexed_collateral_benefits=0,
+            per_year_tax=False, gross_salary=100000.00
+        ),
+        total_damages=726250.00
+    )
     
     # Create PDF
-    create_enhanced_pdf_report(
-        client_name=client_name,
-        province=province,
-        calculation_details=calculation_details,
-        present_value_details=present_value_details,
-        result=result,
-        collateral_benefits=collateral_benefits,
-        missed_time_unit="months",
-        missed_time=6,
-        output_path="enhanced_economic_damages_report.pdf",
-        birthdate=birthdate,
-        retirement_age=retirement_age
-    )
+    create_enhanced_pdf_report(damages, "enhanced_economic_damages_report.pdf")
     
     print("Enhanced PDF report generated successfully!")
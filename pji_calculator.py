@@ -1,12 +1,13 @@
 from datetime import datetime
 import logging
 from tbill_utils import get_average_tbill_rate
+from stage_timing import timed_stage
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def calculate_pji(loss_date, calculation_date=None, amount=0):
+@timed_stage('pji')
+def calculate_pji(loss_date, calculation_date=None, amount=0, method='average', mode='simple',
+                  period='month', loss_end_date=None):
     """
     Calculate Pre-Judgment Interest based on average T-Bill rates
     
@@ -14,6 +15,11 @@ def calculate_pji(loss_date, calculation_date=None, amount=0):
         loss_date (str): Date of loss in 'YYYY-MM-DD' format
         calculation_date (str, optional): Date of calculation, defaults to today
         amount (float): The amount on which to calculate interest
+        method (str): 'average' applies the average T-Bill rate over the whole period;
+            'rate_path' accrues interest at the rate in force each period (see pji_engine)
+        mode (str): 'simple' or 'compound' (rate_path method only)
+        period (str): How often the rate resets: 'month', 'quarter' or 'half-year' (rate_path only)
+        loss_end_date (str, optional): Spread the loss monthly from loss_date to this date (rate_path only)
         
     Returns:
         dict: PJI calculation results
@@ -32,6 +38,28 @@ def calculate_pji(loss_date, calculation_date=None, amount=0):
         days_diff = (calculation_date_obj - loss_date_obj).days
         years_diff = days_diff / 365.25  # Using 365.25 to account for leap years
         
+        if method == 'rate_path':
+            # NumPy is only needed for the rate-path engine
+            from pji_engine import calculate_rate_path_interest
+            
+            accrual = calculate_rate_path_interest(
+                amount, loss_date_obj, calculation_date_obj, mode=mode, period=period,
+                loss_end_date=loss_end_date
+            )
+            return {
+                'loss_date': loss_date,
+                'calculation_date': calculation_date_obj.strftime('%Y-%m-%d'),
+                'days_diff': days_diff,
+                'years_diff': round(years_diff, 2),
+                'tbill_rate': round(accrual['effective_rate'], 2),
+                'amount': amount,
+                'interest_amount': accrual['interest_amount'],
+                'total_amount': accrual['total_amount'],
+                'method': method,
+                'mode': mode,
+                'period': period
+            }
+        
         # Get average T-Bill rate for the period
         avg_tbill_rate = get_average_tbill_rate(loss_date_obj, calculation_date_obj)
         
@@ -67,5 +95,7 @@ def calculate_pji(loss_date, calculation_date=None, amount=0):
 
 # Example usage
 if __name__ == "__main__":
+    # Logging for the standalone run; the web app configures it in logging_config
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     result = calculate_pji('2022-04-01', amount=10000)
     print(f"PJI Calculation: {result}")
@@ -0,0 +1,212 @@
+# =============================================================================
+# RATE-PATH PREJUDGMENT INTEREST ENGINE
+# =============================================================================
+import datetime
+import logging
+import threading
+
+import numpy as np
+
+from metrics import CACHE_LOOKUPS
+from stage_timing import stage
+
+logger = logging.getLogger(__name__)
+
+DAYS_PER_YEAR = 365.25
+
+# Months between rate resets for each supported period
+PERIOD_MONTHS = {'month': 1, 'quarter': 3, 'half-year': 6}
+
+MODES = ('simple', 'compound')
+
+
+def _to_day(value):
+    """Convert a date, datetime, 'YYYY-MM-DD' string or array of them to datetime64[D]."""
+    if isinstance(value, datetime.datetime):
+        value = value.date()
+    if isinstance(value, str):
+        value = value[:10]
+    return np.asarray(value, dtype='datetime64[D]')
+
+
+class RatePath:
+    """
+    T-Bill rates in force period by period, with cumulative accrual arrays.
+
+    The rate for each period is the last published rate on or before the period
+    start. At every period boundary the path stores the cumulative simple interest
+    per dollar and the cumulative log growth factor, so interest between any two
+    dates is a binary search for each date plus a partial period at the known rate.
+    The final period has no end: its rate carries forward past the last observation.
+    """
+
+    def __init__(self, observations, period='month'):
+        """
+        Args:
+            observations: List of (date, rate_percent) tuples in date order
+            period: 'month', 'quarter' or 'half-year'
+        """
+        if period not in PERIOD_MONTHS:
+            raise ValueError(f"Unknown rate period: {period}")
+        if not observations:
+            raise ValueError("No rate observations to build a rate path from")
+
+        self.period = period
+        step = PERIOD_MONTHS[period]
+
+        obs_dates = np.array([date for date, _ in observations], dtype='datetime64[D]')
+        obs_rates = np.array([rate for _, rate in observations], dtype=float) / 100
+
+        first_month = obs_dates[0].astype('datetime64[M]').astype(int)
+        last_month = obs_dates[-1].astype('datetime64[M]').astype(int)
+        first_month -= first_month % step
+        months = np.arange(first_month, last_month + 1, step).astype('datetime64[M]')
+        self.boundaries = months.astype('datetime64[D]')
+
+        # Rate in force at each period start (the first observation covers earlier periods)
+        index = np.searchsorted(obs_dates, self.boundaries, side='right') - 1
+        self.rates = obs_rates[np.maximum(index, 0)]
+
+        period_years = np.diff(self.boundaries).astype(float) / DAYS_PER_YEAR
+        self.cum_simple = np.concatenate(([0.0], np.cumsum(self.rates[:-1] * period_years)))
+        self.log_growth_rates = np.log1p(self.rates)
+        self.cum_log_growth = np.concatenate(([0.0], np.cumsum(self.log_growth_rates[:-1] * period_years)))
+
+        self.first_observation = obs_dates[0]
+        self.last_observation = obs_dates[-1]
+
+    def _locate(self, dates):
+        """Period index and years elapsed since that period's start for each date."""
+        days = _to_day(dates)
+        index = np.clip(np.searchsorted(self.boundaries, days, side='right') - 1, 0, len(self.boundaries) - 1)
+        elapsed = (days - self.boundaries[index]).astype(float) / DAYS_PER_YEAR
+        return index, elapsed
+
+    def cumulative_simple(self, dates):
+        """Simple interest per dollar accrued from the start of the path to each date."""
+        index, elapsed = self._locate(dates)
+        return self.cum_simple[index] + self.rates[index] * elapsed
+
+    def cumulative_log_growth(self, dates):
+        """Log of the compound growth factor from the start of the path to each date."""
+        index, elapsed = self._locate(dates)
+        return self.cum_log_growth[index] + self.log_growth_rates[index] * elapsed
+
+    def interest_factor(self, start_dates, end_date, mode='compound'):
+        """
+        Interest per dollar from each start date to end_date along the rate path.
+
+        Simple mode sums rate × time over the periods; compound mode multiplies
+        (1 + rate)^time, so both reduce to the single-rate formulas when the rate is flat.
+        """
+        if mode == 'simple':
+            return self.cumulative_simple(end_date) - self.cumulative_simple(start_dates)
+        if mode == 'compound':
+            return np.expm1(self.cumulative_log_growth(end_date) - self.cumulative_log_growth(start_dates))
+        raise ValueError(f"Unknown interest mode: {mode}")
+
+    def effective_rate(self, start_date, end_date):
+        """Time-weighted average annual rate (percent) in force between two dates."""
+        years = float((_to_day(end_date) - _to_day(start_date)).astype(float)) / DAYS_PER_YEAR
+        if years <= 0:
+            return float(self.rates[self._locate(start_date)[0]] * 100)
+        return float(self.interest_factor(start_date, end_date, 'simple') / years * 100)
+
+
+_path_cache = {}
+_path_cache_lock = threading.Lock()
+
+
+def get_rate_path(period='month', store=None):
+    """
+    Shared RatePath built from the rate store, rebuilt only when the store's data version changes.
+    """
+    if store is None:
+        from tbill_utils import get_store
+        store = get_store()
+
+    version = store.data_version()
+    key = (store.db_path, period)
+    cached = _path_cache.get(key)
+    if cached is not None and cached[0] == version:
+        CACHE_LOOKUPS.inc(cache='rate_path', result='hit')
+        return cached[1]
+
+    with _path_cache_lock, stage('rate_path'):
+        cached = _path_cache.get(key)
+        if cached is None or cached[0] != version:
+            CACHE_LOOKUPS.inc(cache='rate_path', result='reload')
+            path = RatePath(store.get_rates(), period)
+            logger.info(f"Built {period} rate path with {len(path.boundaries)} periods (rates version {version})")
+            cached = (version, path)
+            _path_cache[key] = cached
+    return cached[1]
+
+
+def monthly_instalments(total_amount, start_date, end_date):
+    """
+    Spread a loss evenly by day over [start_date, end_date] and bill it monthly.
+
+    Each instalment is dated at the first day of the following month (or at
+    end_date for the last one), when that month's wages would have been paid.
+
+    Returns:
+        Tuple of (instalment_dates, amounts) as NumPy arrays
+    """
+    start = _to_day(start_date)
+    end = _to_day(end_date)
+    if end <= start:
+        return np.array([start]), np.array([float(total_amount)])
+
+    month_ends = np.arange(
+        start.astype('datetime64[M]') + 1, end.astype('datetime64[M]') + 1
+    ).astype('datetime64[D]')
+    month_ends = month_ends[month_ends < end]
+    dates = np.concatenate((month_ends, [end]))
+    days = np.diff(np.concatenate(([start], dates))).astype(float)
+    return dates, total_amount * days / days.sum()
+
+
+def calculate_rate_path_interest(amount, loss_date, calculation_date=None, mode='compound',
+                                 period='month', loss_end_date=None, rate_path=None):
+    """
+    Prejudgment interest accrued along the T-Bill rate path.
+
+    Args:
+        amount: Past loss (principal)
+        loss_date: Date of loss; a lump-sum loss accrues interest from this date
+        calculation_date: Date interest runs to (defaults to today)
+        mode: 'simple' or 'compound'
+        period: How often the rate resets: 'month', 'quarter' or 'half-year'
+        loss_end_date: If given, the loss accrues monthly from loss_date to this date
+            and each instalment earns interest from when it was lost
+        rate_path: RatePath to use (defaults to the shared path from the rate store)
+
+    Returns:
+        Dictionary with interest, total and the effective average rate
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown interest mode: {mode}")
+    if calculation_date is None:
+        calculation_date = datetime.date.today()
+    if rate_path is None:
+        rate_path = get_rate_path(period)
+
+    if loss_end_date is not None:
+        dates, amounts = monthly_instalments(amount, loss_date, loss_end_date)
+    else:
+        dates, amounts = _to_day([loss_date]), np.array([float(amount)])
+
+    # Losses after the calculation date earn no interest yet
+    factors = np.where(dates < _to_day(calculation_date), rate_path.interest_factor(dates, calculation_date, mode), 0.0)
+    interest = float(amounts @ factors)
+
+    return {
+        'mode': mode,
+        'period': rate_path.period,
+        'instalments': len(dates),
+        'amount': float(amount),
+        'interest_amount': round(interest, 2),
+        'total_amount': round(float(amount) + interest, 2),
+        'effective_rate': round(rate_path.effective_rate(loss_date, calculation_date), 4)
+    }
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, render_template, jsonify
 from datetime import datetime
 from pji_calculator import calculate_pji
+from case_schema import PJI_METHODS
 
 # Create a Blueprint for PJI routes
 pji_routes = Blueprint('pji', __name__)
@@ -13,18 +14,39 @@ def api_calculate_pji():
     # Extract required parameters
     loss_date = data.get('loss_date')
     calculation_date = data.get('calculation_date', datetime.now().strftime('%Y-%m-%d'))
-    amount = float(data.get('amount', 0))
+    method = data.get('method', 'average')
+    mode = data.get('mode', 'simple')
+    period = data.get('period', 'month')
     
     # Validate parameters
     if not loss_date:
         return jsonify({'error': 'Loss date is required'}), 400
+    try:
+        amount = float(data.get('amount', 0))
+    except (TypeError, ValueError):
+        return jsonify({'error': f"Amount must be a number, not {data.get('amount')!r}"}), 400
+    if method not in PJI_METHODS:
+        return jsonify({'error': f"Method must be one of: {', '.join(PJI_METHODS)}"}), 400
+    if method == 'rate_path':
+        # Mode and period only apply to the rate-path engine (which needs NumPy)
+        from pji_engine import MODES, PERIOD_MONTHS
+        if mode not in MODES:
+            return jsonify({'error': f"Mode must be one of: {', '.join(MODES)}"}), 400
+        if period not in PERIOD_MONTHS:
+            return jsonify({'error': f"Period must be one of: {', '.join(PERIOD_MONTHS)}"}), 400
     
     try:
         # Calculate PJI using T-Bill rates
-        result = calculate_pji(loss_date, calculation_date, amount)
+        result = calculate_pji(
+            loss_date, calculation_date, amount,
+            method=method, mode=mode, period=period,
+            loss_end_date=data.get('loss_end_date')
+        )
         
         return jsonify(result)
     
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -32,22 +54,3 @@ def api_calculate_pji():
 def pji_calculator_page():
     """Render the PJI calculator page"""
     return render_template('pji_calculator.html')
-
-# Integration with frontend using AJAX
-@pji_routes.route('/api/tbill-rate', methods=['GET'])
-def get_tbill_rate():
-    """Get the T-Bill rate for a specific date range"""
-    from tbill_utils import get_average_tbill_rate
-    
-    start_date = request.args.get('start_date')
-    end_date = request.args.get('end_date', datetime.now().strftime('%Y-%m-%d'))
-    
-    if not start_date:
-        return jsonify({'error': 'Start date is required'}), 400
-    
-    try:
-        rate = get_average_tbill_rate(start_date, end_date)
-        return jsonify({'rate': rate})
-    
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
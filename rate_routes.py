@@ -0,0 +1,137 @@
+from flask import Blueprint, Response, request, jsonify
+import datetime
+import hashlib
+
+# Create a Blueprint for the T-Bill and PJI rate lookups used by the input and results pages
+rate_routes = Blueprint('rates', __name__)
+
+# Rates change at most twice a month; an hour bounds how stale a prefilled rate can be
+RATE_CACHE_MAX_AGE = 3600
+
+# Bump when the rate responses change shape or meaning, so cached copies are not revalidated
+RATE_API_VERSION = 1
+
+def rate_validators(store, params, ends_today=False):
+    """
+    ETag and Last-Modified for a rate response.
+
+    The ETag combines the store's data version with the resolved request
+    parameters (end_date defaults to today, so a cached answer expires with the day).
+    Last-Modified is the last rate update, or the start of today if ends_today
+    (end_date was defaulted) and that is later, so If-Modified-Since expires with
+    the day as well.
+    """
+    version = store.data_version()
+    digest = hashlib.sha1(repr(sorted(params.items())).encode('utf-8')).hexdigest()[:16]
+    etag = f"{RATE_API_VERSION}.{version}.{digest}"
+
+    last_modified = None
+    updated_at = store.updated_at()
+    if updated_at:
+        # Stored as local time; HTTP dates are UTC and whole seconds
+        last_modified = datetime.datetime.fromisoformat(updated_at).astimezone(datetime.timezone.utc).replace(microsecond=0)
+    if ends_today:
+        midnight = datetime.datetime.combine(datetime.date.today(), datetime.time()).astimezone(datetime.timezone.utc)
+        last_modified = midnight if last_modified is None else max(last_modified, midnight)
+    return version, etag, last_modified
+
+def not_modified(etag, last_modified):
+    """True if the client's copy is current (If-None-Match wins over If-Modified-Since)."""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified is not None:
+        return last_modified <= request.if_modified_since
+    return False
+
+def cached_rate_response(params, compute):
+    """
+    Answer a rate lookup with cache validators, computing it only if the client's copy is stale.
+
+    Args:
+        params: Resolved request parameters (dict)
+        compute: Function returning the JSON payload
+    """
+    from tbill_utils import get_store
+
+    store = get_store()
+    version, etag, last_modified = rate_validators(store, params, ends_today=not request.args.get('end_date'))
+    if not_modified(etag, last_modified):
+        response = Response(status=304)
+    else:
+        response = jsonify({**compute(), **params, 'rates_version': version})
+
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = RATE_CACHE_MAX_AGE
+    return response
+
+def error_response(message, status):
+    response = jsonify({'error': message})
+    response.status_code = status
+    response.cache_control.no_store = True
+    return response
+
+def date_range_params():
+    """(start_date, end_date) as validated ISO strings, or raise ValueError."""
+    start_date = request.args.get('start_date')
+    if not start_date:
+        raise ValueError('Start date is required')
+    end_date = request.args.get('end_date') or datetime.date.today().isoformat()
+    for value in (start_date, end_date):
+        try:
+            datetime.datetime.strptime(value, '%Y-%m-%d')
+        except ValueError:
+            raise ValueError(f"Invalid date '{value}': use YYYY-MM-DD")
+    return start_date, end_date
+
+@rate_routes.route('/api/tbill-rate', methods=['GET'])
+def get_tbill_rate():
+    """Average T-Bill rate between start_date and end_date (default today)."""
+    from tbill_utils import get_average_tbill_rate
+
+    try:
+        start_date, end_date = date_range_params()
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+    try:
+        return cached_rate_response(
+            {'start_date': start_date, 'end_date': end_date},
+            lambda: {'rate': get_average_tbill_rate(start_date, end_date)}
+        )
+    except Exception as e:
+        return error_response(str(e), 500)
+
+@rate_routes.route('/api/pji-rate', methods=['GET'])
+def get_pji_rate():
+    """
+    Prejudgment interest rate (percent) for a loss from start_date to end_date (default today).
+
+    method=average (default) is the average T-Bill rate, as /calculate uses it;
+    method=rate_path is the time-weighted rate in force month by month.
+    """
+    try:
+        start_date, end_date = date_range_params()
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+    method = request.args.get('method', 'average')
+    if method == 'average':
+        from tbill_utils import get_average_tbill_rate
+
+        def compute():
+            return {'rate': get_average_tbill_rate(start_date, end_date)}
+    elif method == 'rate_path':
+        from pji_engine import get_rate_path
+
+        def compute():
+            return {'rate': round(get_rate_path('month').effective_rate(start_date, end_date), 2)}
+    else:
+        return error_response(f"Unknown PJI method: {method}", 400)
+
+    try:
+        return cached_rate_response({'start_date': start_date, 'end_date': end_date, 'method': method}, compute)
+    except Exception as e:
+        return error_response(str(e), 500)
@@ -0,0 +1,317 @@
+# =============================================================================
+# BACKGROUND REPORT JOBS
+# =============================================================================
+"""
+PDF and Word reports rendered outside the request workers.
+
+A request submits a job (the report format and the case values) and gets a job
+id back; the job is a row in the report_jobs table of the datastore database.
+Each gunicorn worker runs a dispatcher thread that claims queued jobs and
+renders them in a small process pool, so a slow render never holds a request
+worker. Claims go through the table, so at most REPORT_WORKERS reports render
+at once across all workers.
+
+Finished reports are written to REPORTS_DIR and their rows kept for
+JOB_RETENTION seconds, so a download still works after the worker that rendered
+it has restarted. A job left 'running' by a process that died is queued again
+(up to MAX_ATTEMPTS renders).
+"""
+import json
+import logging
+import multiprocessing
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from damages_results import DamagesResult
+from datastore import get_connection
+from metrics import REPORT_JOBS
+
+logger = logging.getLogger(__name__)
+
+REPORTS_DIR = os.environ.get(
+    'ACTUCLAIM_REPORTS_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'reports')
+)
+REPORT_WORKERS = int(os.environ.get('ACTUCLAIM_REPORT_WORKERS', '2'))
+JOB_RETENTION = 24 * 3600
+MAX_ATTEMPTS = 2
+DISPATCH_POLL_SECONDS = 1.0
+
+REPORT_FORMATS = {
+    'pdf': ('.pdf', 'application/pdf'),
+    'docx': ('.docx', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'),
+}
+
+JOB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS report_jobs (
+    job_id TEXT PRIMARY KEY,
+    format TEXT NOT NULL,
+    status TEXT NOT NULL,
+    params TEXT NOT NULL,
+    download_name TEXT NOT NULL,
+    output_path TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    runner_pid INTEGER,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+
+CREATE INDEX IF NOT EXISTS report_jobs_status ON report_jobs (status, created_at);
+"""
+
+JOB_COLUMNS = ('job_id', 'format', 'status', 'download_name', 'output_path', 'error', 'attempts',
+               'created_at', 'started_at', 'finished_at')
+
+
+def render_report(report_format, params, output_path):
+    """
+    Render one report (runs in a pool process). Writes to a temporary name, then renames.
+
+    params: {'damages': DamagesResult.to_dict(), 'future_loss_schedule': rows or None}
+    """
+    damages = DamagesResult.from_dict(params['damages'])
+
+    partial_path = output_path + '.part'
+    if report_format == 'pdf':
+        from pdf_generation import create_enhanced_pdf_report
+        create_enhanced_pdf_report(damages, partial_path, future_loss_schedule=params.get('future_loss_schedule'))
+    else:
+        from word_generation import create_word_report
+        create_word_report(damages, partial_path)
+    os.replace(partial_path, output_path)
+    return output_path
+
+
+def _init_render_process():
+    """Pool process start-up: log to the application log like the web workers."""
+    from logging_config import configure_logging
+    configure_logging()
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ReportJobQueue:
+    """Persistent report job table with a per-process dispatcher and render pool."""
+
+    def __init__(self, db_path=None, output_dir=REPORTS_DIR, max_workers=REPORT_WORKERS):
+        self.db_path = db_path
+        self.output_dir = output_dir
+        self.max_workers = max_workers
+        self._conn().executescript(JOB_SCHEMA)
+        self._lock = threading.Lock()
+        self._pid = None
+        self._executor = None
+        self._wake = threading.Event()
+
+    def _conn(self):
+        return get_connection(self.db_path)
+
+    # -------------------------------------------------------------------------
+    # Requests
+    # -------------------------------------------------------------------------
+    def submit(self, report_format, params, download_name):
+        """Queue a report; returns the job id."""
+        if report_format not in REPORT_FORMATS:
+            raise ValueError(f"Unknown report format: {report_format}")
+        job_id = secrets.token_urlsafe(16)
+        self._conn().execute(
+            'INSERT INTO report_jobs (job_id, format, status, params, download_name, created_at) '
+            "VALUES (?, ?, 'queued', ?, ?, ?)",
+            (job_id, report_format, json.dumps(params, default=float), download_name, time.time())
+        )
+        self._purge_expired()
+        self._start_dispatcher()
+        self._wake.set()
+        return job_id
+
+    def get(self, job_id):
+        """The job's row as a dict, or None."""
+        row = self._conn().execute(
+            f"SELECT {', '.join(JOB_COLUMNS)} FROM report_jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return dict(zip(JOB_COLUMNS, row)) if row else None
+
+    def wait(self, job_id, timeout=0):
+        """The job once it has finished, or as it stands after timeout seconds."""
+        # Jobs left queued by a worker that has since exited are picked up by whichever worker is polled
+        self._start_dispatcher()
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job['status'] in ('done', 'failed') or time.monotonic() >= deadline:
+                return job
+            time.sleep(0.1)
+
+    def _purge_expired(self):
+        conn = self._conn()
+        cutoff = time.time() - JOB_RETENTION
+        expired = conn.execute(
+            "SELECT job_id, output_path FROM report_jobs WHERE status IN ('done', 'failed') AND finished_at < ?",
+            (cutoff,)
+        ).fetchall()
+        for job_id, output_path in expired:
+            if output_path:
+                try:
+                    os.remove(output_path)
+                except FileNotFoundError:
+                    pass
+            conn.execute('DELETE FROM report_jobs WHERE job_id = ?', (job_id,))
+
+    # -------------------------------------------------------------------------
+    # Dispatching
+    # -------------------------------------------------------------------------
+    def _start_dispatcher(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # First use in this process (a forked worker inherits neither the thread nor the pool)
+            self._pid = os.getpid()
+            self._executor = None
+            self._wake = threading.Event()
+            threading.Thread(target=self._dispatch_loop, name='report-jobs', daemon=True).start()
+
+    def _render_pool(self):
+        if self._executor is None:
+            # forkserver: pool processes never inherit this worker's threads or locks
+            context = multiprocessing.get_context('forkserver')
+            context.set_forkserver_preload(['pdf_generation', 'word_generation'])
+            self._executor = ProcessPoolExecutor(self.max_workers, mp_context=context,
+                                                 initializer=_init_render_process)
+        return self._executor
+
+    def _dispatch_loop(self):
+        while True:
+            try:
+                job = self._claim()
+            except Exception as e:
+                logger.error(f"Error claiming report job: {e}")
+                job = None
+            if job is None:
+                self._wake.wait(DISPATCH_POLL_SECONDS)
+                self._wake.clear()
+                continue
+
+            job_id, report_format, params = job
+            os.makedirs(self.output_dir, exist_ok=True)
+            output_path = os.path.join(self.output_dir, job_id + REPORT_FORMATS[report_format][0])
+            try:
+                future = self._render_pool().submit(render_report, report_format, json.loads(params), output_path)
+            except BrokenProcessPool as e:
+                self._executor = None
+                self._finish(job_id, report_format, error=str(e))
+                continue
+            except RuntimeError as e:
+                # The pool has been shut down (worker or interpreter exit): hand the job
+                # back for another worker and stop dispatching in this process
+                logger.warning(f"Report pool unavailable, requeuing job {job_id}: {e}")
+                self._requeue(job_id)
+                with self._lock:
+                    self._pid = None
+                return
+            future.add_done_callback(lambda f, job_id=job_id, report_format=report_format: self._rendered(job_id, report_format, f))
+
+    def _claim(self):
+        """
+        Mark the oldest queued job running and return (job_id, format, params), or None
+        if nothing is queued or REPORT_WORKERS jobs are already rendering.
+        """
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._requeue_orphans(conn)
+            running = conn.execute("SELECT COUNT(*) FROM report_jobs WHERE status = 'running'").fetchone()[0]
+            row = None
+            if running < self.max_workers:
+                row = conn.execute(
+                    "SELECT job_id, format, params FROM report_jobs WHERE status = 'queued' "
+                    'ORDER BY created_at LIMIT 1'
+                ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE report_jobs SET status = 'running', runner_pid = ?, started_at = ?, "
+                    'attempts = attempts + 1 WHERE job_id = ?',
+                    (os.getpid(), time.time(), row[0])
+                )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return row
+
+    def _requeue_orphans(self, conn):
+        """Queue again (or fail) running jobs whose dispatching process has exited."""
+        running = conn.execute(
+            "SELECT job_id, format, runner_pid, attempts FROM report_jobs WHERE status = 'running'"
+        ).fetchall()
+        for job_id, report_format, runner_pid, attempts in running:
+            if runner_pid is None or _process_alive(runner_pid):
+                continue
+            if attempts >= MAX_ATTEMPTS:
+                conn.execute(
+                    "UPDATE report_jobs SET status = 'failed', error = ?, finished_at = ? WHERE job_id = ?",
+                    ('The report renderer stopped before finishing', time.time(), job_id)
+                )
+                REPORT_JOBS.inc(format=report_format, outcome='failed')
+            else:
+                logger.warning(f"Requeuing report job {job_id} left running by exited process {runner_pid}")
+                conn.execute("UPDATE report_jobs SET status = 'queued', runner_pid = NULL WHERE job_id = ?", (job_id,))
+
+    def _requeue(self, job_id):
+        """Return a claimed job to the queue without counting the attempt."""
+        self._conn().execute(
+            "UPDATE report_jobs SET status = 'queued', runner_pid = NULL, started_at = NULL, "
+            'attempts = attempts - 1 WHERE job_id = ?',
+            (job_id,)
+        )
+
+    def _rendered(self, job_id, report_format, future):
+        try:
+            output_path = future.result()
+        except BrokenProcessPool as e:
+            logger.error(f"Report renderer crashed during job {job_id}: {e}")
+            self._executor = None
+            self._finish(job_id, report_format, error=f"Report renderer crashed: {e}")
+        except Exception as e:
+            logger.error(f"Report job {job_id} failed: {e}")
+            self._finish(job_id, report_format, error=str(e))
+        else:
+            self._finish(job_id, report_format, output_path=output_path)
+        self._wake.set()
+
+    def _finish(self, job_id, report_format, output_path=None, error=None):
+        status = 'failed' if error else 'done'
+        self._conn().execute(
+            'UPDATE report_jobs SET status = ?, output_path = ?, error = ?, finished_at = ? WHERE job_id = ?',
+            (status, output_path, error, time.time(), job_id)
+        )
+        REPORT_JOBS.inc(format=report_format, outcome=status)
+
+
+_queues = {}
+_queues_lock = threading.Lock()
+
+
+def get_report_jobs(db_path=None):
+    """Shared ReportJobQueue for a datastore database."""
+    queue = _queues.get(db_path)
+    if queue is None:
+        with _queues_lock:
+            queue = _queues.get(db_path)
+            if queue is None:
+                queue = ReportJobQueue(db_path)
+                _queues[db_path] = queue
+    return queue
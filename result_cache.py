@@ -0,0 +1,230 @@
+# =============================================================================
+# CALCULATION RESULT CACHE
+# =============================================================================
+"""
+Cache of finished /calculate results (the rendered page and the session values
+the report downloads read), so an identical submission - a double-click, a
+back/forward resubmit, a colleague re-running the same case - skips the pipeline.
+
+Entries are keyed on a hash of the parsed case (so "50000" and "50000.00", field
+order and fields the case schema does not read make no difference), the T-Bill
+rate data version, the versions of the tax rules and contingency tables, and the
+calculation date. Two backends:
+
+    MemoryResultCache   per process, LRU with a TTL
+    SQLiteResultCache   shared by all gunicorn workers through the datastore
+                        database, LRU by last access with a TTL
+
+New rates change the data version, so old entries are never served. Both
+backends also drop them: the memory cache when it first sees the new version,
+and the SQLite cache through a trigger on the rate version, so the purge happens
+in the same transaction as the tbill_updater write.
+"""
+import collections
+import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from functools import lru_cache
+
+from datastore import RATE_SCHEMA, get_connection
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached value changes shape (e.g. the results template's inputs)
+CACHE_FORMAT_VERSION = 3
+
+RESULT_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS result_cache (
+    cache_key TEXT PRIMARY KEY,
+    rates_version INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    value TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS result_cache_accessed ON result_cache (accessed_at);
+
+CREATE TRIGGER IF NOT EXISTS result_cache_rates_inserted AFTER INSERT ON store_meta
+WHEN NEW.key = 'rates_version'
+BEGIN
+    DELETE FROM result_cache;
+END;
+
+CREATE TRIGGER IF NOT EXISTS result_cache_rates_updated AFTER UPDATE ON store_meta
+WHEN NEW.key = 'rates_version'
+BEGIN
+    DELETE FROM result_cache;
+END;
+"""
+
+
+def _json_value(value):
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    raise TypeError(f"Cannot hash {type(value).__name__} in a case key")
+
+
+@lru_cache(maxsize=None)
+def tax_rules_version():
+    """Fingerprint of the tax brackets and payroll parameters in tax_calculations."""
+    import tax_calculations as tax
+
+    rules = [
+        tax.TAX_YEAR, tax.FEDERAL_BRACKETS, tax.PROVINCIAL_BRACKETS,
+        tax.CPP_RATE, tax.CPP_MAX_EARNINGS, tax.CPP_EXEMPTION, tax.CPP2_RATE, tax.CPP2_MAX_EARNINGS,
+        tax.EI_RATE, tax.EI_MAX_EARNINGS, tax.DEPENDENT_AMOUNT, tax.DEPENDENT_MAX,
+    ]
+    return hashlib.sha256(json.dumps(rules, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def table_versions(contingency_tables_path):
+    """Versions of the tables a calculation reads besides the rates: the tax rules and the contingency file's mtime."""
+    try:
+        contingency_version = os.path.getmtime(contingency_tables_path)
+    except (OSError, TypeError):
+        contingency_version = None
+    return {'tax_rules': tax_rules_version(), 'contingency_tables': contingency_version}
+
+
+def case_key(case, rates_version, calculation_date, exact=False, tables=None):
+    """
+    Canonical hash of a parsed case.
+
+    Args:
+        case: case_schema.Case from parse_case
+        rates_version: RateStore.data_version() at calculation time
+        calculation_date: The date interest and ages are calculated to
+        exact: Whether exact-cent mode is on
+        tables: table_versions() at calculation time
+    """
+    payload = json.dumps({
+        'format': CACHE_FORMAT_VERSION,
+        'case': case.as_dict(),
+        'rates_version': rates_version,
+        'tables': tables,
+        'calculation_date': calculation_date.isoformat(),
+        'exact': bool(exact),
+    }, sort_keys=True, separators=(',', ':'), default=_json_value)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class MemoryResultCache:
+    """LRU result cache with a TTL, private to one process."""
+
+    def __init__(self, max_entries=128, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()
+        self._rates_version = None
+        self._lock = threading.Lock()
+
+    def _check_version(self, rates_version):
+        if rates_version != self._rates_version:
+            self._entries.clear()
+            self._rates_version = rates_version
+
+    def get(self, key, rates_version):
+        with self._lock:
+            self._check_version(rates_version)
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created_at, value = entry
+            if time.time() - created_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, rates_version, value):
+        with self._lock:
+            self._check_version(rates_version)
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteResultCache:
+    """LRU result cache with a TTL in the datastore database, shared by all processes."""
+
+    def __init__(self, db_path=None, max_entries=1000, ttl=3600):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._conn().executescript(RATE_SCHEMA + RESULT_CACHE_SCHEMA)
+
+    def _conn(self):
+        return get_connection(self.db_path)
+
+    def get(self, key, rates_version):
+        conn = self._conn()
+        row = conn.execute(
+            'SELECT value, created_at, rates_version FROM result_cache WHERE cache_key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, created_at, entry_version = row
+        now = time.time()
+        if now - created_at > self.ttl or entry_version != rates_version:
+            conn.execute('DELETE FROM result_cache WHERE cache_key = ?', (key,))
+            return None
+        conn.execute('UPDATE result_cache SET accessed_at = ? WHERE cache_key = ?', (now, key))
+        return json.loads(value)
+
+    def put(self, key, rates_version, value):
+        now = time.time()
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                'INSERT OR REPLACE INTO result_cache (cache_key, rates_version, created_at, accessed_at, value) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, rates_version, now, now, json.dumps(value, separators=(',', ':')))
+            )
+            conn.execute('DELETE FROM result_cache WHERE created_at < ?', (now - self.ttl,))
+            conn.execute(
+                'DELETE FROM result_cache WHERE cache_key IN '
+                '(SELECT cache_key FROM result_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def clear(self):
+        self._conn().execute('DELETE FROM result_cache')
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_result_cache(backend, max_entries, ttl, db_path=None):
+    """
+    Shared result cache for a backend ('memory' or 'sqlite'), or None if caching is off.
+    """
+    if backend not in ('memory', 'sqlite'):
+        return None
+    key = (backend, max_entries, ttl, db_path)
+    cache = _caches.get(key)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(key)
+            if cache is None:
+                if backend == 'memory':
+                    cache = MemoryResultCache(max_entries, ttl)
+                else:
+                    cache = SQLiteResultCache(db_path, max_entries, ttl)
+                logger.info(f"Result cache: {backend}, {max_entries} entries, TTL {ttl}s")
+                _caches[key] = cache
+    return cache
@@ -0,0 +1,97 @@
+# =============================================================================
+# FUTURE LOSS SENSITIVITY ANALYSIS
+# =============================================================================
+import numpy as np
+
+from lost_wages_calculations import time_horizon_to_retirement
+
+# Default grid counsel ask for: 1.5% to 4.5% discount rates, retirement at 60 to 70
+DEFAULT_DISCOUNT_RATES = tuple(np.round(np.arange(1.5, 4.5001, 0.5), 4))
+DEFAULT_RETIREMENT_AGES = tuple(range(60, 71))
+
+# Guard against accidental huge grids from the API
+MAX_GRID_CELLS = 10000
+
+
+def present_value_grid(annual_lost_wages, discount_rates, time_horizons):
+    """
+    Present value of future lost wages for every (discount rate, horizon) pair.
+
+    Same annuity formula as calculate_future_lost_wages_annuity,
+    PV = PMT × (1 - (1 + r)^-n) / r (PMT × n when r is 0), evaluated in a single
+    NumPy broadcast over the two arrays.
+
+    Args:
+        annual_lost_wages: Annual net lost wages
+        discount_rates: Sequence of annual discount rates as decimals (0.025 for 2.5%)
+        time_horizons: Sequence of horizons in years
+
+    Returns:
+        2-D array of present values, shape (len(discount_rates), len(time_horizons)), rounded to cents
+    """
+    rates = np.asarray(discount_rates, dtype=float)[:, np.newaxis]
+    horizons = np.maximum(np.asarray(time_horizons, dtype=float), 0.0)[np.newaxis, :]
+
+    zero_rate = rates == 0
+    safe_rates = np.where(zero_rate, 1.0, rates)
+    annuity_factor = np.where(zero_rate, horizons, (1.0 - (1.0 + safe_rates) ** -horizons) / safe_rates)
+
+    return np.round(annual_lost_wages * annuity_factor, 2)
+
+
+def calculate_future_loss_sensitivity(annual_lost_wages, discount_rates=None, time_horizons=None,
+                                      birthdate=None, start_date=None, retirement_ages=None):
+    """
+    Build the discount-rate × horizon sensitivity grid for the results page and API.
+
+    Horizons are either given directly or derived from birthdate, start_date and a
+    range of retirement ages (the same way /calculate derives the total-disability horizon).
+
+    Args:
+        annual_lost_wages: Annual net lost wages (net of collateral benefits)
+        discount_rates: Discount rates in percent (defaults to 1.5% to 4.5%)
+        time_horizons: Horizons in years (used when no retirement ages are given)
+        birthdate: Claimant's date of birth (datetime.date)
+        start_date: Start date of future losses (datetime.date)
+        retirement_ages: Retirement ages (defaults to 60 to 70 when birthdate and start_date are given)
+
+    Returns:
+        Dictionary with the axes, the present-value matrix and chart-ready series
+    """
+    rates_percent = [float(rate) for rate in (discount_rates if discount_rates is not None else DEFAULT_DISCOUNT_RATES)]
+
+    if birthdate is not None and start_date is not None:
+        ages = [int(age) for age in (retirement_ages if retirement_ages is not None else DEFAULT_RETIREMENT_AGES)]
+        horizons = [time_horizon_to_retirement(birthdate, age, start_date) for age in ages]
+    elif time_horizons is not None:
+        ages = None
+        horizons = [float(horizon) for horizon in time_horizons]
+    else:
+        raise ValueError("Provide time_horizons, or birthdate and start_date")
+
+    if not rates_percent or not horizons:
+        raise ValueError("Discount rates and horizons must not be empty")
+    if len(rates_percent) * len(horizons) > MAX_GRID_CELLS:
+        raise ValueError(f"Sensitivity grid is limited to {MAX_GRID_CELLS} cells")
+
+    grid = present_value_grid(annual_lost_wages, np.asarray(rates_percent) / 100, horizons)
+    matrix = grid.tolist()
+
+    column_labels = [f"Age {age}" for age in ages] if ages is not None else [f"{horizon:.2f} yrs" for horizon in horizons]
+
+    return {
+        "annual_lost_wages": annual_lost_wages,
+        "discount_rates": rates_percent,
+        "retirement_ages": ages,
+        "time_horizons": [round(horizon, 4) for horizon in horizons],
+        "present_values": matrix,
+        "min_present_value": float(grid.min()),
+        "max_present_value": float(grid.max()),
+        "chart": {
+            "labels": column_labels,
+            "datasets": [
+                {"label": f"{rate:.2f}%", "data": row}
+                for rate, row in zip(rates_percent, matrix)
+            ]
+        }
+    }
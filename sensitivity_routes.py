@@ -0,0 +1,128 @@
+from flask import Blueprint, request, jsonify, current_app
+from datetime import datetime
+import time
+
+# Create a Blueprint for future-loss sensitivity routes
+sensitivity_routes = Blueprint('sensitivity', __name__)
+
+# Largest simulation a request may ask for; runs this size take well under a
+# second in-process, so requests never start a process pool
+MAX_SIMULATION_PATHS = 200000
+
+def _parse_date(value):
+    if not value:
+        return None
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+def _parse_range(data, key, start, stop, step):
+    """Read an explicit list, or build one from {key}_min/{key}_max/{key}_step."""
+    if data.get(key) is not None:
+        return [float(value) for value in data[key]]
+    low = float(data.get(f'{key}_min', start))
+    high = float(data.get(f'{key}_max', stop))
+    step = float(data.get(f'{key}_step', step))
+    if step <= 0 or high < low:
+        raise ValueError(f"Invalid range for {key}")
+    count = int(round((high - low) / step)) + 1
+    return [round(low + i * step, 6) for i in range(count)]
+
+@sensitivity_routes.route('/api/future-loss-sensitivity', methods=['POST'])
+def api_future_loss_sensitivity():
+    """
+    Present value of future lost wages over a grid of discount rates and horizons.
+
+    JSON body:
+        annual_lost_wages: Annual net lost wages (required)
+        discount_rates or discount_rates_min/_max/_step: Rates in percent (default 1.5-4.5 by 0.5)
+        birthdate, start_date and retirement_ages or retirement_ages_min/_max/_step (default 60-70), or
+        time_horizons: Horizons in years
+    """
+    # NumPy is only loaded when a sensitivity grid is actually requested
+    from sensitivity_analysis import calculate_future_loss_sensitivity
+
+    data = request.get_json(silent=True) or {}
+
+    if data.get('annual_lost_wages') is None:
+        return jsonify({'error': 'Annual lost wages is required'}), 400
+
+    try:
+        start = time.perf_counter()
+        annual_lost_wages = float(data['annual_lost_wages'])
+        discount_rates = _parse_range(data, 'discount_rates', 1.5, 4.5, 0.5)
+
+        birthdate = _parse_date(data.get('birthdate'))
+        start_date = _parse_date(data.get('start_date'))
+        retirement_ages = None
+        if birthdate and start_date:
+            retirement_ages = [int(age) for age in _parse_range(data, 'retirement_ages', 60, 70, 1)]
+
+        result = calculate_future_loss_sensitivity(
+            annual_lost_wages,
+            discount_rates=discount_rates,
+            time_horizons=data.get('time_horizons'),
+            birthdate=birthdate,
+            start_date=start_date,
+            retirement_ages=retirement_ages
+        )
+        result['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        return jsonify(result)
+
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
+
+@sensitivity_routes.route('/api/future-loss-simulation', methods=['POST'])
+def api_future_loss_simulation():
+    """
+    Monte Carlo distribution of the present value of future lost wages with contingencies.
+
+    JSON body:
+        annual_lost_wages, discount_rate (percent): required
+        start_age and retirement_age, or birthdate, start_date and retirement_age
+        mortality, disability, unemployment: Annual probabilities indexed by age (optional;
+            default to the installed contingency tables for `sex`)
+        sex: M or F, used with the installed contingency tables
+        paths (default 10000, at most MAX_SIMULATION_PATHS) and seed (optional)
+    """
+    from contingency_simulation import simulate_future_loss
+    from contingency_tables import get_contingency_tables
+
+    data = request.get_json(silent=True) or {}
+
+    if data.get('annual_lost_wages') is None or data.get('discount_rate') is None:
+        return jsonify({'error': 'Annual lost wages and discount rate are required'}), 400
+
+    try:
+        start = time.perf_counter()
+        retirement_age = float(data.get('retirement_age', 65))
+        birthdate = _parse_date(data.get('birthdate'))
+        start_date = _parse_date(data.get('start_date'))
+        if birthdate and start_date:
+            start_age = (start_date - birthdate).days / 365.25
+        elif data.get('start_age') is not None:
+            start_age = float(data['start_age'])
+        else:
+            raise ValueError("Provide start_age, or birthdate and start_date")
+
+        paths = int(data.get('paths', 10000))
+        if not 0 < paths <= MAX_SIMULATION_PATHS:
+            raise ValueError(f"Paths must be between 1 and {MAX_SIMULATION_PATHS}")
+
+        result = simulate_future_loss(
+            float(data['annual_lost_wages']),
+            start_age,
+            retirement_age,
+            float(data['discount_rate']) / 100,
+            mortality=data.get('mortality'),
+            disability=data.get('disability'),
+            unemployment=data.get('unemployment'),
+            paths=paths,
+            seed=data.get('seed'),
+            processes=1,
+            tables=get_contingency_tables(current_app.config.get('CONTINGENCY_TABLES_PATH')),
+            sex=data.get('sex', 'U')
+        )
+        result['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        return jsonify(result)
+
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
@@ -0,0 +1,151 @@
+# =============================================================================
+# PER-STAGE REQUEST TIMING
+# =============================================================================
+"""
+Lightweight stage timers for the damages pipeline and report generators.
+
+Code marks a stage with `with stage('tax'):` (or the @timed_stage decorator).
+Timings are only collected while a request is being timed: StageTimingMiddleware
+starts a collection per request, adds a Server-Timing header with every stage
+and the total, and logs one structured record per request. Outside a timed
+request stage() returns a shared no-op context manager, so instrumented code
+costs one context-variable lookup when timing is disabled.
+"""
+import contextvars
+import functools
+import json
+import logging
+import time
+
+from flask.sessions import SecureCookieSessionInterface
+
+logger = logging.getLogger(__name__)
+
+_timings = contextvars.ContextVar('stage_timings', default=None)
+
+
+class _Stage:
+    __slots__ = ('name', 'timings', 'start')
+
+    def __init__(self, name, timings):
+        self.name = name
+        self.timings = timings
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.timings.append((self.name, time.perf_counter() - self.start))
+        return False
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name):
+    """Context manager timing one stage of the current request (a no-op when timing is off)."""
+    timings = _timings.get()
+    if timings is None:
+        return _NULL_STAGE
+    return _Stage(name, timings)
+
+
+def timed_stage(name):
+    """Decorator form of stage() for functions that are a stage as a whole."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def collect():
+    """Start collecting stage timings in this context; returns a token for finish()."""
+    return _timings.set([])
+
+
+def finish(token):
+    """Stop collecting and return the (name, seconds) pairs recorded since collect()."""
+    timings = _timings.get() or []
+    _timings.reset(token)
+    return timings
+
+
+def summarize(timings):
+    """Total seconds per stage name, in first-seen order (stages may repeat, e.g. a rate lookup per call)."""
+    totals = {}
+    for name, seconds in timings:
+        totals[name] = totals.get(name, 0.0) + seconds
+    return totals
+
+
+def server_timing_header(totals, total=None):
+    """Server-Timing header value: 'tax;dur=0.41, pji;dur=3.02, total;dur=12.80' (milliseconds)."""
+    entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in totals.items()]
+    if total is not None:
+        entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
+
+
+class StageTimingMiddleware:
+    """
+    WSGI middleware timing each request and the stages marked inside it.
+
+    Wraps the whole Flask request, so session saving and template rendering are
+    inside the total. Requests taking at least log_threshold_ms are logged as a
+    JSON record: method, path, status, total_ms and stages_ms.
+    """
+
+    def __init__(self, wsgi_app, log_threshold_ms=0.0):
+        self.wsgi_app = wsgi_app
+        self.log_threshold_ms = log_threshold_ms
+
+    def __call__(self, environ, start_response):
+        token = collect()
+        start = time.perf_counter()
+
+        def timed_start_response(status, headers, exc_info=None):
+            total = time.perf_counter() - start
+            totals = summarize(_timings.get() or [])
+            headers.append(('Server-Timing', server_timing_header(totals, total)))
+            if total * 1000 >= self.log_threshold_ms:
+                record = {
+                    "event": "request_timing",
+                    "method": environ.get('REQUEST_METHOD'),
+                    "path": environ.get('PATH_INFO'),
+                    "status": int(status.split(' ', 1)[0]),
+                    "total_ms": round(total * 1000, 2),
+                    "stages_ms": {name: round(seconds * 1000, 2) for name, seconds in totals.items()}
+                }
+                logger.info(f"request_timing {json.dumps(record)}", extra={"timing": record})
+            return start_response(status, headers, exc_info)
+
+        try:
+            return self.wsgi_app(environ, timed_start_response)
+        finally:
+            finish(token)
+
+
+class TimedSessionInterface(SecureCookieSessionInterface):
+    """Signed cookie sessions with loading and saving timed as the 'session' stage."""
+
+    def open_session(self, app, request):
+        with stage('session'):
+            return super().open_session(app, request)
+
+    def save_session(self, app, session, response):
+        with stage('session'):
+            return super().save_session(app, session, response)
@@ -2,10 +2,74 @@
 # TAX CALCULATION FUNCTIONS
 # =============================================================================
 
+# Tax year of the brackets and payroll parameters below; tax_tables indexes them
+# from this year for projected years
+TAX_YEAR = 2024
+
+# Payroll contribution parameters
+CPP_RATE = 0.0595
+CPP_MAX_EARNINGS = 68500
+CPP_EXEMPTION = 3500
+CPP2_RATE = 0.04
+CPP2_MAX_EARNINGS = 73200
+EI_RATE = 0.0166
+EI_MAX_EARNINGS = 63200
+
+# Dependent benefit: amount per dependent under 18, and the overall maximum
+DEPENDENT_AMOUNT = 2616
+DEPENDENT_MAX = 8375
+
+# Income tax brackets as (lower, upper, rate)
+FEDERAL_BRACKETS = [
+    (0, 15705, 0.00),
+    (15705, 55867, 0.15),
+    (55867, 111733, 0.205),
+    (111733, 173205, 0.26),
+    (173205, 246752, 0.29),
+    (246752, float('inf'), 0.33)
+]
+
+PROVINCIAL_BRACKETS = {
+    "nova scotia": [
+        (0, 8481, 0.00),
+        (8481, 29590, 0.0879),
+        (29590, 59180, 0.1495),
+        (59180, 93000, 0.1667),
+        (93000, 150000, 0.175),
+        (150000, float('inf'), 0.21)
+    ],
+    "newfoundland": [
+        (0, 10818, 0.00),
+        (10818, 43198, 0.087),
+        (43198, 86395, 0.145),
+        (86395, 154244, 0.158),
+        (154244, 215943, 0.178),
+        (215943, 275870, 0.198),
+        (275870, 551739, 0.208),
+        (551739, 1103478, 0.213),
+        (1103478, float('inf'), 0.218)
+    ],
+    "new brunswick": [
+        (0, 13044, 0.00),
+        (13044, 49958, 0.094),
+        (49958, 99916, 0.14),
+        (99916, 185064, 0.16),
+        (185064, float('inf'), 0.195)
+    ],
+    "prince edward island": [
+        (0, 14250, 0.00),
+        (14250, 32656, 0.0965),
+        (32656, 64313, 0.1363),
+        (64313, 105000, 0.1665),
+        (105000, 140000, 0.18),
+        (140000, float('inf'), 0.1875)
+    ]
+}
+
 def calculate_dependent_benefit(dependents):
     """Calculate dependent benefit based on number of dependents under 18."""
     # $2,616 per dependent, max of $8,375
-    benefit = min(int(dependents) * 2616, 8375)
+    benefit = min(int(dependents) * DEPENDENT_AMOUNT, DEPENDENT_MAX)
     return benefit
 
 def calculate_federal_tax(income, dependents=0):
@@ -16,17 +80,8 @@ def calculate_federal_tax(income, dependents=0):
     # Reduce taxable income by dependent benefit
     taxable_income = max(income - dependent_benefit, 0)
     
-    federal_brackets = [
-        (0, 15705, 0.00),
-        (15705, 55867, 0.15),
-        (55867, 111733, 0.205),
-        (111733, 173205, 0.26),
-        (173205, 246752, 0.29),
-        (246752, float('inf'), 0.33)
-    ]
-    
     federal_tax = 0
-    for lower, upper, rate in federal_brackets:
+    for lower, upper, rate in FEDERAL_BRACKETS:
         if taxable_income > lower:
             taxable_income_in_bracket = min(taxable_income, upper) - lower
             federal_tax += taxable_income_in_bracket * rate
@@ -36,12 +91,12 @@ def calculate_federal_tax(income, dependents=0):
 
 def calculate_cpp_contributions(income):
     """Calculate Canada Pension Plan contributions."""
-    cpp_rate = 0.0595  
-    cpp_max_earnings = 68500
-    cpp_exemption = 3500
+    cpp_rate = CPP_RATE
+    cpp_max_earnings = CPP_MAX_EARNINGS
+    cpp_exemption = CPP_EXEMPTION
 
-    cpp2_rate = 0.04  
-    cpp2_max_earnings = 73200
+    cpp2_rate = CPP2_RATE
+    cpp2_max_earnings = CPP2_MAX_EARNINGS
 
     cpp_contribution = min((min(income, cpp_max_earnings) - cpp_exemption) * cpp_rate, (cpp_max_earnings - cpp_exemption) * cpp_rate) if income > cpp_exemption else 0
     cpp2_contribution = min((min(income, cpp2_max_earnings) - cpp_max_earnings) * cpp2_rate, (cpp2_max_earnings - cpp_max_earnings) * cpp2_rate) if income > cpp_max_earnings else 0
@@ -50,8 +105,8 @@ def calculate_cpp_contributions(income):
 
 def calculate_ei_contribution(income):
     """Calculate Employment Insurance contribution."""
-    ei_rate = 0.0166  
-    ei_max_earnings = 63200  
+    ei_rate = EI_RATE
+    ei_max_earnings = EI_MAX_EARNINGS
     return round(min(income, ei_max_earnings) * ei_rate, 2)
 
 def calculate_provincial_tax(income, province, dependents=0):
@@ -62,45 +117,8 @@ def calculate_provincial_tax(income, province, dependents=0):
     # Reduce taxable income by dependent benefit
     taxable_income = max(income - dependent_benefit, 0)
     
-    tax_brackets = {
-        "nova scotia": [
-            (0, 8481, 0.00),
-            (8481, 29590, 0.0879),
-            (29590, 59180, 0.1495),
-            (59180, 93000, 0.1667),
-            (93000, 150000, 0.175),
-            (150000, float('inf'), 0.21)
-        ],
-        "newfoundland": [
-            (0, 10818, 0.00),
-            (10818, 43198, 0.087),
-            (43198, 86395, 0.145),
-            (86395, 154244, 0.158),
-            (154244, 215943, 0.178),
-            (215943, 275870, 0.198),
-            (275870, 551739, 0.208),
-            (551739, 1103478, 0.213),
-            (1103478, float('inf'), 0.218)
-        ],
-        "new brunswick": [
-            (0, 13044, 0.00),
-            (13044, 49958, 0.094),
-            (49958, 99916, 0.14),
-            (99916, 185064, 0.16),
-            (185064, float('inf'), 0.195)
-        ],
-        "prince edward island": [
-            (0, 14250, 0.00),
-            (14250, 32656, 0.0965),
-            (32656, 64313, 0.1363),
-            (64313, 105000, 0.1665),
-            (105000, 140000, 0.18),
-            (140000, float('inf'), 0.1875)
-        ]
-    }
-    
     provincial_tax = 0
-    for lower, upper, rate in tax_brackets[province]:
+    for lower, upper, rate in PROVINCIAL_BRACKETS[province]:
         if taxable_income > lower:
             taxable_amount = min(taxable_income, upper) - lower
             provincial_tax += taxable_amount * rate
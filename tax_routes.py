@@ -0,0 +1,86 @@
+from flask import Blueprint, request, jsonify
+
+# Create a Blueprint for income reconstruction and net income curve routes
+tax_routes = Blueprint('tax', __name__)
+
+# Pay periods per year for net pay taken from pay stubs
+PAY_PERIODS = {
+    'annual': 1,
+    'monthly': 12,
+    'semi-monthly': 24,
+    'biweekly': 26,
+    'weekly': 52,
+}
+
+@tax_routes.route('/api/net-to-gross', methods=['POST'])
+def api_net_to_gross():
+    """
+    Gross annual income that reproduces a net pay under the /calculate deductions.
+
+    JSON body:
+        net_pay: Net pay for one pay period, or net_pays: a list of them (required)
+        pay_period: annual, monthly, semi-monthly, biweekly or weekly (default annual)
+        province: Province name (required)
+        dependents: Number of dependents under 18 (default 0)
+
+    A single net_pay also returns the calculate_take_home breakdown for the gross found.
+    """
+    from net_to_gross import gross_from_net, gross_from_net_batch
+    from income_calculations import calculate_take_home
+    from damages_results import labelled_take_home
+
+    data = request.get_json(silent=True) or {}
+    province = (data.get('province') or '').lower()
+    if not province:
+        return jsonify({'error': 'Province is required'}), 400
+
+    try:
+        periods = PAY_PERIODS[data.get('pay_period', 'annual')]
+    except KeyError:
+        return jsonify({'error': f"Unknown pay period: {data.get('pay_period')}"}), 400
+
+    try:
+        dependents = int(data.get('dependents', 0))
+        if data.get('net_pays') is not None:
+            annual_nets = [float(value) * periods for value in data['net_pays']]
+            grosses = gross_from_net_batch(annual_nets, province, dependents)
+            return jsonify({'province': province, 'dependents': dependents, 'gross_incomes': grosses.tolist()})
+
+        if data.get('net_pay') is None:
+            return jsonify({'error': 'Net pay is required'}), 400
+        gross = gross_from_net(float(data['net_pay']) * periods, province, dependents)
+        return jsonify({
+            'province': province,
+            'dependents': dependents,
+            'gross_income': gross,
+            'take_home': labelled_take_home(calculate_take_home(gross, province, 260, 8, dependents=dependents))
+        })
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
+
+@tax_routes.route('/api/marginal-rates', methods=['GET'])
+def api_marginal_rates():
+    """
+    Marginal deduction rate bands of the net income curve.
+
+    Query parameters: province (required), dependents (default 0), year (default: the
+    brackets /calculate uses), income (optional; marks its band and returns its net income)
+    """
+    from net_income_curve import get_net_income_curve
+
+    province = (request.args.get('province') or '').lower()
+    if not province:
+        return jsonify({'error': 'Province is required'}), 400
+
+    try:
+        year = request.args.get('year', type=int)
+        curve = get_net_income_curve(province, request.args.get('dependents', 0, type=int), year)
+        income = request.args.get('income', type=float)
+        result = {'province': province, 'dependents': curve.dependents, 'year': year, 'bands': curve.rows(income)}
+        if income is not None:
+            result['income'] = income
+            result['net_income'] = round(float(curve.net(income)), 2)
+            result['marginal_rate'] = float(curve.marginal_rate(income))
+        return jsonify(result)
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
@@ -0,0 +1,219 @@
+# =============================================================================
+# YEAR-SPECIFIC TAX TABLES AND BATCHED NET-INCOME CALCULATION
+# =============================================================================
+import logging
+import os
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+from metrics import CACHE_LOOKUPS
+from tax_calculations import (
+    calculate_dependent_benefit, FEDERAL_BRACKETS, PROVINCIAL_BRACKETS, TAX_YEAR,
+    CPP_RATE, CPP_MAX_EARNINGS, CPP_EXEMPTION, CPP2_RATE, CPP2_MAX_EARNINGS,
+    EI_RATE, EI_MAX_EARNINGS
+)
+
+logger = logging.getLogger(__name__)
+
+TAX_RATES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'Tax_Rates_Historical.xlsx')
+
+# Province names used by the application -> codes in the tax rate file
+PROVINCE_CODES = {
+    'nova scotia': 'NS',
+    'newfoundland': 'NL',
+    'new brunswick': 'NB',
+    'prince edward island': 'PE',
+}
+
+# Default annual indexation of bracket thresholds and contribution maximums beyond the last table year
+DEFAULT_INDEXATION = 0.02
+
+
+class TaxTables:
+    """
+    Bracket thresholds and rates by year and jurisdiction, stacked into padded
+    arrays so tax for a vector of (income, year) pairs is one NumPy evaluation.
+
+    Tax is computed in marginal form, sum over brackets of
+    (rate_k - rate_{k-1}) × max(income - threshold_k, 0), with unused brackets
+    padded with an infinite threshold. Years after the base year (the last
+    table year) reuse the last table with thresholds indexed by `indexation` a
+    year; earlier years use the first table. The CPP and EI maximums from
+    tax_calculations are TAX_YEAR's and are indexed from TAX_YEAR at the same
+    rate, whatever the last table year, so every table set gives the same
+    maximums for a year.
+    """
+
+    def __init__(self, rows, indexation=DEFAULT_INDEXATION):
+        """
+        Args:
+            rows: Iterable of (year, jurisdiction, threshold, rate)
+            indexation: Annual threshold indexation for years beyond the tables
+        """
+        self.indexation = indexation
+        tables = {}
+        for year, jurisdiction, threshold, rate in rows:
+            tables.setdefault(str(jurisdiction), {}).setdefault(int(year), []).append((float(threshold), float(rate)))
+
+        self.years = {}
+        self.thresholds = {}
+        self.marginal_rates = {}
+        for jurisdiction, by_year in tables.items():
+            years = sorted(by_year)
+            width = max(len(brackets) for brackets in by_year.values())
+            thresholds = np.full((len(years), width), np.inf)
+            marginal = np.zeros((len(years), width))
+            for i, year in enumerate(years):
+                brackets = sorted(by_year[year])
+                thresholds[i, :len(brackets)] = [threshold for threshold, _ in brackets]
+                rates = np.array([rate for _, rate in brackets])
+                marginal[i, :len(brackets)] = np.diff(rates, prepend=0.0)
+            self.years[jurisdiction] = np.array(years)
+            self.thresholds[jurisdiction] = thresholds
+            self.marginal_rates[jurisdiction] = marginal
+        self.base_year = max(int(years[-1]) for years in self.years.values())
+
+    @property
+    def jurisdictions(self):
+        return sorted(self.years)
+
+    def _index_factor(self, years, base_year):
+        """Indexation multiplier for years after base_year (1 for earlier years)."""
+        return (1.0 + self.indexation) ** np.maximum(years - base_year, 0)
+
+    def bracket_tax(self, incomes, years, jurisdiction):
+        """
+        Tax on each income under its year's brackets.
+
+        Args:
+            incomes: Array of taxable incomes
+            years: Array of tax years (same shape as incomes, or a scalar)
+            jurisdiction: 'Federal' or a province code ('NS', 'NL', 'NB', 'PE')
+        """
+        if jurisdiction not in self.years:
+            raise ValueError(f"No tax tables for {jurisdiction}")
+        incomes = np.asarray(incomes, dtype=float)
+        years = np.broadcast_to(np.asarray(years, dtype=int), incomes.shape)
+
+        table_years = self.years[jurisdiction]
+        row = np.clip(np.searchsorted(table_years, years, side='right') - 1, 0, len(table_years) - 1)
+        thresholds = self.thresholds[jurisdiction][row] * self._index_factor(years, self.base_year)[..., np.newaxis]
+        over = np.maximum(incomes[..., np.newaxis] - thresholds, 0.0)
+        return (self.marginal_rates[jurisdiction][row] * over).sum(axis=-1)
+
+    def brackets(self, year, jurisdiction):
+        """(threshold, rate) pairs of one year's brackets, with thresholds indexed as in bracket_tax."""
+        if jurisdiction not in self.years:
+            raise ValueError(f"No tax tables for {jurisdiction}")
+        table_years = self.years[jurisdiction]
+        row = min(max(int(np.searchsorted(table_years, year, side='right')) - 1, 0), len(table_years) - 1)
+        factor = float(self._index_factor(int(year), self.base_year))
+        thresholds = self.thresholds[jurisdiction][row]
+        rates = np.cumsum(self.marginal_rates[jurisdiction][row])
+        return [(float(threshold) * factor, float(rate)) for threshold, rate in zip(thresholds, rates) if np.isfinite(threshold)]
+
+    def contribution_limits(self, year):
+        """CPP exemption and the CPP, CPP2 and EI maximum earnings for a year, indexed as in contributions."""
+        factor = float(self._index_factor(int(year), TAX_YEAR))
+        return CPP_EXEMPTION, CPP_MAX_EARNINGS * factor, CPP2_MAX_EARNINGS * factor, EI_MAX_EARNINGS * factor
+
+    def contributions(self, incomes, years):
+        """CPP, CPP2 and EI contributions with maximums indexed for years after TAX_YEAR."""
+        incomes = np.asarray(incomes, dtype=float)
+        factor = self._index_factor(np.broadcast_to(np.asarray(years), incomes.shape), TAX_YEAR)
+        cpp_max = CPP_MAX_EARNINGS * factor
+        cpp2_max = CPP2_MAX_EARNINGS * factor
+        cpp = np.clip(np.minimum(incomes, cpp_max) - CPP_EXEMPTION, 0.0, None) * CPP_RATE
+        cpp2 = np.clip(np.minimum(incomes, cpp2_max) - cpp_max, 0.0, None) * CPP2_RATE
+        ei = np.minimum(incomes, EI_MAX_EARNINGS * factor) * EI_RATE
+        return cpp, cpp2, ei
+
+    def net_incomes(self, incomes, years, province, dependents=0):
+        """
+        Net income for each (gross income, year) pair with that year's tax tables.
+
+        Applies the same provincial rules and contribution rounding as
+        calculate_take_home: New Brunswick damages exclude CPP, CPP2 and EI;
+        Prince Edward Island deducts nothing.
+
+        Returns:
+            Dictionary of arrays: federal_tax, provincial_tax, cpp, cpp2, ei, total_deductions, net
+        """
+        incomes = np.asarray(incomes, dtype=float)
+        province_key = province.lower()
+        code = PROVINCE_CODES.get(province_key)
+        if code is None:
+            raise ValueError(f"No tax tables for province {province}")
+
+        taxable = np.maximum(incomes - calculate_dependent_benefit(dependents), 0.0)
+        federal = self.bracket_tax(taxable, years, 'Federal')
+        provincial = self.bracket_tax(taxable, years, code)
+        cpp, cpp2, ei = (np.round(amount, 2) for amount in self.contributions(incomes, years))
+
+        if province_key == 'new brunswick':
+            cpp, cpp2, ei = np.zeros_like(cpp), np.zeros_like(cpp2), np.zeros_like(ei)
+        elif province_key == 'prince edward island':
+            federal, provincial = np.zeros_like(federal), np.zeros_like(provincial)
+            cpp, cpp2, ei = np.zeros_like(cpp), np.zeros_like(cpp2), np.zeros_like(ei)
+
+        total = federal + provincial + cpp + cpp2 + ei
+        return {
+            "federal_tax": federal,
+            "provincial_tax": provincial,
+            "cpp": cpp,
+            "cpp2": cpp2,
+            "ei": ei,
+            "total_deductions": total,
+            "net": incomes - total
+        }
+
+
+@lru_cache(maxsize=None)
+def get_current_tax_tables(indexation=DEFAULT_INDEXATION):
+    """
+    TaxTables for TAX_YEAR built from the brackets in tax_calculations.
+
+    These are the rules calculate_take_home applies, so a projection taxed with
+    them starts from the take-home pay shown for the case.
+    """
+    rows = [(TAX_YEAR, 'Federal', lower, rate) for lower, _, rate in FEDERAL_BRACKETS]
+    for province, brackets in PROVINCIAL_BRACKETS.items():
+        rows.extend((TAX_YEAR, PROVINCE_CODES[province], lower, rate) for lower, _, rate in brackets)
+    return TaxTables(rows, indexation=indexation)
+
+
+def load_tax_tables(path=TAX_RATES_PATH, indexation=DEFAULT_INDEXATION):
+    """Load the Year / Province / Bracket / Rate sheet into TaxTables."""
+    import pandas as pd
+
+    df = pd.read_excel(path)
+    missing = {'Year', 'Province', 'Bracket', 'Rate'} - set(df.columns)
+    if missing:
+        raise ValueError(f"Tax rate file {path} is missing columns: {sorted(missing)}")
+    df = df.dropna(subset=['Year', 'Province', 'Bracket', 'Rate'])
+
+    tables = TaxTables(
+        zip(df['Year'], df['Province'], df['Bracket'], df['Rate']),
+        indexation=indexation
+    )
+    logger.info(f"Loaded tax tables for {', '.join(tables.jurisdictions)} from {path}")
+    return tables
+
+
+_tax_tables = None
+_tax_tables_lock = threading.Lock()
+
+
+def get_tax_tables():
+    """Shared TaxTables loaded once from data/Tax_Rates_Historical.xlsx."""
+    global _tax_tables
+    if _tax_tables is None:
+        with _tax_tables_lock:
+            if _tax_tables is None:
+                CACHE_LOOKUPS.inc(cache='tax_tables', result='reload')
+                _tax_tables = load_tax_tables()
+                return _tax_tables
+    CACHE_LOOKUPS.inc(cache='tax_tables', result='hit')
+    return _tax_tables
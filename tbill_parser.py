@@ -0,0 +1,262 @@
+# =============================================================================
+# BANK OF CANADA T-BILL RATE PARSING
+# =============================================================================
+import csv
+import datetime
+import io
+import json
+import logging
+
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# Bank of Canada series code for the T-Bill / 1-3 year bond yield used for PJI
+SERIES_CODE = 'V39059'
+
+# Cell values the Bank of Canada publishes in place of a rate
+_SKIP_VALUES = frozenset(['', 'na', 'n/a', 'bank holiday'])
+
+# A single HTMLParser instance is reusable and avoids re-allocating parser state per page
+_HTML_PARSER = etree.HTMLParser(remove_comments=True, remove_blank_text=True)
+
+# Targeted XPath queries (compiled once at import)
+_ALL_TABLES = etree.XPath('//table')
+_FIRST_ROW_CELLS = etree.XPath('(.//tr)[1]/*[self::th or self::td]')
+_DATA_ROWS = etree.XPath('(.//tr)[position() > 1]')
+
+
+def parse_rate_value(value):
+    """
+    Convert a published rate cell to a float.
+
+    Returns None for blanks, 'na' and 'Bank holiday' entries or anything non-numeric.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip()
+    if text.lower() in _SKIP_VALUES:
+        return None
+    try:
+        return float(text.replace('%', '').strip())
+    except ValueError:
+        logger.debug("Could not convert %r to float", text)
+        return None
+
+
+def _parse_date(value):
+    """Parse a 'YYYY-MM-DD' cell, returning None if it is not a date."""
+    try:
+        return datetime.date.fromisoformat(value.strip()[:10])
+    except (ValueError, AttributeError):
+        return None
+
+
+def _cell_text(cell):
+    # Most cells hold a single text node; only walk descendants when there is markup inside
+    if len(cell):
+        return ''.join(cell.itertext()).strip()
+    return (cell.text or '').strip()
+
+
+def _row_tds(row):
+    return row.findall('td')
+
+
+def _rates_from_data_table(table, rates):
+    """Extract rates from the main lookup table (the last table on the page)."""
+    headers = [_cell_text(cell) for cell in _FIRST_ROW_CELLS(table)]
+
+    try:
+        series_index = headers.index(SERIES_CODE)
+    except ValueError:
+        logger.warning("%s column not found in table", SERIES_CODE)
+        return False
+
+    # Transposed layout: dates are column headers to the right of the series code
+    date_columns = []
+    for i in range(series_index + 1, len(headers)):
+        date = _parse_date(headers[i])
+        if date is not None:
+            date_columns.append((i, date))
+
+    rows = _DATA_ROWS(table)
+
+    if date_columns:
+        for row in rows:
+            cells = _row_tds(row)
+            for col_index, date in date_columns:
+                # The first column of each data row is a <th> label, so <td> indices are shifted by one
+                if col_index - 1 < len(cells):
+                    rate = parse_rate_value(_cell_text(cells[col_index - 1]))
+                    if rate is not None:
+                        rates[date] = rate
+    else:
+        # Row layout: one date per row in the first column
+        for row in rows:
+            cells = _row_tds(row)
+            if len(cells) < 2 or series_index >= len(cells):
+                continue
+            date = _parse_date(_cell_text(cells[0]))
+            if date is None:
+                continue
+            rate = parse_rate_value(_cell_text(cells[series_index]))
+            if rate is not None:
+                rates[date] = rate
+    return True
+
+
+def _rates_from_summary_table(table, rates):
+    """Extract (date, rate) pairs from the two-column summary table at the top of multi-table pages."""
+    for row in _DATA_ROWS(table):
+        cells = _row_tds(row)
+        if len(cells) < 2:
+            continue
+        date = _parse_date(_cell_text(cells[0]))
+        if date is None:
+            continue
+        rate = parse_rate_value(_cell_text(cells[1]))
+        if rate is not None:
+            rates[date] = rate
+
+
+def parse_rates_html(content):
+    """
+    Parse a Bank of Canada bond-yield lookup page into a {date: rate} dictionary.
+
+    Args:
+        content: Page content as bytes or str
+
+    Returns:
+        Dictionary mapping datetime.date objects to rates (percent)
+    """
+    rates = {}
+    if not content:
+        return rates
+
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+
+    root = etree.fromstring(content, _HTML_PARSER)
+    if root is None:
+        logger.warning("Empty or unparseable rate page")
+        return rates
+
+    tables = _ALL_TABLES(root)
+    if not tables:
+        logger.warning("No tables found on the page")
+        return rates
+
+    if not _rates_from_data_table(tables[-1], rates):
+        return rates
+
+    # Multi-table pages repeat the series as (date, rate) rows in the first table
+    if len(tables) > 1:
+        _rates_from_summary_table(tables[0], rates)
+
+    logger.info("Parsed %d %s rates from lookup page", len(rates), SERIES_CODE)
+    return rates
+
+
+def parse_rates_json(content):
+    """
+    Parse a Bank of Canada Valet JSON observations document into a {date: rate} dictionary.
+
+    Accepts the Valet format ({"observations": [{"d": "...", "V39059": {"v": "..."}}]})
+    as well as a plain list of {"date": ..., "rate": ...} records.
+
+    Args:
+        content: JSON text, bytes, or an already-decoded object
+    """
+    if isinstance(content, (bytes, str)):
+        data = json.loads(content)
+    else:
+        data = content
+
+    records = data.get('observations', []) if isinstance(data, dict) else data
+
+    rates = {}
+    for record in records:
+        date = _parse_date(record.get('d') or record.get('date') or '')
+        if date is None:
+            continue
+        value = record.get(SERIES_CODE, record.get('rate'))
+        if isinstance(value, dict):
+            value = value.get('v')
+        rate = parse_rate_value(value)
+        if rate is not None:
+            rates[date] = rate
+
+    logger.info("Parsed %d %s rates from JSON source", len(rates), SERIES_CODE)
+    return rates
+
+
+def parse_rates_csv(content):
+    """
+    Parse a CSV rate export into a {date: rate} dictionary.
+
+    Accepts the Bank of Canada Valet CSV export (metadata sections followed by an
+    OBSERVATIONS block with a "date","V39059" header) or any CSV with a date column
+    and a V39059 / rate column.
+
+    Args:
+        content: CSV text or bytes
+    """
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+
+    lines = content.splitlines()
+
+    # Valet exports prefix the data with metadata; skip to the observations header
+    start = 0
+    for i, line in enumerate(lines):
+        if line.strip().strip('"').upper() == 'OBSERVATIONS':
+            start = i + 1
+            break
+
+    reader = csv.reader(io.StringIO('\n'.join(lines[start:])))
+    rates = {}
+    date_index = rate_index = None
+
+    for row in reader:
+        if not row:
+            continue
+        if date_index is None:
+            header = [cell.strip().lower() for cell in row]
+            if 'date' not in header:
+                continue
+            date_index = header.index('date')
+            for candidate in (SERIES_CODE.lower(), 't-bill rate', 'rate'):
+                if candidate in header:
+                    rate_index = header.index(candidate)
+                    break
+            else:
+                rate_index = 1 if date_index == 0 else 0
+            continue
+
+        if max(date_index, rate_index) >= len(row):
+            continue
+        date = _parse_date(row[date_index])
+        if date is None:
+            continue
+        rate = parse_rate_value(row[rate_index])
+        if rate is not None:
+            rates[date] = rate
+
+    logger.info("Parsed %d %s rates from CSV source", len(rates), SERIES_CODE)
+    return rates
+
+
+def parse_rates_file(path):
+    """Parse a saved rate page or bulk export, choosing the parser from the file extension."""
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    lowered = path.lower()
+    if lowered.endswith('.json'):
+        return parse_rates_json(content)
+    if lowered.endswith('.csv'):
+        return parse_rates_csv(content)
+    return parse_rates_html(content)
@@ -1,10 +1,11 @@
 import os
+import sys
 import datetime
 import requests
-import pandas as pd
-from bs4 import BeautifulSoup
 import logging
 import time
+from datastore import get_rate_store
+from tbill_parser import parse_rates_html, parse_rates_json, parse_rates_csv, parse_rates_file, SERIES_CODE
 
 # Set up logging
 logging.basicConfig(
@@ -14,15 +15,18 @@ logging.basicConfig(
 )
 
 class TBillUpdater:
-    def __init__(self, output_file_path):
+    def __init__(self, output_file_path, store=None):
         """
         Initialize the T-Bill rate updater.
         
         Args:
-            output_file_path: Path to the Excel file where T-Bill rates are stored
+            output_file_path: Path to the Excel export of the T-Bill rates
+            store: RateStore to write to (defaults to the shared application store)
         """
         self.output_file_path = output_file_path
+        self.store = store if store is not None else get_rate_store(bootstrap_excel_path=output_file_path)
         self.base_url = "https://www.bankofcanada.ca/rates/interest-rates/lookup-bond-yields/"
+        self.valet_url = f"https://www.bankofcanada.ca/valet/observations/{SERIES_CODE}"
         
     def construct_url(self, start_date, end_date=None):
         """
@@ -93,111 +97,8 @@ class TBillUpdater:
             logging.info(f"Response status code: {response.status_code}")
             logging.info(f"Response content length: {len(response.content)}")
             
-            # Parse the HTML content
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Get all tables
-            all_tables = soup.find_all('table')
-            logging.info(f"Found {len(all_tables)} tables on the page")
-            
-            # If no tables found, return empty dict
-            if not all_tables:
-                logging.warning("No tables found on the page")
-                return rates
-            
-            # Process the last table (usually the relevant data table)
-            data_table = all_tables[-1]
-            
-            # Extract the headers to understand the table structure
-            headers = []
-            header_row = data_table.find('tr')
-            if header_row:
-                header_cells = header_row.find_all(['th', 'td'])
-                headers = [cell.text.strip() for cell in header_cells]
-                logging.info(f"Table headers: {headers}")
-            
-            # Find column index for V39059 (the T-Bill rate code)
-            v39059_index = None
-            for i, header in enumerate(headers):
-                if header == 'V39059':
-                    v39059_index = i
-                    break
-            
-            if v39059_index is None:
-                logging.warning("V39059 column not found in table")
-                return rates
-            
-            # Process date columns
-            date_columns = []
-            for i, header in enumerate(headers):
-                if i > v39059_index and header:  # Date columns come after V39059
-                    try:
-                        date = datetime.datetime.strptime(header, '%Y-%m-%d').date()
-                        date_columns.append((i, date))
-                    except (ValueError, TypeError):
-                        pass
-            
-            # If no date columns found, try getting dates from first column of data rows
-            if not date_columns:
-                data_rows = data_table.find_all('tr')[1:]  # Skip header row
-                for row in data_rows:
-                    cells = row.find_all('td')
-                    if len(cells) >= 2:
-                        try:
-                            date_str = cells[0].text.strip()
-                            date = datetime.datetime.strptime(date_str, '%Y-%m-%d').date()
-                            
-                            # Try to get the rate from the appropriate column
-                            if v39059_index < len(cells):
-                                rate_str = cells[v39059_index].text.strip()
-                                if rate_str and rate_str.lower() != 'na' and rate_str.lower() != 'bank holiday':
-                                    try:
-                                        rate = float(rate_str.replace('%', '').strip())
-                                        rates[date] = rate
-                                        logging.info(f"Found rate {rate} for date {date}")
-                                    except ValueError:
-                                        logging.warning(f"Could not convert '{rate_str}' to float")
-                        except ValueError:
-                            pass
-            else:
-                # Extract rates from the first data row
-                data_rows = data_table.find_all('tr')[1:]  # Skip header row
-                for row in data_rows:
-                    cells = row.find_all('td')
-                    
-                    for col_index, date in date_columns:
-                        if col_index < len(cells):
-                            rate_str = cells[col_index - 1].text.strip()  # Adjust index
-                            if rate_str and rate_str.lower() != 'na' and rate_str.lower() != 'bank holiday':
-                                try:
-                                    rate = float(rate_str.replace('%', '').strip())
-                                    rates[date] = rate
-                                    logging.info(f"Found rate {rate} for date {date}")
-                                except ValueError:
-                                    logging.warning(f"Could not convert '{rate_str}' to float")
-            
-            # For multi-table pages, also check the first table for rates
-            if len(all_tables) > 1:
-                alt_table = all_tables[0]
-                data_rows = alt_table.find_all('tr')[1:]  # Skip header row
-                
-                for row in data_rows:
-                    cells = row.find_all('td')
-                    if len(cells) >= 2:
-                        try:
-                            date_str = cells[0].text.strip()
-                            date = datetime.datetime.strptime(date_str, '%Y-%m-%d').date()
-                            rate_str = cells[1].text.strip()
-                            
-                            if rate_str and rate_str.lower() != 'na' and rate_str.lower() != 'bank holiday':
-                                try:
-                                    rate = float(rate_str.replace('%', '').strip())
-                                    rates[date] = rate
-                                    logging.info(f"Found rate {rate} for date {date} in alternative table")
-                                except ValueError:
-                                    pass
-                        except (ValueError, IndexError):
-                            pass
+            # Parse the HTML content with the lxml-based parser
+            rates = parse_rates_html(response.content)
             
             return rates
             
@@ -205,9 +106,62 @@ class TBillUpdater:
             logging.error(f"Error fetching data: {e}")
             return rates
     
-    def update_excel_file(self, rates_dict):
+    def fetch_tbill_rates_bulk(self, start_date, end_date=None, fmt='json'):
         """
-        Update the Excel file with new T-Bill rates.
+        Fetch T-Bill rates for a date range from the Bank of Canada Valet API.
+        
+        The Valet API returns the whole range in one CSV or JSON document, which is
+        much cheaper than scraping lookup pages for multi-year backfills.
+        
+        Args:
+            start_date: The start date (datetime.date object)
+            end_date: The end date (datetime.date object), defaults to today
+            fmt: 'json' or 'csv'
+            
+        Returns:
+            Dictionary mapping dates to rates
+        """
+        if end_date is None:
+            end_date = datetime.date.today()
+        
+        url = f"{self.valet_url}/{fmt}"
+        params = {
+            'start_date': start_date.strftime('%Y-%m-%d'),
+            'end_date': end_date.strftime('%Y-%m-%d')
+        }
+        logging.info(f"Fetching bulk T-Bill rates from {params['start_date']} to {params['end_date']} from URL: {url}")
+        
+        try:
+            response = requests.get(url, params=params, timeout=30)
+            response.raise_for_status()
+            
+            if fmt == 'csv':
+                return parse_rates_csv(response.content)
+            return parse_rates_json(response.content)
+            
+        except (requests.RequestException, ValueError) as e:
+            logging.error(f"Error fetching bulk data: {e}")
+            return {}
+    
+    def load_rates_file(self, file_path):
+        """
+        Load T-Bill rates from a saved lookup page or a CSV/JSON export.
+        
+        Args:
+            file_path: Path to a .html, .csv or .json file
+            
+        Returns:
+            Dictionary mapping dates to rates
+        """
+        try:
+            return parse_rates_file(file_path)
+        except (OSError, ValueError) as e:
+            logging.error(f"Error loading rates from {file_path}: {e}")
+            return {}
+    
+    def update_rates(self, rates_dict):
+        """
+        Write new T-Bill rates to the rate store and refresh the Excel export.
         
         Args:
             rates_dict: Dictionary mapping dates to rates
@@ -216,75 +170,38 @@ class TBillUpdater:
             True if update was successful, False otherwise
         """
         if not rates_dict:
-            logging.warning("No rates to update in Excel file")
+            logging.warning("No rates to update")
             return False
             
         try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.output_file_path), exist_ok=True)
-            
-            # Initialize DataFrame
-            if os.path.exists(self.output_file_path):
-                # Load existing data
-                df = pd.read_excel(self.output_file_path)
-                logging.info(f"Loaded existing Excel file with {len(df)} rows")
-                
-                # Ensure Date column is datetime
-                df['Date'] = pd.to_datetime(df['Date'])
-            else:
-                # Create new DataFrame
-                df = pd.DataFrame(columns=['Date', 'T-Bill Rate'])
-                logging.info("Creating new Excel file")
-            
-            # Add new rates or update existing ones
-            updated_count = 0
-            new_count = 0
-            
-            for date, rate in rates_dict.items():
-                date_str = date.strftime('%Y-%m-%d')
-                
-                # Check if date exists
-                if 'Date' in df.columns and len(df) > 0:
-                    date_exists = False
-                    df_dates = df['Date'].dt.strftime('%Y-%m-%d').tolist()
-                    
-                    if date_str in df_dates:
-                        date_exists = True
-                        idx = df_dates.index(date_str)
-                        old_rate = df.loc[idx, 'T-Bill Rate']
-                        
-                        if old_rate != rate:
-                            df.loc[idx, 'T-Bill Rate'] = rate
-                            logging.info(f"Updated rate for {date_str} from {old_rate} to {rate}")
-                            updated_count += 1
-                    
-                    if not date_exists:
-                        # Add new row
-                        new_row = pd.DataFrame({'Date': [pd.Timestamp(date)], 'T-Bill Rate': [rate]})
-                        df = pd.concat([df, new_row], ignore_index=True)
-                        logging.info(f"Added new rate {rate} for date {date_str}")
-                        new_count += 1
-                else:
-                    # Add first row
-                    new_row = pd.DataFrame({'Date': [pd.Timestamp(date)], 'T-Bill Rate': [rate]})
-                    df = pd.concat([df, new_row], ignore_index=True)
-                    logging.info(f"Added new rate {rate} for date {date_str}")
-                    new_count += 1
+            # Bulk upsert in one transaction; readers keep seeing the previous snapshot until commit
+            new_count, updated_count = self.store.upsert_rates(rates_dict)
+            logging.info(f"Successfully updated rate store (Updated: {updated_count}, New: {new_count})")
             
-            # Sort by date (newest first)
-            df = df.sort_values(by='Date', ascending=False)
-            
-            # Save to Excel
-            df.to_excel(self.output_file_path, index=False)
-            logging.info(f"Successfully saved data to {self.output_file_path} (Updated: {updated_count}, New: {new_count})")
+            self.export_excel_file()
             return True
             
         except Exception as e:
-            logging.error(f"Error updating Excel file: {e}")
+            logging.error(f"Error updating rates: {e}")
             import traceback
             logging.error(traceback.format_exc())
             return False
     
+    def export_excel_file(self):
+        """
+        Export the full rate series from the store to the Excel file.
+        
+        Returns:
+            True if the export was written, False otherwise
+        """
+        try:
+            count = self.store.export_excel(self.output_file_path)
+            logging.info(f"Successfully saved {count} rates to {self.output_file_path}")
+            return True
+        except Exception as e:
+            logging.error(f"Error exporting Excel file: {e}")
+            return False
+    
     def get_date_ranges_to_check(self):
         """
         Get date ranges to check based on bi-weekly update pattern.
@@ -415,31 +332,26 @@ class TBillUpdater:
                         filled_rates[target_date] = filled_rate
                         logging.info(f"Filled gap for {target_date} using rate {filled_rate} from {filled_date}")
             
-            # Update Excel file with all rates
-            success = self.update_excel_file(filled_rates)
+            # Update the rate store (and Excel export) with all rates
+            success = self.update_rates(filled_rates)
             return success
         else:
             logging.warning("No T-Bill rates found in any date range")
             
-            # Try to use existing rates from Excel file
+            # Try to use existing rates from the rate store
             try:
-                if os.path.exists(self.output_file_path):
-                    df = pd.read_excel(self.output_file_path)
-                    if 'Date' in df.columns and 'T-Bill Rate' in df.columns and len(df) > 0:
-                        df['Date'] = pd.to_datetime(df['Date'])
-                        df = df.sort_values('Date', ascending=False)
-                        
-                        if len(df) > 0:
-                            latest_date = df.iloc[0]['Date'].date()
-                            latest_rate = float(df.iloc[0]['T-Bill Rate'])
-                            
-                            # Use this rate for today if needed
-                            if latest_date != today:
-                                new_rates = {today: latest_rate}
-                                success = self.update_excel_file(new_rates)
-                                logging.info(f"Used existing rate {latest_rate} from {latest_date} for today ({today})")
-                                return success
-                            return True  # No update needed, already have today's rate
+                bounds = self.store.bounds()
+                if bounds is not None:
+                    latest_date_str, latest_rate = bounds[1]
+                    latest_date = datetime.date.fromisoformat(latest_date_str)
+                    
+                    # Use this rate for today if needed
+                    if latest_date != today:
+                        new_rates = {today: latest_rate}
+                        success = self.update_rates(new_rates)
+                        logging.info(f"Used existing rate {latest_rate} from {latest_date} for today ({today})")
+                        return success
+                    return True  # No update needed, already have today's rate
             except Exception as e:
                 logging.error(f"Error while trying to use existing rates: {e}")
             
@@ -453,4 +365,9 @@ if __name__ == "__main__":
     
     # Create and run the updater
     updater = TBillUpdater(excel_file)
-    updater.run_update()
+    
+    # Optional backfill from a saved page or CSV/JSON export: python tbill_updater.py rates.csv
+    if len(sys.argv) > 1:
+        updater.update_rates(updater.load_rates_file(sys.argv[1]))
+    else:
+        updater.run_update()
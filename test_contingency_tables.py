@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from contingency_tables import ContingencyTables
+
+
+@pytest.mark.parametrize('age, years', [(40, 25), (40.5, 0.5), (64.9, 0.1), (33.3, 17.25), (0, 1), (80.2, 20)])
+@pytest.mark.parametrize('discount_rate', [0.0, 0.015, 0.025, 0.035])
+def test_zero_contingencies_give_factor_one(age, years, discount_rate):
+    tables = ContingencyTables({'U': {'mortality': np.zeros(111)}})
+    assert tables.contingency_factor('U', age, years, discount_rate) == pytest.approx(1.0, abs=1e-12)
+
+
+def test_factor_never_exceeds_one():
+    ages = np.arange(111)
+    mortality = np.minimum(0.0005 * np.exp(0.09 * (ages - 30)), 1.0)
+    tables = ContingencyTables({'M': {
+        'mortality': mortality,
+        'disability': np.full(111, 0.003),
+        'unemployment': np.full(111, 0.05),
+    }})
+    rng = np.random.default_rng(7)
+    for age, years in zip(rng.uniform(15, 105, 500), rng.uniform(0.01, 45, 500)):
+        assert tables.contingency_factor('M', age, years, 0.025) <= 1.0
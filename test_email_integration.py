@@ -1,9 +1,12 @@
 import os
 import sys
 import traceback
+import dataclasses
 import datetime
 import requests
 
+from damages_results import CollateralBenefits, DamagesResult, FutureLoss, PastLoss, TakeHome
+
 # Import your actual email function
 try:
     from email_results import send_results_email
@@ -25,46 +28,38 @@ def test_integration():
     try:
         # Create dummy test data similar to what your app would use
         recipient_email = "john@johnmacgillis.ca"  # Your email
-        client_name = "Test Client"
-        province = "Nova Scotia"
-        calculation_details = {"Years Between": 2.5, "PJI Rate": 2.0, "Interest Amount": 100.00, "Dependents": "0"}
-        present_value_details = {"present_value": 10000.00, "annual_salary": 50000.00, "discount_rate": 0.025}
-        result = {"Gross Income": 50000.00, "Federal Tax": 5000.00, "Provincial Tax": 3000.00, "CPP Contribution": 1000.00, "EI Contribution": 500.00, "Net Pay (Provincially specific deductions for damages)": 40500.00}
-        collateral_benefits = {"Total Past Benefits": 1000.00, "Total Annual Future Benefits": 500.00}
-        missed_time_unit = "days"
-        missed_time = 30
-        past_lost_wages_with_interest = 3500.00
-        net_past_lost_wages = 3400.00
-        missed_pay = 4400.00
-        total_damages = 13500.00
-        birthdate = datetime.date(1980, 1, 1)
-        retirement_age = 65
-        loss_date = datetime.date(2023, 1, 1)
-        current_date = datetime.date.today()
-        ei_days_remaining = 30
+        damages = DamagesResult(
+            client_name="Test Client",
+            province="nova scotia",
+            dependents=0,
+            loss_date=datetime.date(2023, 1, 1),
+            start_date=datetime.date.today(),
+            current_date=datetime.date.today(),
+            return_status="returning to work",
+            end_date=None,
+            birthdate=datetime.date(1980, 1, 1),
+            retirement_age=65,
+            ei_days_remaining=30,
+            take_home=TakeHome(
+                province="nova scotia", gross_income=50000.00, federal_tax=5000.00, provincial_tax=3000.00,
+                cpp_contribution=1000.00, cpp2_contribution=0, ei_contribution=500.00, dependent_benefit=0,
+                total_deductions=9500.00, net_pay=40500.00, daily_net_pay=160.71, hourly_net_pay=20.09,
+                weekly_net_pay=778.85, monthly_net_pay=3375.00, working_days=252,
+            ),
+            collateral_benefits=CollateralBenefits(1000.00, 0, 0, 0, 0, 500.00, 0, 0, 0, 0),
+            past_loss=PastLoss(
+                missed_time=30, missed_time_unit="days", missed_pay=4400.00, net_loss=3400.00,
+                years_between=2.5, pji_rate=2.0, interest_amount=100.00, with_interest=3500.00,
+            ),
+            future_loss=dataclasses.replace(
+                FutureLoss.not_calculated(), annual_salary=50000.00, discount_rate=0.025, present_value=10000.00,
+            ),
+            total_damages=13500.00,
+        )
         
         # Call the actual email function
         print("Calling send_results_email...")
-        result = send_results_email(
-            recipient_email=recipient_email,
-            client_name=client_name,
-            province=province,
-            calculation_details=calculation_details,
-            present_value_details=present_value_details,
-            result=result,
-            collateral_benefits=collateral_benefits,
-            missed_time_unit=missed_time_unit,
-            missed_time=missed_time,
-            past_lost_wages_with_interest=past_lost_wages_with_interest,
-            net_past_lost_wages=net_past_lost_wages,
-            missed_pay=missed_pay,
-            total_damages=total_damages,
-            birthdate=birthdate,
-            retirement_age=retirement_age,
-            loss_date=loss_date,
-            current_date=current_date,
-            ei_days_remaining=ei_days_remaining
-        )
+        result = send_results_email(recipient_email=recipient_email, damages=damages)
         
         print(f"Email function returned: {result}")
         return result
@@ -0,0 +1,64 @@
+import datetime
+import random
+
+import pytest
+
+from datastore import RateStore
+
+FIRST = datetime.date(2020, 1, 6)
+
+
+def weekly_rates(rng, weeks, first=FIRST):
+    return {first + datetime.timedelta(weeks=week): round(rng.uniform(0.1, 5.5), 3) for week in range(weeks)}
+
+
+def brute_force_average(rates, start, end):
+    in_range = [rate for date, rate in rates.items() if start <= date <= end]
+    return (sum(in_range) / len(in_range) if in_range else None), len(in_range)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return RateStore(str(tmp_path / 'rates.db'))
+
+
+def test_range_average_matches_brute_force(store):
+    rng = random.Random(11)
+    rates = weekly_rates(rng, 150)
+    store.upsert_rates(rates)
+    last = max(rates)
+    # Ranges before, inside, after and straddling either end of the data
+    window = (FIRST - datetime.timedelta(days=400), last + datetime.timedelta(days=400))
+    span = (window[1] - window[0]).days
+    for _ in range(500):
+        start = window[0] + datetime.timedelta(days=rng.randrange(span))
+        end = start + datetime.timedelta(days=rng.randrange(0, 500))
+        expected, count = brute_force_average(rates, start, end)
+        average, observations = store.range_average(start, end)
+        assert observations == count
+        if expected is None:
+            assert average is None
+        else:
+            assert average == pytest.approx(expected, rel=1e-12)
+
+
+def test_overlapping_upsert_rebuilds_prefix_and_bumps_version(store):
+    rng = random.Random(5)
+    rates = weekly_rates(rng, 60)
+    store.upsert_rates(rates)
+    version = store.data_version()
+
+    # Revise the last 20 weeks and add 20 more
+    update = weekly_rates(rng, 40, first=FIRST + datetime.timedelta(weeks=40))
+    assert store.upsert_rates(update) == (20, 20)
+    assert store.data_version() == version + 1
+    rates.update(update)
+
+    start, end = FIRST + datetime.timedelta(weeks=30), FIRST + datetime.timedelta(weeks=75)
+    expected, count = brute_force_average(rates, start, end)
+    assert store.range_average(start, end) == (pytest.approx(expected, rel=1e-12), count)
+    assert store.range_average(FIRST, max(rates))[1] == 80
+
+    # Rewriting the same rates changes nothing
+    assert store.upsert_rates(update) == (0, 0)
+    assert store.data_version() == version + 1
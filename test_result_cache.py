@@ -0,0 +1,36 @@
+import datetime
+import os
+
+from werkzeug.datastructures import MultiDict
+
+from case_schema import parse_case
+from result_cache import case_key, table_versions
+
+FORM = {
+    'client_name': 'Test Claimant', 'province': 'new brunswick', 'dependents': '2',
+    'employment_type': 'salaried', 'salary': '78500', 'hours_per_day': '8', 'working_days': '252',
+    'loss_date': '2022-06-15', 'start_date': '2025-01-15', 'missed_time': '18', 'missed_time_unit': 'months',
+    'return_status': 'returning to work', 'end_date': '2026-01-15', 'birthdate': '1980-04-02',
+}
+TODAY = datetime.date(2026, 1, 15)
+
+
+def key(form, tables=None):
+    case, errors = parse_case(MultiDict(form))
+    assert not errors
+    return case_key(case, 'rates-1', TODAY, tables=tables)
+
+
+def test_key_is_on_the_parsed_case():
+    same = dict(reversed(list({**FORM, 'salary': '78500.00', 'unrelated': 'x'}.items())))
+    assert key(same) == key(FORM)
+    assert key({**FORM, 'salary': '78501'}) != key(FORM)
+
+
+def test_key_changes_with_the_contingency_tables(tmp_path):
+    path = tmp_path / 'contingency.csv'
+    path.write_text('age,male,female\n')
+    before = key(FORM, table_versions(str(path)))
+    os.utime(path, (0, 1))
+    assert key(FORM, table_versions(str(path))) != before
+    assert table_versions(str(tmp_path / 'missing.csv'))['contingency_tables'] is None
@@ -0,0 +1,33 @@
+import pytest
+
+from income_calculations import calculate_take_home
+from tax_calculations import EI_MAX_EARNINGS, FEDERAL_BRACKETS, PROVINCIAL_BRACKETS, TAX_YEAR
+from tax_tables import get_current_tax_tables, get_tax_tables
+from wage_projection import project_after_tax_losses
+
+
+@pytest.mark.parametrize('province', sorted(PROVINCIAL_BRACKETS))
+@pytest.mark.parametrize('income', [0, 12000, 45000, 65000, 71000, 120000, 260000])
+@pytest.mark.parametrize('dependents', [0, 2])
+def test_first_projection_year_matches_take_home(province, income, dependents):
+    # Year one of the per-year tax projection is the net pay shown for the case,
+    # whatever the calendar year and with or without growth
+    projection = project_after_tax_losses(income, 2026, 5, 0.025, province, dependents=dependents, wage_growth=0.02)
+    take_home = calculate_take_home(income, province, 260, 8, dependents=dependents)
+    assert projection['schedule']['lost_wages'][0] == pytest.approx(take_home.net_pay, abs=0.005 + 1e-6)
+
+
+def test_tax_tables_index_from_one_base_year():
+    tables = get_current_tax_tables()
+    assert tables.base_year == TAX_YEAR
+    assert tables.contribution_limits(TAX_YEAR)[3] == EI_MAX_EARNINGS
+    next_year = TAX_YEAR + 1
+    factor = 1 + tables.indexation
+    assert tables.contribution_limits(next_year)[3] == pytest.approx(EI_MAX_EARNINGS * factor)
+    assert tables.brackets(next_year, 'Federal')[1][0] == pytest.approx(FEDERAL_BRACKETS[1][0] * factor)
+
+
+@pytest.mark.parametrize('year', [TAX_YEAR - 1, TAX_YEAR, TAX_YEAR + 1, TAX_YEAR + 2, TAX_YEAR + 10])
+def test_contribution_limits_match_across_table_sets(year):
+    # The spreadsheet tables end in a later year than the constants; the maximums must not shift with them
+    assert get_tax_tables().contribution_limits(year) == pytest.approx(get_current_tax_tables().contribution_limits(year))
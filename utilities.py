@@ -3,25 +3,25 @@
 # =============================================================================
 import datetime
 
-def check_install_libraries():
-    """Check and install required libraries if not present."""
-    try:
-        import docx
-    except ImportError:
-        print("\nThe 'python-docx' library is not installed. Installing it now...")
-        import sys
-        import subprocess
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "python-docx"])
-        print("Successfully installed 'python-docx' library.\n")
+def check_install_libraries(modules=("docx", "tabulate")):
+    """
+    Check that optional report libraries are installed without importing them.
     
-    try:
-        import tabulate
-    except ImportError:
-        print("\nThe 'tabulate' library is not installed. Installing it now...")
-        import sys
-        import subprocess
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "tabulate"])
-        print("Successfully installed 'tabulate' library.\n")
+    Uses importlib.util.find_spec so the (slow) libraries are not loaded at startup,
+    and never installs anything at runtime; missing packages are reported so they
+    can be added to requirements.txt / the virtualenv instead.
+    
+    Returns:
+        List of missing module names
+    """
+    import importlib.util
+    
+    package_names = {"docx": "python-docx"}
+    missing = [name for name in modules if importlib.util.find_spec(name) is None]
+    for name in missing:
+        print(f"\nThe '{package_names.get(name, name)}' library is not installed. "
+              f"Install it with: pip install {package_names.get(name, name)}\n")
+    return missing
 
 def parse_date(date_str):
     """Parse date string in various formats and return a date object."""
@@ -0,0 +1,246 @@
+# =============================================================================
+# WAGE GROWTH AND INFLATION PROJECTION FOR FUTURE LOSSES
+# =============================================================================
+import math
+
+import numpy as np
+
+
+def yearly_periods(time_horizon, discount_rate):
+    """
+    Year lengths and annuity-consistent discount factors over a horizon.
+
+    Each year (the last may be partial) is discounted with v^t0 × (1 - v^Δ) / (r × Δ),
+    as in cashflow_schedule, so a level stream sums exactly to the closed-form annuity.
+
+    Returns:
+        Tuple of (year_fraction, discount_factor) NumPy arrays
+    """
+    whole_years = int(math.floor(time_horizon))
+    fractions = [1.0] * whole_years
+    remainder = time_horizon - whole_years
+    if remainder > 1e-9:
+        fractions.append(remainder)
+    year_fraction = np.asarray(fractions, dtype=float)
+
+    if discount_rate == 0:
+        return year_fraction, np.ones_like(year_fraction)
+    v = 1.0 / (1.0 + discount_rate)
+    elapsed_before = np.concatenate(([0.0], np.cumsum(year_fraction)[:-1]))
+    discount_factor = (v ** elapsed_before) * (1.0 - v ** year_fraction) / (discount_rate * year_fraction)
+    return year_fraction, discount_factor
+
+
+def growing_annuity_factor(time_horizon, discount_rate, growth_rate=0.0):
+    """
+    Present value of 1 a year growing at growth_rate each anniversary, over time_horizon years.
+
+    Closed form of the yearly projection: with growth_rate = 0 this is
+    (1 - (1 + r)^-n) / r, the factor used by calculate_future_lost_wages_annuity.
+    A partial final year is paid at the final year's level.
+    """
+    n = max(float(time_horizon), 0.0)
+    whole = int(math.floor(n + 1e-9))
+    partial = max(n - whole, 0.0)
+    r, g = discount_rate, growth_rate
+
+    if r == 0:
+        level_sum = whole if g == 0 else ((1 + g) ** whole - 1) / g
+        return level_sum + (1 + g) ** whole * partial
+
+    v = 1.0 / (1.0 + r)
+    q = (1 + g) * v
+    geometric_sum = whole if abs(q - 1.0) < 1e-15 else (1 - q ** whole) / (1 - q)
+    return (1 - v) / r * geometric_sum + q ** whole * (1 - v ** partial) / r
+
+
+def _normalise_benefits(collateral_benefits, inflation):
+    """Accept {name: amount}, [(amount, indexation)] or [{'name', 'amount', 'indexation' or 'indexed'}]."""
+    benefits = []
+    if not collateral_benefits:
+        return benefits
+    if isinstance(collateral_benefits, dict):
+        collateral_benefits = [{'name': name, 'amount': amount} for name, amount in collateral_benefits.items()]
+
+    for number, benefit in enumerate(collateral_benefits, start=1):
+        if isinstance(benefit, dict):
+            if benefit.get('indexation') is not None:
+                indexation = float(benefit['indexation'])
+            else:
+                indexation = inflation if benefit.get('indexed') else 0.0
+            benefits.append((benefit.get('name', f'Benefit {number}'), float(benefit.get('amount', 0)), indexation))
+        else:
+            amount, indexation = benefit
+            benefits.append((f'Benefit {number}', float(amount), float(indexation)))
+    return benefits
+
+
+def project_future_losses(annual_salary, time_horizon, discount_rate, wage_growth=0.0,
+                          step_increases=None, collateral_benefits=None, inflation=0.0,
+                          include_schedule=False):
+    """
+    Present value of future lost wages with wage growth, step increases and indexed collateral benefits.
+
+    Wages grow by wage_growth at each anniversary and by each step increase from
+    its year onward; each collateral benefit grows at its own indexation rate
+    (indexed benefits default to `inflation`, others stay level). Rates should be
+    in the same terms (real or nominal) as discount_rate.
+
+    Without step increases every stream is a growing annuity and the totals come
+    from the closed form; otherwise the yearly arrays are summed.
+
+    Args:
+        annual_salary: Annual lost wages in the first year (before collateral offsets)
+        time_horizon: Horizon in years
+        discount_rate: Annual discount rate as a decimal
+        wage_growth: Annual wage growth as a decimal
+        step_increases: List of (year_offset, increase) pairs, e.g. [(2, 0.05)] for a
+            5% raise from the third year on
+        collateral_benefits: {name: annual_amount} (level), [(annual_amount, indexation)],
+            or [{'name', 'amount', 'indexation'}] / [{'name', 'amount', 'indexed': True}]
+        inflation: Indexation rate for benefits marked as indexed
+        include_schedule: Also return the year-by-year arrays
+
+    Returns:
+        Dictionary with the present value of wages, of each benefit and of the net loss
+    """
+    time_horizon = max(float(time_horizon), 0.0)
+    benefits = _normalise_benefits(collateral_benefits, inflation)
+
+    closed_form = not step_increases
+    if closed_form:
+        pv_wages = annual_salary * growing_annuity_factor(time_horizon, discount_rate, wage_growth)
+        pv_benefits = {
+            name: amount * growing_annuity_factor(time_horizon, discount_rate, indexation)
+            for name, amount, indexation in benefits
+        }
+
+    schedule = None
+    if not closed_form or include_schedule:
+        year_fraction, discount_factor = yearly_periods(time_horizon, discount_rate)
+        years = np.arange(len(year_fraction))
+
+        wage_index = (1.0 + wage_growth) ** years
+        for year_offset, increase in step_increases or ():
+            wage_index[int(year_offset):] *= 1.0 + increase
+        benefit_index = {name: (1.0 + indexation) ** years for name, _, indexation in benefits}
+
+        if not closed_form:
+            weights = year_fraction * discount_factor
+            pv_wages = float(annual_salary * (wage_index @ weights))
+            pv_benefits = {name: float(amount * (benefit_index[name] @ weights)) for name, amount, _ in benefits}
+
+        if include_schedule:
+            lost_wages = annual_salary * wage_index * year_fraction
+            collateral = np.zeros_like(lost_wages)
+            for name, amount, _ in benefits:
+                collateral += amount * benefit_index[name] * year_fraction
+            schedule = {
+                "year_fraction": year_fraction,
+                "lost_wages": lost_wages,
+                "collateral": collateral,
+                "net": lost_wages - collateral,
+                "discount_factor": discount_factor,
+                "present_value": (lost_wages - collateral) * discount_factor
+            }
+
+    pv_collateral = sum(pv_benefits.values())
+    result = {
+        "time_horizon": time_horizon,
+        "discount_rate": discount_rate,
+        "wage_growth": wage_growth,
+        "present_value_wages": round(pv_wages, 2),
+        "present_value_benefits": {name: round(value, 2) for name, value in pv_benefits.items()},
+        "present_value_collateral": round(pv_collateral, 2),
+        "present_value": round(pv_wages - pv_collateral, 2),
+        "closed_form": closed_form
+    }
+    if schedule is not None:
+        result["schedule"] = schedule
+    return result
+
+
+def project_after_tax_losses(gross_salary, start_year, time_horizon, discount_rate, province,
+                             dependents=0, wage_growth=0.0, collateral_benefits=None, inflation=0.0,
+                             tax_tables=None):
+    """
+    Present value of future lost wages with tax recomputed for every projection year.
+
+    Gross salary grows by wage_growth each year and all years are taxed in one
+    batched call. The first year is taxed with the tables' base year and each
+    later year with its brackets and contribution maximums indexed one more
+    year from that base, so each year's net income reflects its own
+    thresholds. With the default tables the first year's net income is
+    calculate_take_home's net pay. Collateral benefits are deducted as in
+    project_future_losses.
+
+    Args:
+        gross_salary: Gross annual salary in the first projection year
+        start_year: Calendar year of the first projection year (labels the schedule)
+        province: Province name as used by calculate_take_home
+        tax_tables: TaxTables to use (defaults to tax_tables.get_current_tax_tables())
+
+    Returns:
+        Dictionary as from project_future_losses, plus the yearly schedule with gross
+        income, total deductions and the net income lost (lost_wages)
+    """
+    if tax_tables is None:
+        from tax_tables import get_current_tax_tables
+        tax_tables = get_current_tax_tables()
+
+    time_horizon = max(float(time_horizon), 0.0)
+    year_fraction, discount_factor = yearly_periods(time_horizon, discount_rate)
+    years = np.arange(len(year_fraction))
+
+    gross = gross_salary * (1.0 + wage_growth) ** years
+    taxes = tax_tables.net_incomes(gross, tax_tables.base_year + years, province, dependents)
+    net_income = taxes["net"] * year_fraction
+
+    benefits = _normalise_benefits(collateral_benefits, inflation)
+    collateral = np.zeros_like(net_income)
+    pv_benefits = {}
+    for name, amount, indexation in benefits:
+        collateral += amount * (1.0 + indexation) ** years * year_fraction
+        pv_benefits[name] = amount * growing_annuity_factor(time_horizon, discount_rate, indexation)
+
+    pv_wages = float(net_income @ discount_factor)
+    pv_collateral = sum(pv_benefits.values())
+    return {
+        "time_horizon": time_horizon,
+        "discount_rate": discount_rate,
+        "wage_growth": wage_growth,
+        "present_value_wages": round(pv_wages, 2),
+        "present_value_benefits": {name: round(value, 2) for name, value in pv_benefits.items()},
+        "present_value_collateral": round(pv_collateral, 2),
+        "present_value": round(pv_wages - pv_collateral, 2),
+        "closed_form": False,
+        "schedule": {
+            "year": start_year + years,
+            "year_fraction": year_fraction,
+            "gross_income": gross * year_fraction,
+            "total_deductions": taxes["total_deductions"] * year_fraction,
+            "lost_wages": net_income,
+            "collateral": collateral,
+            "net": net_income - collateral,
+            "discount_factor": discount_factor,
+            "present_value": (net_income - collateral) * discount_factor
+        }
+    }
+
+
+def schedule_rows(schedule, start_year):
+    """Year-by-year rows for a projection schedule, in the shape aggregate_yearly produces."""
+    return [
+        {
+            "year": start_year + i,
+            "months": round(float(fraction * 12), 2),
+            "lost_wages": round(float(lost_wages), 2),
+            "collateral": round(float(collateral), 2),
+            "net": round(float(net), 2),
+            "present_value": round(float(pv), 2)
+        }
+        for i, (fraction, lost_wages, collateral, net, pv) in enumerate(zip(
+            schedule["year_fraction"], schedule["lost_wages"], schedule["collateral"],
+            schedule["net"], schedule["present_value"]
+        ))
+    ]
@@ -0,0 +1,113 @@
+# =============================================================================
+# STARTUP WARM-UP FOR GUNICORN WORKERS
+# =============================================================================
+import gc
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def _import_libraries():
+    # Heavy libraries pulled in by the rate, PDF and Word code paths
+    import pandas  # noqa: F401
+    import tbill_utils  # noqa: F401
+    import pdf_generation  # noqa: F401
+    import word_generation  # noqa: F401
+
+
+def _load_rate_data():
+    import datetime
+    from tbill_utils import get_store
+
+    store = get_store()
+    bounds = store.bounds()
+    if bounds is not None:
+        # Touch the prefix table and series pages so they are in the page cache
+        store.range_average(bounds[0][0], bounds[1][0])
+        store.get_rates()
+    else:
+        store.range_average(datetime.date.today(), datetime.date.today())
+
+
+def _load_contingency_tables(app):
+    from contingency_tables import get_contingency_tables
+
+    get_contingency_tables(app.config.get('CONTINGENCY_TABLES_PATH'))
+
+
+def _load_tax_tables():
+    from tax_tables import get_current_tax_tables, get_tax_tables
+
+    get_current_tax_tables()
+    get_tax_tables()
+
+
+def _compile_templates(app):
+    env = app.jinja_env
+    for name in env.list_templates(filter_func=lambda name: name.endswith('.html')):
+        env.get_template(name)
+
+
+def _build_report_styles():
+    from pdf_generation import get_report_styles
+
+    get_report_styles()
+
+
+def preload(app=None, freeze=False):
+    """
+    Load rate data, contingency and tax tables, compile templates and build report styles ahead of the first request.
+
+    Call it from gunicorn's on_starting hook so the work happens once in the master
+    and workers share the loaded modules, templates and styles copy-on-write, and
+    again from post_fork (where every step is already done and costs nothing).
+
+    Args:
+        app: Flask application whose templates should be compiled (defaults to app.app)
+        freeze: Move everything loaded so far into the permanent GC generation so the
+            collector does not touch (and un-share) those pages in forked workers
+
+    Returns:
+        Dictionary mapping step name to elapsed seconds
+    """
+    if app is None:
+        from app import app
+
+    steps = [
+        ('import libraries', _import_libraries),
+        ('load rate data', _load_rate_data),
+        ('load contingency tables', lambda: _load_contingency_tables(app)),
+        ('load tax tables', _load_tax_tables),
+        ('compile templates', lambda: _compile_templates(app)),
+        ('build report styles', _build_report_styles),
+    ]
+
+    timings = {}
+    total_start = time.perf_counter()
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            logger.error(f"Warm-up step '{name}' failed: {e}")
+        timings[name] = time.perf_counter() - start
+        logger.info(f"Warm-up: {name} took {timings[name] * 1000:.1f} ms")
+    timings['total'] = time.perf_counter() - total_start
+    logger.info(f"Warm-up complete in {timings['total'] * 1000:.1f} ms")
+
+    # SQLite connections must not be shared with forked workers
+    from datastore import close_connections
+    close_connections()
+
+    if freeze:
+        gc.collect()
+        gc.freeze()
+
+    return timings
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+    for step, seconds in preload().items():
+        print(f"{step:<22} {seconds * 1000:8.1f} ms")
@@ -11,60 +11,48 @@ from docx.oxml import OxmlElement
 import datetime
 import re
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+from damages_results import BENEFITS, DEFAULT_PJI_RATE, province_display
+from metrics import REPORT_RENDER
+from stage_timing import stage, timed_stage
+
 logger = logging.getLogger(__name__)
 
-def create_word_report(client_name, province, calculation_details, present_value_details, 
-                      result, collateral_benefits, missed_time_unit, missed_time, output_path, 
-                      birthdate=None, retirement_age=None, **kwargs):
+@REPORT_RENDER.time(format='docx')
+@timed_stage('word_report')
+def create_word_report(damages, output_path):
     """
     Create a Word document report based on the template, filling in dynamic fields.
     
     Args:
-        client_name: Name of the client
-        province: Client's province for taxation purposes
-        calculation_details: Dictionary containing past lost wages calculation details
-        present_value_details: Dictionary containing future lost wages calculation details
-        result: Dictionary containing income and deduction details
-        collateral_benefits: Dictionary containing collateral benefit details
-        missed_time_unit: Unit of missed time (days, weeks, months, etc.)
-        missed_time: Amount of missed time
+        damages: damages_results.DamagesResult of the calculation
         output_path: Path where the Word document will be saved
-        birthdate: Client's date of birth (optional)
-        retirement_age: Client's retirement age (optional)
-        **kwargs: Additional keyword arguments including:
-            - loss_date: Date of loss/accident
-            - current_date: Current date
-            - ei_days_remaining: Remaining EI days
-            - missed_pay: Missed pay amount
-            - net_past_lost_wages: Net past lost wages amount
-            - return_status: Return to work status
-            - end_date: Speculative return to work date
     
     Returns:
         Path to the created Word document file
     """
-    # Get optional parameters
-    loss_date = kwargs.get('loss_date')
-    current_date = kwargs.get('current_date', datetime.date.today())
-    ei_days_remaining = kwargs.get('ei_days_remaining', 0)
-    missed_pay = kwargs.get('missed_pay', 0)
-    net_past_lost_wages = kwargs.get('net_past_lost_wages', calculation_details.get('Original Past Lost Wages', 
-                                    calculation_details.get('Base Amount', 0)))
-    return_status = kwargs.get('return_status', "").lower()
-    end_date = kwargs.get('end_date', None)
+    province = damages.province
+    take_home = damages.take_home
+    collateral_benefits = damages.collateral_benefits
+    past_loss = damages.past_loss
+    future_loss = damages.future_loss
+    loss_date = damages.loss_date
+    current_date = damages.current_date
+    birthdate = damages.birthdate
+    retirement_age = damages.retirement_age
+    return_status = damages.return_status.lower()
+    end_date = damages.end_date
     
-    # Log all parameters for debugging
-    logger.debug(f"Creating Word report for client: {client_name}, province: {province}")
-    logger.debug(f"Loss date: {loss_date}, Current date: {current_date}")
-    logger.debug(f"Return status: {return_status}, End date: {end_date}")
-    logger.debug(f"Calculation details: {calculation_details}")
-    logger.debug(f"Present value details: {present_value_details}")
+    # Log all parameters for debugging (only formatted when DEBUG is on for this module)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Creating Word report for client: {damages.client_name}, province: {province}")
+        logger.debug(f"Loss date: {loss_date}, Current date: {current_date}")
+        logger.debug(f"Return status: {return_status}, End date: {end_date}")
+        logger.debug(f"Past loss: {past_loss}")
+        logger.debug(f"Future loss: {future_loss}")
     
     # Open the template file
     template_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Lost Wages Report for.docx')
-    logger.debug(f"Using template at: {template_path}")
+    logger.debug("Using template at: %s", template_path)
     
     try:
         doc = Document(template_path)
@@ -80,91 +68,64 @@ def create_word_report(client_name, province, calculation_details, present_value
     today_date = current_date.strftime("%B %d, %Y")
     loss_date_str = loss_date.strftime("%B %d, %Y") if loss_date else "Not specified"
     
-    # Get formatted province name
-    if province.lower() == "nova scotia":
-        province_display = "Nova Scotia"
-    elif province.lower() == "new brunswick":
-        province_display = "New Brunswick" 
-    elif province.lower() == "prince edward island":
-        province_display = "Prince Edward Island"
-    elif province.lower() == "newfoundland" or province.lower() == "newfoundland and labrador":
-        province_display = "Newfoundland and Labrador"
-    else:
-        province_display = province.capitalize()
+    province_name = province_display(province)
     
     # Create a comprehensive dictionary of replacements
     replacements = {
         # Header section
-        "[CLIENT NAME]": client_name,
+        "[CLIENT NAME]": damages.client_name,
         "[Today's Date]": today_date,
         
         # Jurisdiction section
-        "[PROVINCE]": province_display,
+        "[PROVINCE]": province_name,
         "[TAX YEAR]": str(current_date.year),
         
         # Income section
-        "[GROSS INCOME]": f"${result.get('Gross Income', 0):,.2f}",
-        "[FEDERAL TAXES]": f"${result.get('Federal Tax', 0):,.2f}",
-        "[PROVINCIAL TAXES]": f"${result.get(f'{province.capitalize()} Tax', 0):,.2f}",
-        "[CPP AMOUNT]": f"${result.get('CPP Contribution', 0) + result.get('CPP2 Contribution', 0):,.2f}",
-        "[EI AMOUNT]": f"${result.get('EI Contribution', 0):,.2f}",
-        "[DEPENDENT DEDUCTION]": f"${result.get('Dependent Benefit', 0):,.2f}",
-        "[NET INCOME]": f"${result.get('Net Pay (Provincially specific deductions for damages)', 0):,.2f}",
+        "[GROSS INCOME]": f"${take_home.gross_income:,.2f}",
+        "[FEDERAL TAXES]": f"${take_home.federal_tax:,.2f}",
+        "[PROVINCIAL TAXES]": f"${take_home.provincial_tax:,.2f}",
+        "[CPP AMOUNT]": f"${take_home.cpp_contribution + take_home.cpp2_contribution:,.2f}",
+        "[EI AMOUNT]": f"${take_home.ei_contribution:,.2f}",
+        "[DEPENDENT DEDUCTION]": f"${take_home.dependent_benefit:,.2f}",
+        "[NET INCOME]": f"${take_home.net_pay:,.2f}",
         
         # Past Lost Wages section
-        "[TIME PERIOD FOR PAST LOST WAGES]": f"{missed_time} {missed_time_unit}",
-        "[TOTAL MISSED INCOME BEFORE PJI AND COLLATERAL BENEFITS]": f"${missed_pay:,.2f}" if isinstance(missed_pay, (int, float)) else f"${net_past_lost_wages:,.2f}",
-        "[TOTAL COLLATERAL BENEFITS RECEIVED TO DATE AMOUNT]": f"${collateral_benefits.get('Total Past Benefits', 0):,.2f}",
+        "[TIME PERIOD FOR PAST LOST WAGES]": f"{past_loss.missed_time} {past_loss.missed_time_unit}",
+        "[TOTAL MISSED INCOME BEFORE PJI AND COLLATERAL BENEFITS]": f"${past_loss.missed_pay:,.2f}",
         "[DATE RANGE USED TO CALCULATE PJI]": f"{loss_date_str} to {today_date}",
-        "[PJI Rate]": f"{calculation_details.get('PJI Rate', 2.5):.2f}%",
-        "[PJI Amount]": f"${calculation_details.get('Interest Amount', 0):,.2f}",
-        "[TOTAL PAST LOST WAGES AFTER PJI AND COLLATERAL BENEFITS]": f"${calculation_details.get('Past Lost Wages with Interest', 0):,.2f}",
+        "[PJI Rate]": f"{past_loss.pji_rate if past_loss.pji_rate is not None else DEFAULT_PJI_RATE:.2f}%",
+        "[PJI Amount]": f"${past_loss.interest_amount:,.2f}",
+        "[TOTAL PAST LOST WAGES AFTER PJI AND COLLATERAL BENEFITS]": f"${past_loss.with_interest:,.2f}",
     }
     
     # Add individual collateral benefits to relevant sections
-    collateral_benefits_text = f"${collateral_benefits.get('Total Past Benefits', 0):,.2f}"
-    
-    if collateral_benefits.get('EI Benefits (to date)', 0) > 0:
-        collateral_benefits_text += f"\nEI Benefits: ${collateral_benefits.get('EI Benefits (to date)', 0):,.2f}"
-    if collateral_benefits.get('Section B Benefits (to date)', 0) > 0:
-        collateral_benefits_text += f"\nSection B Benefits: ${collateral_benefits.get('Section B Benefits (to date)', 0):,.2f}"
-    if collateral_benefits.get('LTD Benefits (to date)', 0) > 0:
-        collateral_benefits_text += f"\nLTD Benefits: ${collateral_benefits.get('LTD Benefits (to date)', 0):,.2f}"
-    if collateral_benefits.get('CPPD Benefits (to date)', 0) > 0:
-        collateral_benefits_text += f"\nCPPD Benefits: ${collateral_benefits.get('CPPD Benefits (to date)', 0):,.2f}"
-    if collateral_benefits.get('Other Benefits (to date)', 0) > 0:
-        collateral_benefits_text += f"\nOther Benefits: ${collateral_benefits.get('Other Benefits (to date)', 0):,.2f}"
+    collateral_benefits_text = f"${collateral_benefits.total_to_date:,.2f}"
+    for benefit, label, _ in BENEFITS:
+        if collateral_benefits.to_date(benefit) > 0:
+            collateral_benefits_text += f"\n{label}: ${collateral_benefits.to_date(benefit):,.2f}"
     
     replacements["[TOTAL COLLATERAL BENEFITS RECEIVED TO DATE AMOUNT]"] = collateral_benefits_text
     
     # Future Lost Wages section - only included if present value is positive
-    calculate_future_wages = present_value_details.get('present_value', 0) > 0
+    calculate_future_wages = future_loss.present_value > 0
     
     # Process conditional future wages section
     if calculate_future_wages:
         logger.debug("Including future lost wages section")
         
         future_replacements = {
-            "[NET INCOME]": f"${result.get('Net Pay (Provincially specific deductions for damages)', 0):,.2f}",
+            "[NET INCOME]": f"${take_home.net_pay:,.2f}",
             "[RETURN TO WORK STATUS]": (return_status.capitalize() if return_status else "Not specified"),
-            "[DISCOUNT RATE PERCENTAGE]": f"{present_value_details.get('discount_rate', 0) * 100:.2f}%",
-            "[Future Lost Wages Time Horizon]": f"{present_value_details.get('time_horizon', 0):.2f} years",
-            "[TOTAL FUTURE LOST WAGES AMOUNT]": f"${present_value_details.get('present_value', 0):,.2f}"
+            "[DISCOUNT RATE PERCENTAGE]": f"{future_loss.discount_rate * 100:.2f}%",
+            "[Future Lost Wages Time Horizon]": f"{future_loss.time_horizon:.2f} years",
+            "[TOTAL FUTURE LOST WAGES AMOUNT]": f"${future_loss.present_value:,.2f}"
         }
         
         # Add future collateral benefits
-        future_benefits_text = f"${collateral_benefits.get('Total Annual Future Benefits', 0):,.2f}"
-        
-        if collateral_benefits.get('EI Benefits (annual)', 0) > 0:
-            future_benefits_text += f"\nEI Benefits: ${collateral_benefits.get('EI Benefits (annual)', 0):,.2f}"
-        if collateral_benefits.get('Section B Benefits (annual)', 0) > 0:
-            future_benefits_text += f"\nSection B Benefits: ${collateral_benefits.get('Section B Benefits (annual)', 0):,.2f}"
-        if collateral_benefits.get('LTD Benefits (annual)', 0) > 0:
-            future_benefits_text += f"\nLTD Benefits: ${collateral_benefits.get('LTD Benefits (annual)', 0):,.2f}"
-        if collateral_benefits.get('CPPD Benefits (annual)', 0) > 0:
-            future_benefits_text += f"\nCPPD Benefits: ${collateral_benefits.get('CPPD Benefits (annual)', 0):,.2f}"
-        if collateral_benefits.get('Other Benefits (annual)', 0) > 0:
-            future_benefits_text += f"\nOther Benefits: ${collateral_benefits.get('Other Benefits (annual)', 0):,.2f}"
+        future_benefits_text = f"${collateral_benefits.total_annual:,.2f}"
+        for benefit, label, _ in BENEFITS:
+            if collateral_benefits.annual(benefit) > 0:
+                future_benefits_text += f"\n{label}: ${collateral_benefits.annual(benefit):,.2f}"
         
         future_replacements["[TOTAL Annual Collateral Benefits Moving Forward]"] = future_benefits_text
         
@@ -196,9 +157,9 @@ def create_word_report(client_name, province, calculation_details, present_value
     
     # Total Wage Loss section
     replacements.update({
-        "[TOTAL PAST LOST WAGES]": f"${calculation_details.get('Past Lost Wages with Interest', 0):,.2f}",
-        "[TOTAL FUTURE LOST WAGES]": f"${present_value_details.get('present_value', 0):,.2f}",
-        "[Total Economic Damages]": f"${calculation_details.get('Past Lost Wages with Interest', 0) + present_value_details.get('present_value', 0):,.2f}"
+        "[TOTAL PAST LOST WAGES]": f"${past_loss.with_interest:,.2f}",
+        "[TOTAL FUTURE LOST WAGES]": f"${future_loss.present_value:,.2f}",
+        "[Total Economic Damages]": f"${past_loss.with_interest + future_loss.present_value:,.2f}"
     })
     
     # Notes section
@@ -213,7 +174,7 @@ def create_word_report(client_name, province, calculation_details, present_value
         provincial_notes = "Newfoundland follows the standard 'net income' approach with province-specific tax calculations."
     
     pji_note = f"PJI Rate was calculated using T-Bill rates for the period from {loss_date_str} to {today_date}"
-    discount_rate_note = f"Discount rate of {present_value_details.get('discount_rate', 0) * 100:.2f}% is used as per {province_display} standards"
+    discount_rate_note = f"Discount rate of {future_loss.discount_rate * 100:.2f}% is used as per {province_name} standards"
     
     # Add notes to replacements
     replacements["[NOTE on HOW PJI Rate Was calculate]"] = pji_note
@@ -222,13 +183,13 @@ def create_word_report(client_name, province, calculation_details, present_value
     replacements["[NOTE ANY PROVINCIALLY SPECIFIC REASONING]"] = provincial_notes
     
     # EI benefits note
-    if ei_days_remaining > 0:
-        replacements["[NOTE EI SICK BENIFITS CUT OFF IF APPLICABLE]"] = f"EI sickness benefits are limited to 26 weeks (182 days). {ei_days_remaining} days remaining."
+    if damages.ei_days_remaining > 0:
+        replacements["[NOTE EI SICK BENIFITS CUT OFF IF APPLICABLE]"] = f"EI sickness benefits are limited to 26 weeks (182 days). {damages.ei_days_remaining} days remaining."
     else:
         replacements["[NOTE EI SICK BENIFITS CUT OFF IF APPLICABLE]"] = "EI sickness benefits period has been fully utilized."
     
     # Log the replacements for debugging
-    logger.debug(f"Created {len(replacements)} replacement mappings")
+    logger.debug("Created %d replacement mappings", len(replacements))
     
     # Process document content
     logger.debug("Processing document content")
@@ -328,7 +289,8 @@ def create_word_report(client_name, province, calculation_details, present_value
     
     # Save the document
     try:
-        doc.save(output_path)
+        with stage('word_save'):
+            doc.save(output_path)
         logger.info(f"Word document saved successfully at: {output_path}")
         return output_path
     except Exception as e: